@@ -1,13 +1,18 @@
 import os
 import uuid
 import json
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 import secrets
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 import re
-from werkzeug.utils import secure_filename
+import csv
+import io
+import logging
+import threading
+import time
+from functools import wraps
+from werkzeug.utils import secure_filename, safe_join
+from werkzeug.wsgi import make_line_iter
 from PIL import Image
 
 # Compatibilidade com versões antigas e novas do Pillow
@@ -18,25 +23,57 @@ except AttributeError:
     # Pillow < 9.1.0
     RESAMPLE_FILTER = Image.LANCZOS
 
-from flask import Flask, request, jsonify, g, send_from_directory, render_template, render_template_string
+from flask import (
+    Flask, Response, request, jsonify, g, send_from_directory, render_template,
+    render_template_string, stream_with_context
+)
 from flask_jwt_extended import (
     JWTManager, jwt_required, create_access_token,
-    get_jwt_identity
+    get_jwt, get_jwt_identity, verify_jwt_in_request
 )
 from flasgger import Swagger, swag_from
-from dao_mysql.funcionario_dao import FuncionarioDAO
-from dao_mysql.produto_dao import ProdutoDAO
-from dao_mysql.db import init_db
-from dao_mysql.venda_dao import VendaDAO
-from dao_mysql.item_venda_dao import ItemVendaDAO
-from dao_mysql.cliente_dao import ClienteDAO
-from dao_mysql.usuario_dao import UsuarioDAO
-from dao_mysql.nivel_acesso_dao import NivelAcessoDAO
+from dao_mysql.db import init_app as init_db_app, on_commit, on_rollback
+
+# Backend de banco: DB_TYPE=mysql (padrão) ou sqlite (SQLITE_DB; desenvolvimento e testes de carga)
+DB_TYPE = os.getenv('DB_TYPE', 'mysql')
+if DB_TYPE == 'sqlite':
+    from dao_sqlite.funcionario_dao import FuncionarioDAO
+    from dao_sqlite.produto_dao import ProdutoDAO
+    from dao_sqlite.db import init_db
+    from dao_sqlite.venda_dao import VendaDAO, ProdutoNaoEncontradoError, EstoqueInsuficienteError
+    from dao_sqlite.item_venda_dao import ItemVendaDAO
+    from dao_sqlite.cliente_dao import ClienteDAO
+    from dao_sqlite.usuario_dao import UsuarioDAO
+    from dao_sqlite.nivel_acesso_dao import NivelAcessoDAO
+    from dao_sqlite.token_recuperacao_dao import TokenRecuperacaoDAO
+    from dao_sqlite.email_outbox_dao import EmailOutboxDAO
+else:
+    from dao_mysql.funcionario_dao import FuncionarioDAO
+    from dao_mysql.produto_dao import ProdutoDAO
+    from dao_mysql.db import init_db
+    from dao_mysql.venda_dao import VendaDAO, ProdutoNaoEncontradoError, EstoqueInsuficienteError
+    from dao_mysql.item_venda_dao import ItemVendaDAO
+    from dao_mysql.cliente_dao import ClienteDAO
+    from dao_mysql.usuario_dao import UsuarioDAO
+    from dao_mysql.nivel_acesso_dao import NivelAcessoDAO
+    from dao_mysql.token_recuperacao_dao import TokenRecuperacaoDAO
+    from dao_mysql.email_outbox_dao import EmailOutboxDAO
+from cache.backends import criar_cache
+from cache.produto_cache import ProdutoDAOCache
+from email_outbox import criar_email_outbox
+from json_provider import criar_json_provider
+from logging_config import configurar_logging
+from metrics import Counter, Histogram, exportar_texto
+from recovery_store import criar_recovery_store
 
 
 
 from datetime import date
 
+# Logging estruturado (JSON) e não bloqueante: LOG_LEVEL e LOG_LEVELS (ex.: 'dao_mysql=DEBUG')
+configurar_logging()
+logger = logging.getLogger('app')
+
 # Inicializa o pool de conexões ao importar o app (se as variáveis de ambiente estiverem configuradas)
 try:
     init_db()
@@ -46,6 +83,9 @@ except Exception:
     pass
 
 app = Flask(__name__)
+# JSON das respostas: orjson se instalado (JSON_PROVIDER=stdlib força o encoder da stdlib);
+# os modelos de linha (models.*) são escritos sem dict intermediário
+app.json = criar_json_provider(app)
 app.config["JWT_ISSUER"] = "Flask_PyJWT" # Issuer of tokens
 app.config["JWT_AUTHTYPE"] = "HS256" # HS256, HS512, RS256, or RS512
 app.config["JWT_SECRET"] = "SECRETKEY" # string for HS256/HS512, bytes (RSA Private Key) for RS256/RS512
@@ -57,11 +97,18 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB máximo
 
 # Usar caminho absoluto para funcionar em produção (PythonAnywhere)
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
-app.config['UPLOAD_FOLDER'] = os.path.join(BASE_DIR, 'static', 'images', 'produtos')
+app.config['UPLOAD_FOLDER'] = os.getenv('UPLOAD_FOLDER', os.path.join(BASE_DIR, 'static', 'images', 'produtos'))
 
 # Criar diretório de upload se não existir
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# Cache read-through do catálogo (CACHE_BACKEND, CACHE_TTL, CACHE_MAXSIZE, CACHE_SQLITE_PATH)
+catalogo_cache = criar_cache()
+
+def produto_dao():
+    """ProdutoDAO com cache de leitura; escritas invalidam o cache após o commit (e após um rollback)"""
+    return ProdutoDAOCache(ProdutoDAO(), catalogo_cache, on_commit=on_commit, on_rollback=on_rollback)
+
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 
 # Configuração das resoluções de imagem
@@ -71,12 +118,92 @@ IMAGE_RESOLUTIONS = {
     'large': (800, 800)        # Para visualização ampliada
 }
 
+# Cache HTTP das imagens de produto (nomes com uuid, conteúdo imutável): 1 ano
+IMAGE_CACHE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Formatos modernos gerados junto de cada resolução e servidos conforme o header Accept
+# {extensao: (formato Pillow, mimetype, parâmetros de save)}
+Image.init()
+MODERN_IMAGE_FORMATS = {}
+if 'AVIF' in Image.SAVE:
+    MODERN_IMAGE_FORMATS['avif'] = ('AVIF', 'image/avif', {'quality': 60})
+if 'WEBP' in Image.SAVE:
+    MODERN_IMAGE_FORMATS['webp'] = ('WEBP', 'image/webp', {'quality': 80, 'method': 4})
+
 # Setup the Flask-JWT-Extended extension
 app.config['JWT_SECRET_KEY'] = 'super-secret'  # Change this!
 jwt = JWTManager(app)
 
+
+def claims_usuario(usuario):
+    """Claims adicionais do token de acesso: identificam o usuário e o nível de acesso, para que
+    as rotas autorizem só com o token verificado, sem consultar o banco"""
+    return {
+        'id_usuario': usuario['id_usuario'],
+        'id_nivel_acesso': usuario['id_nivel_acesso'],
+        'nivel_acesso_nome': usuario['nivel_acesso_nome'],
+    }
+
+
+def requires_nivel(*niveis):
+    """
+    Exige um JWT válido cujo nível de acesso esteja em niveis (nomes, ex.: 'admin', ou ids).
+    A decisão usa apenas as claims do token (ver claims_usuario): nenhuma consulta ao banco.
+    Tokens sem as claims (emitidos antes delas existirem) recebem 403: basta fazer login de novo.
+
+    Uso:
+      @app.route("/usuarios")
+      @requires_nivel('admin')
+      def listar_usuarios(): ...
+    """
+    def decorador(funcao):
+        @wraps(funcao)
+        def verificar(*args, **kwargs):
+            verify_jwt_in_request()
+            claims = get_jwt()
+            if claims.get('nivel_acesso_nome') not in niveis and claims.get('id_nivel_acesso') not in niveis:
+                return jsonify({
+                    "erro": "Acesso negado",
+                    "mensagem": f"Requer nível de acesso: {', '.join(str(nivel) for nivel in niveis)}"
+                }), 403
+            return funcao(*args, **kwargs)
+        return verificar
+    return decorador
+
 swagger = Swagger(app)
 
+# Métricas por endpoint (registradas antes da unidade de trabalho para incluir o commit na latência)
+HTTP_REQUESTS_TOTAL = Counter(
+    'http_requests_total', 'Requisições por endpoint', labels=('endpoint', 'metodo', 'status')
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds', 'Latência por endpoint (até o início da resposta)',
+    labels=('endpoint', 'metodo'),
+)
+IMAGE_PROCESSING_SECONDS = Histogram(
+    'image_processing_seconds', 'Tempo de create_image_resolutions por imagem',
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+@app.before_request
+def iniciar_medicao_requisicao():
+    g.inicio_requisicao = time.perf_counter()
+
+
+@app.after_request
+def registrar_medicao_requisicao(response):
+    inicio = g.pop('inicio_requisicao', None)
+    if inicio is not None:
+        endpoint = request.endpoint or 'nao_encontrado'
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - inicio, endpoint=endpoint, metodo=request.method)
+        HTTP_REQUESTS_TOTAL.inc(endpoint=endpoint, metodo=request.method, status=response.status_code)
+    return response
+
+
+# Uma conexão do pool por requisição, com commit único ao final (ver dao_mysql.db.init_app)
+init_db_app(app)
+
 # Instancia o DAO
 dao_funcionario = FuncionarioDAO()
 
@@ -261,73 +388,21 @@ def excluir_funcionario(id):
 # ---------------------------
 @app.route("/produtos", methods=["POST"])
 def criar_produto():
-    print("🚀 [DEBUG] Rota POST /produtos iniciada")
-    
     try:
-        print("📥 [DEBUG] Verificando dados recebidos...")
         dados = request.get_json()
-        print(f"📦 [DEBUG] Dados JSON recebidos: {dados}")
-        print(f"📦 [DEBUG] Tipo dos dados: {type(dados)}")
+        logger.debug("POST /produtos recebido", extra={"dados": dados})
         
         if not dados:
-            print("❌ [DEBUG] Nenhum JSON recebido")
             return jsonify({"erro": "JSON do corpo da requisição é obrigatório"}), 400
 
-        print("✅ [DEBUG] JSON válido recebido")
-        
-        campos_obrigatorios = ["nome", "preco", "estoque"]
-        print(f"🔍 [DEBUG] Verificando campos obrigatórios: {campos_obrigatorios}")
-        
-        for campo in campos_obrigatorios:
-            if campo not in dados:
-                print(f"❌ [DEBUG] Campo obrigatório ausente: {campo}")
-                print(f"📋 [DEBUG] Campos presentes: {list(dados.keys())}")
-                return jsonify({"erro": f"O campo '{campo}' é obrigatório"}), 400
-            else:
-                print(f"✅ [DEBUG] Campo '{campo}' presente: {dados[campo]}")
+        produto_data, erro = validar_dados_produto(dados)
+        if erro:
+            logger.debug("Produto inválido: %s", erro, extra={"campos": list(dados.keys())})
+            return jsonify({"erro": erro}), 400
 
-        print("🔢 [DEBUG] Validando e convertendo tipos...")
-        
-        # Conversões e validações básicas
-        try:
-            preco = float(dados["preco"])
-            print(f"✅ [DEBUG] Preço convertido: {preco}")
-        except Exception as e:
-            print(f"❌ [DEBUG] Erro ao converter preço: {e}")
-            print(f"📦 [DEBUG] Valor do preço recebido: {dados['preco']} (tipo: {type(dados['preco'])})")
-            return jsonify({"erro": "Campo 'preco' deve ser numérico"}), 400
+        dao_produto = produto_dao()
 
-        try:
-            estoque = int(dados["estoque"])
-            print(f"✅ [DEBUG] Estoque convertido: {estoque}")
-        except Exception as e:
-            print(f"❌ [DEBUG] Erro ao converter estoque: {e}")
-            print(f"📦 [DEBUG] Valor do estoque recebido: {dados['estoque']} (tipo: {type(dados['estoque'])})")
-            return jsonify({"erro": "Campo 'estoque' deve ser inteiro"}), 400
-
-        nome = dados["nome"]
-        descricao = dados.get("descricao", "")
-        
-        print(f"📝 [DEBUG] Dados processados:")
-        print(f"   - Nome: {nome}")
-        print(f"   - Descrição: {descricao}")
-        print(f"   - Preço: {preco}")
-        print(f"   - Estoque: {estoque}")
-
-        print("🗄️ [DEBUG] Criando DAO de produto...")
-        dao_produto = ProdutoDAO()
-
-        print("💾 [DEBUG] Chamando criar_produto no DAO...")
-        produto_data = {
-            'nome': nome,
-            'descricao': descricao,
-            'preco': preco,
-            'estoque': estoque
-        }
-        print(f"📦 [DEBUG] Dados para o DAO: {produto_data}")
-        
         produto_criado = dao_produto.criar_produto(produto_data)
-        print(f"✅ [DEBUG] Produto criado pelo DAO: {produto_criado}")
 
         if produto_criado:
             # Aplicar processamento dinâmico de imagens
@@ -336,28 +411,300 @@ def criar_produto():
             # Adicionar apenas a mensagem de sucesso ao produto processado
             produto_processado['mensagem'] = "Produto cadastrado com sucesso"
             
-            print(f"📤 [DEBUG] Resposta de sucesso: {produto_processado}")
+            logger.info("Produto criado", extra={"id_produto": produto_processado.get('id_produto')})
             return jsonify(produto_processado), 201
         else:
-            print("❌ [DEBUG] DAO retornou None/False")
+            logger.error("DAO não retornou o produto criado", extra={"dados": produto_data})
             return jsonify({"erro": "Erro ao criar produto"}), 500
 
     except Exception as erro:
-        print(f"💥 [ERROR] Exceção na criação de produto: {erro}")
-        import traceback
-        print("📊 [ERROR] Stack trace completo:")
-        traceback.print_exc()
+        logger.exception("Erro na criação de produto")
         return jsonify({
             "erro": "Erro ao cadastrar produto",
             "mensagem": str(erro)
         }), 500
 
 
+def validar_dados_produto(dados):
+    """
+    Valida e converte os campos de um produto (nome, preco, estoque obrigatórios; descricao opcional)
+    Retorna (produto_data, None) ou (None, mensagem de erro)
+    """
+    for campo in ("nome", "preco", "estoque"):
+        if dados.get(campo) in (None, ""):
+            return None, f"O campo '{campo}' é obrigatório"
+
+    try:
+        preco = float(dados["preco"])
+    except (TypeError, ValueError):
+        return None, "Campo 'preco' deve ser numérico"
+
+    try:
+        estoque = int(dados["estoque"])
+    except (TypeError, ValueError):
+        return None, "Campo 'estoque' deve ser inteiro"
+
+    return {
+        'nome': dados["nome"],
+        'descricao': dados.get("descricao") or "",
+        'preco': preco,
+        'estoque': estoque
+    }, None
+
+
+# Importação em lote: tamanho padrão/máximo de cada transação e limite de erros detalhados na resposta
+BULK_LOTE_PADRAO = 500
+BULK_LOTE_MAXIMO = 5000
+BULK_MAX_ERROS = 1000
+
+
+def ler_linhas_bulk(formato):
+    """
+    Lê o corpo da requisição em streaming e gera (numero_linha, dados | None, erro | None)
+    formato: 'csv' (cabeçalho com nome, preco, estoque e descricao opcional) ou 'ndjson'
+    """
+    linhas = (linha.decode('utf-8-sig' if numero == 0 else 'utf-8', errors='replace')
+              for numero, linha in enumerate(make_line_iter(request.stream, buffer_size=64 * 1024)))
+
+    if formato == 'ndjson':
+        for numero, linha in enumerate(linhas, start=1):
+            if not linha.strip():
+                continue
+            try:
+                dados = json.loads(linha)
+            except ValueError as erro:
+                yield numero, None, f"JSON inválido: {erro}"
+                continue
+            if not isinstance(dados, dict):
+                yield numero, None, "Cada linha deve ser um objeto JSON"
+                continue
+            yield numero, dados, None
+        return
+
+    leitor = csv.DictReader(linhas)
+    ausentes = [campo for campo in ("nome", "preco", "estoque") if campo not in (leitor.fieldnames or [])]
+    if ausentes:
+        raise ValueError(f"Cabeçalho CSV sem as colunas: {', '.join(ausentes)}")
+    for dados in leitor:
+        yield leitor.line_num, dados, None
+
+
+@app.route("/produtos/bulk", methods=["POST"])
+def importar_produtos_bulk():
+    """
+    Importação em lote de produtos a partir de CSV ou NDJSON (corpo lido em streaming)
+    As linhas são validadas uma a uma e inseridas em transações de até ?lote=<n> produtos.
+    Um lote que falhar no banco é reprocessado linha a linha para identificar as linhas com erro.
+    """
+    formato = request.args.get('format')
+    if not formato:
+        tipo = request.mimetype or ''
+        if tipo in ('text/csv', 'application/csv'):
+            formato = 'csv'
+        elif tipo in ('application/x-ndjson', 'application/ndjson', 'application/jsonl', 'application/json-seq'):
+            formato = 'ndjson'
+    if formato not in ('csv', 'ndjson'):
+        return jsonify({"erro": "Informe o formato: Content-Type text/csv ou application/x-ndjson (ou ?format=csv|ndjson)"}), 415
+
+    try:
+        tamanho_lote = int(request.args.get('lote', BULK_LOTE_PADRAO))
+    except ValueError:
+        return jsonify({"erro": "Parâmetro 'lote' deve ser inteiro"}), 400
+    if tamanho_lote < 1 or tamanho_lote > BULK_LOTE_MAXIMO:
+        return jsonify({"erro": f"Parâmetro 'lote' deve estar entre 1 e {BULK_LOTE_MAXIMO}"}), 400
+
+    dao_produto = produto_dao()
+    resultado = {"formato": formato, "linhas": 0, "inseridos": 0, "total_erros": 0, "erros": []}
+
+    def registrar_erro(numero, erro):
+        resultado["total_erros"] += 1
+        if len(resultado["erros"]) < BULK_MAX_ERROS:
+            resultado["erros"].append({"linha": numero, "erro": erro})
+
+    def gravar(lote):
+        try:
+            resultado["inseridos"] += dao_produto.inserir_produtos_lote([dados for _, dados in lote])
+            return
+        except Exception:
+            logger.warning("Lote da importação falhou; reprocessando linha a linha",
+                           extra={"primeira_linha": lote[0][0], "tamanho": len(lote)}, exc_info=True)
+        for numero, dados in lote:
+            try:
+                resultado["inseridos"] += dao_produto.inserir_produtos_lote([dados])
+            except Exception as erro:
+                registrar_erro(numero, f"Erro ao inserir: {erro}")
+
+    lote = []
+    try:
+        for numero, dados, erro in ler_linhas_bulk(formato):
+            resultado["linhas"] += 1
+            if erro is None:
+                dados, erro = validar_dados_produto(dados)
+            if erro:
+                registrar_erro(numero, erro)
+                continue
+            lote.append((numero, dados))
+            if len(lote) >= tamanho_lote:
+                gravar(lote)
+                lote = []
+        if lote:
+            gravar(lote)
+    except ValueError as erro:
+        # cabeçalho CSV inválido (antes da primeira linha) ou corpo ilegível no meio do envio
+        # (ex.: UnicodeDecodeError): os lotes já gravados permanecem, então informa os contadores
+        return jsonify({**resultado, "erro": str(erro)}), 400
+    except Exception as erro:
+        logger.exception("Erro na importação em lote de produtos")
+        return jsonify({**resultado, "erro": "Importação interrompida", "mensagem": str(erro)}), 500
+
+    resultado["erros_truncados"] = resultado["total_erros"] > len(resultado["erros"])
+    logger.info("Importação em lote concluída", extra={k: resultado[k] for k in ("formato", "linhas", "inseridos", "total_erros")})
+    return jsonify(resultado), 201 if resultado["total_erros"] == 0 else 200
+
+
+# Índice em memória das imagens de produtos: {produto_id: {resolucao: filename}}
+# Construído com um único scan da pasta na inicialização e mantido pelas rotas de upload/remoção,
+# evitando um os.listdir por produto na listagem.
+image_manifest = {}
+_image_manifest_lock = threading.Lock()
+_image_manifest_state = {"dir_mtime": None, "checked_at": 0.0}
+
+# Intervalo mínimo entre verificações do mtime da pasta (detecta alterações feitas por outros workers)
+IMAGE_MANIFEST_RECHECK_SECONDS = 2.0
+
+
+def parse_image_filename(filename):
+    """
+    Extrai (produto_id, resolucao) de um arquivo no padrão produto_{id}_{uuid}_{resolucao}.{extensao}
+    Retorna None se o arquivo não seguir o padrão
+    """
+    if not filename.startswith('produto_'):
+        return None
+    parts = filename.split('_')
+    if len(parts) < 4:
+        return None
+    try:
+        produto_id = int(parts[1])
+    except ValueError:
+        return None
+    resolution = parts[-1].split('.')[0]
+    if resolution not in IMAGE_RESOLUTIONS:
+        return None
+    return produto_id, resolution
+
+
+def is_image_variant(filename):
+    """Indica se o arquivo é uma variante moderna (WebP/AVIF) gerada a partir de outro formato"""
+    return filename.rsplit('.', 1)[-1].lower() in MODERN_IMAGE_FORMATS
+
+
+def _manifest_rank(filename):
+    """Prioridade do arquivo no índice: formato enviado, depois WebP (upload .webp), depois AVIF"""
+    ext = filename.rsplit('.', 1)[-1].lower()
+    if ext not in MODERN_IMAGE_FORMATS:
+        return 0
+    return 1 if ext == 'webp' else 2
+
+
+def image_variant_filenames(filename):
+    """Retorna {extensao: filename} das variantes modernas de um arquivo de resolução"""
+    stem, _, ext = filename.rpartition('.')
+    return {
+        variant_ext: f"{stem}.{variant_ext}"
+        for variant_ext in MODERN_IMAGE_FORMATS
+        if variant_ext != ext.lower()
+    }
+
+
+def build_image_manifest():
+    """
+    Reconstrói o índice de imagens com um único scan da pasta de upload
+    """
+    upload_folder = app.config['UPLOAD_FOLDER']
+    manifest = {}
+    dir_mtime = None
+
+    if os.path.exists(upload_folder):
+        dir_mtime = os.stat(upload_folder).st_mtime_ns
+        for filename in os.listdir(upload_folder):
+            parsed = parse_image_filename(filename)
+            if parsed:
+                produto_id, resolution = parsed
+                entry = manifest.setdefault(produto_id, {})
+                # O índice guarda o arquivo no formato enviado; variantes modernas só na falta dele
+                if resolution in entry and _manifest_rank(filename) > _manifest_rank(entry[resolution]):
+                    continue
+                entry[resolution] = filename
+
+    with _image_manifest_lock:
+        image_manifest.clear()
+        image_manifest.update(manifest)
+        _image_manifest_state["dir_mtime"] = dir_mtime
+        _image_manifest_state["checked_at"] = time.monotonic()
+
+    return manifest
+
+
+def refresh_image_manifest_if_stale():
+    """
+    Reconstrói o índice se a pasta foi alterada por outro processo (no máximo uma verificação
+    a cada IMAGE_MANIFEST_RECHECK_SECONDS)
+    """
+    now = time.monotonic()
+    if now - _image_manifest_state["checked_at"] < IMAGE_MANIFEST_RECHECK_SECONDS:
+        return
+    _image_manifest_state["checked_at"] = now
+
+    try:
+        dir_mtime = os.stat(app.config['UPLOAD_FOLDER']).st_mtime_ns
+    except OSError:
+        dir_mtime = None
+
+    if dir_mtime != _image_manifest_state["dir_mtime"]:
+        build_image_manifest()
+
+
+def register_product_images(produto_id, filenames_dict):
+    """Registra no índice as resoluções geradas para um produto"""
+    with _image_manifest_lock:
+        image_manifest[produto_id] = dict(filenames_dict)
+        _sync_manifest_mtime()
+
+
+def unregister_product_images(produto_id, filenames=None):
+    """
+    Remove do índice as imagens de um produto
+    Se filenames for informado, remove apenas as resoluções que apontam para esses arquivos
+    """
+    with _image_manifest_lock:
+        if filenames is None:
+            image_manifest.pop(produto_id, None)
+        else:
+            entry = image_manifest.get(produto_id)
+            if entry:
+                for resolution, filename in list(entry.items()):
+                    if filename in filenames:
+                        del entry[resolution]
+                if not entry:
+                    del image_manifest[produto_id]
+        _sync_manifest_mtime()
+
+
+def _sync_manifest_mtime():
+    """Atualiza o mtime conhecido após alterações feitas por este processo (chamar com o lock)"""
+    try:
+        _image_manifest_state["dir_mtime"] = os.stat(app.config['UPLOAD_FOLDER']).st_mtime_ns
+    except OSError:
+        _image_manifest_state["dir_mtime"] = None
+
+
 def generate_dynamic_image_urls(produto_id, base_url=None):
     """
     Gera URLs dinâmicas para as imagens de um produto baseado no padrão de nomenclatura
     Padrão: produto_{id}_{uuid}_{resolucao}.{extensao}
     
+    Usa o índice em memória (image_manifest), sem acessar o sistema de arquivos por produto.
+    
     Args:
         produto_id (int): ID do produto
         base_url (str): URL base da aplicação (opcional)
@@ -368,41 +715,26 @@ def generate_dynamic_image_urls(produto_id, base_url=None):
     if base_url is None:
         base_url = request.url_root.rstrip('/') if request else 'http://localhost:5001'
     
-    # Padrão de busca: produto_{id}_*_{resolucao}.*
-    upload_folder = app.config['UPLOAD_FOLDER']
-    found_images = {}
+    refresh_image_manifest_if_stale()
     
-    try:
-        # Verificar se pasta existe
-        if not os.path.exists(upload_folder):
-            return None
-            
-        # Listar todos os arquivos da pasta
-        for filename in os.listdir(upload_folder):
-            # Verificar se o arquivo segue o padrão do produto
-            if filename.startswith(f'produto_{produto_id}_'):
-                # Extrair resolução do nome do arquivo
-                # Formato esperado: produto_1_uuid_thumbnail.jpg
-                parts = filename.split('_')
-                if len(parts) >= 4:
-                    # A resolução está antes da extensão
-                    resolution_with_ext = parts[-1]  # "thumbnail.jpg"
-                    resolution = resolution_with_ext.split('.')[0]  # "thumbnail"
-                    
-                    # Verificar se é uma resolução válida
-                    if resolution in IMAGE_RESOLUTIONS:
-                        found_images[resolution] = f"{base_url}/images/produtos/{filename}"
-        
-        return found_images if found_images else None
-        
-    except Exception as e:
-        print(f"❌ [ERROR] Erro ao gerar URLs dinâmicas: {e}")
+    entry = image_manifest.get(int(produto_id))
+    if not entry:
         return None
+    
+    return {
+        resolution: f"{base_url}/images/produtos/{filename}"
+        for resolution, filename in entry.items()
+    }
+
+
+# Construir o índice de imagens com um único scan na inicialização
+build_image_manifest()
 
-def process_product_images(produto):
+def process_product_images(produto, fields=None):
     """
     Processa produto para adicionar URLs dinâmicas das imagens
     Retorna apenas os campos essenciais: id_produto, nome, descricao, preco, estoque, urls_imagem
+    Se fields for informado, retorna apenas esses campos (id_produto é sempre incluído)
     """
     if not produto:
         return produto
@@ -411,6 +743,15 @@ def process_product_images(produto):
     if not produto_id:
         return produto
     
+    if fields:
+        produto_projetado = {'id_produto': produto_id}
+        for campo in fields:
+            if campo == 'urls_imagem':
+                produto_projetado['urls_imagem'] = generate_dynamic_image_urls(produto_id)
+            elif campo != 'id_produto':
+                produto_projetado[campo] = produto.get(campo)
+        return produto_projetado
+    
     # Gerar URLs dinâmicas
     dynamic_urls = generate_dynamic_image_urls(produto_id)
     
@@ -425,6 +766,12 @@ def process_product_images(produto):
     }
     
     return produto_simplificado
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Métricas no formato de texto do Prometheus (agregadas entre processos com METRICS_DIR)"""
+    return Response(exportar_texto(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route("/test", methods=["GET"])
 def test_route():
     """Rota de teste simples para verificar se servidor responde"""
@@ -439,7 +786,7 @@ def test_route():
 def test_db():
     """Testa conexão com banco de dados"""
     try:
-        dao_produto = ProdutoDAO()
+        dao_produto = produto_dao()
         produtos = dao_produto.listar_produtos()
         return jsonify({
             "message": "Banco de dados funcionando",
@@ -453,50 +800,157 @@ def test_db():
             "status": "ERROR"
         }), 500
 
+# Limite máximo de produtos por página na listagem paginada
+PRODUTOS_LIMITE_MAXIMO = 1000
+
+# Campos aceitos em ?fields= (colunas de Produto + urls_imagem, que é gerado dinamicamente)
+CAMPOS_LISTAGEM_PRODUTO = ('id_produto', 'nome', 'descricao', 'preco', 'estoque', 'urls_imagem')
+
+# Colunas de Produto incluídas na resposta completa (sem ?fields=), além de urls_imagem
+CAMPOS_RESPOSTA_PRODUTO = ('id_produto', 'nome', 'descricao', 'preco', 'estoque')
+
+# Busca textual (GET /produtos/busca): tamanho padrão e máximo da página
+BUSCA_LIMITE_PADRAO = 20
+BUSCA_LIMITE_MAXIMO = 100
+
+
+def parse_paginacao_produtos(args):
+    """
+    Lê ?after=, ?limit= e ?fields= da query string
+    Retorna (after, limit, fields) ou lança ValueError com a mensagem de erro
+    """
+    after = args.get('after')
+    limit = args.get('limit')
+    fields = args.get('fields')
+
+    if after is not None:
+        try:
+            after = int(after)
+        except ValueError:
+            raise ValueError("Parâmetro 'after' deve ser inteiro")
+
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError("Parâmetro 'limit' deve ser inteiro")
+        if limit < 1 or limit > PRODUTOS_LIMITE_MAXIMO:
+            raise ValueError(f"Parâmetro 'limit' deve estar entre 1 e {PRODUTOS_LIMITE_MAXIMO}")
+
+    if fields is not None:
+        fields = [campo.strip() for campo in fields.split(',') if campo.strip()]
+        invalidos = [campo for campo in fields if campo not in CAMPOS_LISTAGEM_PRODUTO]
+        if invalidos:
+            raise ValueError(f"Campos inválidos em 'fields': {', '.join(invalidos)}")
+
+    return after, limit, fields or None
+
+
 @app.route("/produtos", methods=["GET"])
 @jwt_required()
 def listar_produtos():
+    """
+    Lista produtos com resposta em streaming
+    Paginação por cursor: ?after=<id_produto>&limit=<n> (a próxima página usa o último id_produto recebido)
+    Projeção de campos: ?fields=nome,preco,urls_imagem
+    """
     try:
-        print("📋 [DEBUG] Iniciando listagem de produtos...")
-        
-        dao_produto = ProdutoDAO()
-        print("📋 [DEBUG] DAO criado, consultando banco...")
-        
-        produtos = dao_produto.listar_produtos()
-        print(f"📋 [DEBUG] Consulta concluída. {len(produtos)} produtos encontrados")
-        
-        # Processar cada produto para adicionar URLs dinâmicas
-        produtos_processados = []
-        for produto in produtos:
-            produto_dict = dict(produto) if hasattr(produto, 'keys') else produto
-            
-            # Aplicar processamento dinâmico de imagens
-            produto_processado = process_product_images(produto_dict)
-            produtos_processados.append(produto_processado)
+        after, limit, fields = parse_paginacao_produtos(request.args)
+    except ValueError as erro:
+        return jsonify({"erro": str(erro)}), 400
+
+    try:
+        dao_produto = produto_dao()
+        
+        # Colunas do banco necessárias para a projeção (urls_imagem não é coluna)
+        colunas = ([campo for campo in fields if campo != 'urls_imagem'] or ['id_produto']) if fields else None
+        produtos = dao_produto.iterar_produtos(after=after, limit=limit, fields=colunas)
+        
+        # Obter a primeira linha antes de iniciar a resposta para que erros de banco retornem 500
+        primeiro = next(produtos, None)
+        
+        def gerar_json():
+            yield '['
+            produto = primeiro
+            separador = ''
+            while produto is not None:
+                if fields:
+                    # Projeção: dict apenas com os campos pedidos
+                    yield separador + app.json.dumps(process_product_images(produto, fields))
+                else:
+                    # Modelo Produto serializado direto, com as URLs dinâmicas das imagens
+                    yield separador + app.json.dumps_modelo(
+                        produto, CAMPOS_RESPOSTA_PRODUTO,
+                        {'urls_imagem': generate_dynamic_image_urls(produto.id_produto)},
+                    )
+                separador = ','
+                produto = next(produtos, None)
+            yield ']'
         
-        #print(f"📋 [DEBUG] Processamento concluído. Retornando {len(produtos_processados)} produtos")
-        #print(f"📦 [DEBUG] Array de produtos processados: {produtos_processados}")
-        return jsonify(produtos_processados), 200
+        return Response(stream_with_context(gerar_json()), status=200, mimetype='application/json')
         
     except Exception as erro:
-        print(f"❌ [ERROR] Erro na listagem: {erro}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Erro na listagem de produtos")
         return jsonify({
             "erro": "Erro ao listar produtos",
             "mensagem": str(erro)
         }), 500
 
+@app.route("/produtos/busca", methods=["GET"])
+@jwt_required()
+def buscar_produtos():
+    """
+    Busca textual em nome e descrição, ordenada por relevância (índice de texto do banco)
+    ?q=<texto> (obrigatório; todas as palavras, por prefixo) &limit=<n> &offset=<n>
+    A próxima página usa offset=proximo_offset (null na última página)
+    """
+    q = (request.args.get('q') or '').strip()
+    if not q:
+        return jsonify({"erro": "Parâmetro 'q' é obrigatório"}), 400
+
+    try:
+        limit = int(request.args.get('limit', BUSCA_LIMITE_PADRAO))
+        offset = int(request.args.get('offset', 0))
+    except ValueError:
+        return jsonify({"erro": "Parâmetros 'limit' e 'offset' devem ser inteiros"}), 400
+    if limit < 1 or limit > BUSCA_LIMITE_MAXIMO:
+        return jsonify({"erro": f"Parâmetro 'limit' deve estar entre 1 e {BUSCA_LIMITE_MAXIMO}"}), 400
+    if offset < 0:
+        return jsonify({"erro": "Parâmetro 'offset' não pode ser negativo"}), 400
+
+    try:
+        # Um resultado a mais só para saber se existe próxima página
+        resultados = produto_dao().buscar_texto(q, limit=limit + 1, offset=offset)
+        tem_mais = len(resultados) > limit
+
+        produtos = []
+        for produto, relevancia in resultados[:limit]:
+            produto_processado = process_product_images(produto)
+            produto_processado['relevancia'] = round(relevancia, 6)
+            produtos.append(produto_processado)
+
+        return jsonify({
+            "q": q,
+            "limit": limit,
+            "offset": offset,
+            "proximo_offset": offset + limit if tem_mais else None,
+            "produtos": produtos,
+        }), 200
+    except Exception as erro:
+        logger.exception("Erro na busca de produtos")
+        return jsonify({
+            "erro": "Erro ao buscar produtos",
+            "mensagem": str(erro)
+        }), 500
+
 @app.route("/produtos/<int:id>", methods=["GET"])
 def obter_produto(id):
     # TODO: Buscar produto por ID
     try:
-        dao_produto = ProdutoDAO()
+        dao_produto = produto_dao()
         produto = dao_produto.buscar_produto(id)
         if not produto:
             return jsonify({"erro": f"Produto com ID {id} não encontrado"}), 404
-        if hasattr(produto, "to_dict"):
-            produto = produto.to_dict()
 
         # Processar imagens do produto
         produto_processado = process_product_images(produto)
@@ -518,7 +972,7 @@ def atualizar_produto(id):
         if not dados:
             return jsonify({"erro": "Nenhum dado fornecido para atualização"}), 400
         
-        dao_produto = ProdutoDAO()
+        dao_produto = produto_dao()
         
         # Buscar o produto existente
         produto_atual = dao_produto.buscar_produto(id)
@@ -556,7 +1010,7 @@ def atualizar_produto(id):
 @jwt_required()
 def excluir_produto(id):
     try:
-        dao_produto = ProdutoDAO()
+        dao_produto = produto_dao()
         
         # Verificar se o produto existe
         produto = dao_produto.buscar_produto(id)
@@ -586,22 +1040,40 @@ def allowed_file(filename):
     """Verifica se o arquivo tem extensão permitida"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def create_image_resolutions(image_path, base_filename):
+def create_image_resolutions(image_path, base_filename, upload_folder=None):
     """
     Cria múltiplas resoluções de uma imagem e retorna os caminhos dos arquivos criados
+    
+    As resoluções são geradas em cascata (large -> medium -> thumbnail), cada uma a partir
+    da anterior, sem cópias da imagem original. JPEGs são decodificados já reduzidos (draft).
     """
+    if upload_folder is None:
+        upload_folder = app.config['UPLOAD_FOLDER']
     created_files = {}
+    variant_files = []
+    
+    # Da maior para a menor resolução
+    cascade = sorted(IMAGE_RESOLUTIONS.items(), key=lambda item: item[1][0] * item[1][1], reverse=True)
     
     try:
         with Image.open(image_path) as img:
-            # Converter para RGB se necessário (para JPEG)
-            if img.mode in ('RGBA', 'LA', 'P'):
+            if img.format == 'JPEG':
+                # Decodificar em escala reduzida (1/2, 1/4 ou 1/8), mantendo margem de 2x
+                # sobre a maior resolução para a qualidade do LANCZOS
+                largest_width, largest_height = cascade[0][1]
+                img.draft(None, (largest_width * 2, largest_height * 2))
+            
+            # Paleta precisa ser convertida antes do redimensionamento (filtro LANCZOS)
+            if img.mode == 'P':
                 img = img.convert('RGB')
             
-            for resolution_name, (width, height) in IMAGE_RESOLUTIONS.items():
-                # Calcular novo tamanho mantendo proporção
-                img_copy = img.copy()
-                img_copy.thumbnail((width, height), RESAMPLE_FILTER)
+            for resolution_name, (width, height) in cascade:
+                # Calcular novo tamanho mantendo proporção (in-place, a partir da resolução anterior)
+                img.thumbnail((width, height), RESAMPLE_FILTER)
+                
+                # Converter para RGB se necessário (para JPEG), já na imagem reduzida
+                if img.mode in ('RGBA', 'LA'):
+                    img = img.convert('RGB')
                 
                 # Criar nome do arquivo para esta resolução
                 name_parts = base_filename.rsplit('.', 1)
@@ -611,21 +1083,141 @@ def create_image_resolutions(image_path, base_filename):
                 else:
                     resolution_filename = f"{base_filename}_{resolution_name}"
                 
-                resolution_path = os.path.join(app.config['UPLOAD_FOLDER'], resolution_filename)
+                resolution_path = os.path.join(upload_folder, resolution_filename)
                 
                 # Salvar imagem redimensionada
-                img_copy.save(resolution_path, quality=85, optimize=True)
+                img.save(resolution_path, quality=85, optimize=True)
                 created_files[resolution_name] = resolution_filename
                 
+                # Variantes WebP/AVIF (menores) para clientes que as aceitam
+                for variant_ext, variant_filename in image_variant_filenames(resolution_filename).items():
+                    image_format, _, save_params = MODERN_IMAGE_FORMATS[variant_ext]
+                    variant_path = os.path.join(upload_folder, variant_filename)
+                    img.save(variant_path, image_format, **save_params)
+                    variant_files.append(variant_filename)
+                
     except Exception as e:
         # Se houver erro, limpar arquivos já criados
-        for filename in created_files.values():
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        for filename in list(created_files.values()) + variant_files:
+            file_path = os.path.join(upload_folder, filename)
             if os.path.exists(file_path):
                 os.remove(file_path)
         raise e
     
-    return created_files
+    # Manter a ordem de IMAGE_RESOLUTIONS no retorno
+    return {name: created_files[name] for name in IMAGE_RESOLUTIONS}
+
+# ---------------------------
+# Processamento assíncrono de imagens
+# ---------------------------
+
+# Número de processos para gerar as resoluções (Pillow usa CPU; um processo por núcleo)
+IMAGE_WORKERS = int(os.getenv('IMAGE_WORKERS', os.cpu_count() or 2))
+
+# Tempo que jobs finalizados ficam disponíveis para consulta
+IMAGE_JOB_TTL = timedelta(hours=1)
+
+# Espera máxima do upload com ?aguardar=1; depois disso responde 202 com o job_id
+IMAGE_JOB_AGUARDAR_SEGUNDOS = float(os.getenv('IMAGE_JOB_AGUARDAR_SEGUNDOS', 30))
+
+_image_executor = None
+_image_executor_lock = threading.Lock()
+
+# Jobs de imagem deste processo: {job_id: {"status", "id_produto", "criado_em", "finalizado_em", "filenames", "erro"}}
+image_jobs = {}
+_image_jobs_lock = threading.Lock()
+
+
+def get_image_executor():
+    """Cria sob demanda o pool de processos de imagens (evita fork na importação do app)"""
+    global _image_executor
+    with _image_executor_lock:
+        if _image_executor is None:
+            _image_executor = ProcessPoolExecutor(max_workers=IMAGE_WORKERS)
+        return _image_executor
+
+
+def render_image_job(temp_filepath, base_filename, upload_folder):
+    """
+    Executado no pool de processos: gera as resoluções e remove o arquivo original
+    Retorna (arquivos, segundos); o tempo é registrado no processo do app (ver finish_image_job)
+    """
+    try:
+        inicio = time.perf_counter()
+        created_files = create_image_resolutions(temp_filepath, base_filename, upload_folder)
+        return created_files, time.perf_counter() - inicio
+    finally:
+        if os.path.exists(temp_filepath):
+            os.remove(temp_filepath)
+
+
+def submit_image_job(id_produto, temp_filepath, base_filename):
+    """
+    Agenda a geração das resoluções e retorna (job_id, future)
+    O job_id é o uuid usado no nome dos arquivos
+    """
+    job_id = base_filename.split('_')[2].split('.')[0]
+    agora = datetime.now()
+
+    with _image_jobs_lock:
+        # Descartar jobs finalizados antigos
+        for antigo in [j for j, dados in image_jobs.items()
+                       if dados['finalizado_em'] and agora - dados['finalizado_em'] > IMAGE_JOB_TTL]:
+            del image_jobs[antigo]
+
+        image_jobs[job_id] = {
+            "status": "processando",
+            "id_produto": id_produto,
+            "criado_em": agora,
+            "finalizado_em": None,
+            "filenames": None,
+            "erro": None,
+            "evento": threading.Event()
+        }
+
+    future = get_image_executor().submit(
+        render_image_job, temp_filepath, base_filename, app.config['UPLOAD_FOLDER']
+    )
+    future.add_done_callback(lambda f: finish_image_job(job_id, id_produto, f))
+    return job_id, future
+
+
+def finish_image_job(job_id, id_produto, future):
+    """
+    Callback ao final do job: troca as imagens do produto no índice e marca o produto como tendo imagens
+    """
+    try:
+        resolution_filenames, segundos = future.result()
+        IMAGE_PROCESSING_SECONDS.observe(segundos)
+    except Exception as e:
+        logger.error("Erro ao processar imagem do produto %s", id_produto, exc_info=e)
+        with _image_jobs_lock:
+            image_jobs[job_id].update(status="erro", erro=str(e), finalizado_em=datetime.now())
+            image_jobs[job_id]['evento'].set()
+        return
+
+    try:
+        # Limpar imagens anteriores somente depois que as novas estão prontas
+        imagens_anteriores = image_manifest.get(id_produto)
+        if imagens_anteriores:
+            cleanup_product_images(dict(imagens_anteriores))
+
+        register_product_images(id_produto, resolution_filenames)
+
+        # Indicador simples de que existem imagens
+        produto_dao().atualizar_nome_imagem(id_produto, "has_images")
+
+        with _image_jobs_lock:
+            image_jobs[job_id].update(
+                status="concluido", filenames=resolution_filenames, finalizado_em=datetime.now()
+            )
+    except Exception as e:
+        logger.exception("Erro ao finalizar imagem do produto %s", id_produto)
+        with _image_jobs_lock:
+            image_jobs[job_id].update(status="erro", erro=str(e), finalizado_em=datetime.now())
+    finally:
+        image_jobs[job_id]['evento'].set()
+
 
 def generate_image_urls(base_url, filenames_dict):
     """
@@ -639,6 +1231,7 @@ def generate_image_urls(base_url, filenames_dict):
 def cleanup_product_images(produto_url_data):
     """
     Remove arquivos de imagem de um produto baseado nos dados da URL
+    e atualiza o índice de imagens
     """
     if not produto_url_data:
         return
@@ -651,23 +1244,79 @@ def cleanup_product_images(produto_url_data):
             url_data = produto_url_data
         
         # Remover cada arquivo de resolução
+        removed = {}
         for resolution, url in url_data.items():
             if url:
                 filename = url.split('/')[-1]
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                if os.path.exists(filepath):
-                    os.remove(filepath)
+                for nome in [filename] + list(image_variant_filenames(filename).values()):
+                    filepath = os.path.join(app.config['UPLOAD_FOLDER'], nome)
+                    if os.path.exists(filepath):
+                        os.remove(filepath)
+                parsed = parse_image_filename(filename)
+                if parsed:
+                    removed.setdefault(parsed[0], set()).add(filename)
+        
+        for produto_id, filenames in removed.items():
+            unregister_product_images(produto_id, filenames)
     except Exception:
         pass  # Ignorar erros de limpeza
 
 @app.route("/images/produtos/<filename>", methods=["GET"])
 def get_product_image(filename):
-    """Serve imagens de produtos estaticamente"""
+    """
+    Serve imagens de produtos estaticamente
+    Se o cliente aceitar explicitamente image/avif ou image/webp (header Accept),
+    serve a menor variante disponível do arquivo
+    """
     try:
-        return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+        filename = negotiate_image_variant(filename)
+        
+        if parse_image_filename(filename) is None:
+            response = send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+            response.vary.add('Accept')
+            return response
+        
+        # Arquivos de produto têm uuid no nome (conteúdo nunca muda): cache imutável por 1 ano,
+        # ETag forte = nome do arquivo servido e 304 para If-None-Match / If-Modified-Since
+        response = send_from_directory(
+            app.config['UPLOAD_FOLDER'], filename,
+            etag=filename, max_age=IMAGE_CACHE_MAX_AGE, conditional=True
+        )
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        response.vary.add('Accept')
+        return response
     except FileNotFoundError:
         return jsonify({"erro": "Imagem não encontrada"}), 404
 
+
+def negotiate_image_variant(filename):
+    """
+    Escolhe o menor arquivo entre o original e as variantes aceitas pelo cliente
+    Apenas tipos citados explicitamente no Accept contam (*/* não garante suporte a WebP/AVIF)
+    """
+    aceitos = {mimetype for mimetype, quality in request.accept_mimetypes if quality > 0}
+    upload_folder = app.config['UPLOAD_FOLDER']
+    
+    escolhido = filename
+    menor_tamanho = None
+    for variant_ext, variant_filename in image_variant_filenames(filename).items():
+        if MODERN_IMAGE_FORMATS[variant_ext][1] not in aceitos:
+            continue
+        try:
+            tamanho = os.stat(safe_join(upload_folder, variant_filename)).st_size
+        except (OSError, TypeError):
+            continue
+        if menor_tamanho is None:
+            try:
+                menor_tamanho = os.stat(safe_join(upload_folder, filename)).st_size
+            except (OSError, TypeError):
+                menor_tamanho = float('inf')
+        if tamanho < menor_tamanho:
+            escolhido, menor_tamanho = variant_filename, tamanho
+    
+    return escolhido
+
 @app.route("/produtos/<int:id>/images", methods=["GET"])
 @jwt_required()
 def get_product_images_urls(id):
@@ -676,7 +1325,7 @@ def get_product_images_urls(id):
     Geração dinâmica baseada nos arquivos existentes
     """
     try:
-        dao_produto = ProdutoDAO()
+        dao_produto = produto_dao()
         
         # Verificar se produto existe
         produto = dao_produto.buscar_produto(id)
@@ -767,11 +1416,16 @@ def scan_all_product_images():
             "mensagem": str(erro)
         }), 500
 
+@app.route("/admin/cache/produtos", methods=["GET"])
+def estatisticas_cache_produtos():
+    """Contadores de hit/miss do cache do catálogo (processo atual)"""
+    return jsonify(produto_dao().estatisticas()), 200
+
 @app.route("/produtos/<int:id>/upload-image", methods=["POST"])
 def upload_product_image(id):
     """Upload de imagem para um produto específico com múltiplas resoluções"""
     try:
-        dao_produto = ProdutoDAO()
+        dao_produto = produto_dao()
         
         # Verificar se produto existe
         produto = dao_produto.buscar_produto(id)
@@ -787,7 +1441,7 @@ def upload_product_image(id):
             return jsonify({"erro": "Nenhum arquivo selecionado"}), 400
         
         if file and allowed_file(file.filename):
-            # Limpar imagens anteriores se existirem
+            # Limpar imagens no formato antigo (URLs em JSON no banco), se existirem
             if produto['nome_imagem']:
                 cleanup_product_images(produto['nome_imagem'])
             
@@ -800,41 +1454,40 @@ def upload_product_image(id):
             file.save(temp_filepath)
             
             try:
-                # Criar múltiplas resoluções
-                resolution_filenames = create_image_resolutions(temp_filepath, base_filename)
-                
-                # Remover arquivo original temporário
-                os.remove(temp_filepath)
-                
-                # Gerar URLs para todas as resoluções (método dinâmico)
-                base_url = request.url_root.rstrip('/')
-                
-                # Agora não precisamos salvar URLs no banco, elas são geradas dinamicamente
-                # Apenas salvamos um indicador de que o produto tem imagens
-                dao_produto.atualizar_produto(
-                    id, 
-                    produto['nome'], 
-                    produto['descricao'], 
-                    produto['preco'], 
-                    produto['estoque'], 
-                    "has_images"  # Indicador simples de que existem imagens
-                )
-                
-                # Gerar URLs dinâmicas para retorno
-                image_urls = generate_dynamic_image_urls(id, base_url)
-                
-                return jsonify({
-                    "mensagem": "Imagem enviada com sucesso",
-                    "resolutions": image_urls,
-                    "filenames": resolution_filenames,
-                    "total_arquivos": len(resolution_filenames)
-                }), 200
-                
+                # Criar múltiplas resoluções no pool de processos
+                # (as imagens anteriores são substituídas quando o job termina)
+                job_id, future = submit_image_job(id, temp_filepath, base_filename)
             except Exception as e:
                 # Limpar arquivo temporário em caso de erro
                 if os.path.exists(temp_filepath):
                     os.remove(temp_filepath)
                 raise e
+            
+            base_url = request.url_root.rstrip('/')
+            
+            # Compatibilidade: ?aguardar=1 espera o processamento e responde como antes (200).
+            # A espera é limitada: a requisição segura uma conexão do pool que o callback do job
+            # também precisa; ao expirar, responde 202 como sem ?aguardar
+            job = image_jobs[job_id]
+            if (request.args.get('aguardar') in ('1', 'true')
+                    and job['evento'].wait(timeout=IMAGE_JOB_AGUARDAR_SEGUNDOS)):
+                # Aguardou também o callback do job (índice e banco atualizados)
+                if job['status'] == 'erro':
+                    raise RuntimeError(job['erro'])
+                resolution_filenames = job['filenames']
+                return jsonify({
+                    "mensagem": "Imagem enviada com sucesso",
+                    "resolutions": generate_dynamic_image_urls(id, base_url),
+                    "filenames": resolution_filenames,
+                    "total_arquivos": len(resolution_filenames)
+                }), 200
+            
+            return jsonify({
+                "mensagem": "Imagem recebida. Resoluções em processamento",
+                "job_id": job_id,
+                "status": "processando",
+                "status_url": f"{base_url}/produtos/{id}/image-jobs/{job_id}"
+            }), 202
                 
         else:
             return jsonify({"erro": "Tipo de arquivo não permitido. Use: png, jpg, jpeg, gif, webp"}), 400
@@ -845,11 +1498,45 @@ def upload_product_image(id):
             "mensagem": str(erro)
         }), 500
 
+@app.route("/produtos/<int:id>/image-jobs/<job_id>", methods=["GET"])
+def get_image_job_status(id, job_id):
+    """
+    Consulta o status do processamento de uma imagem enviada (processando, concluido ou erro)
+    """
+    with _image_jobs_lock:
+        job = image_jobs.get(job_id)
+    
+    if job is None or job['id_produto'] != id:
+        # Job de outro worker: inferir o status pelos arquivos
+        refresh_image_manifest_if_stale()
+        entry = image_manifest.get(id) or {}
+        filenames = {res: nome for res, nome in entry.items() if f"_{job_id}_" in nome}
+        if filenames:
+            job = {"status": "concluido", "filenames": filenames, "erro": None}
+        elif any(nome.startswith(f"produto_{id}_{job_id}.") for nome in os.listdir(app.config['UPLOAD_FOLDER'])):
+            job = {"status": "processando", "filenames": None, "erro": None}
+        else:
+            return jsonify({"erro": f"Job {job_id} não encontrado"}), 404
+    
+    resposta = {
+        "job_id": job_id,
+        "id_produto": id,
+        "status": job['status']
+    }
+    if job['status'] == 'concluido':
+        base_url = request.url_root.rstrip('/')
+        resposta["resolutions"] = generate_image_urls(base_url, job['filenames'])
+        resposta["filenames"] = job['filenames']
+    elif job['status'] == 'erro':
+        resposta["erro"] = job['erro']
+    
+    return jsonify(resposta), 200
+
 @app.route("/produtos/<int:id>/remove-image", methods=["DELETE"])
 def remove_product_image(id):
     """Remove todas as resoluções de imagem de um produto usando sistema dinâmico"""
     try:
-        dao_produto = ProdutoDAO()
+        dao_produto = produto_dao()
         
         # Verificar se produto existe
         produto = dao_produto.buscar_produto(id)
@@ -868,9 +1555,12 @@ def remove_product_image(id):
                     try:
                         os.remove(filepath)
                         arquivos_removidos.append(filename)
-                        print(f"🗑️ [DEBUG] Arquivo removido: {filename}")
+                        logger.debug("Arquivo removido: %s", filename)
                     except Exception as e:
-                        print(f"❌ [ERROR] Erro ao remover {filename}: {e}")
+                        logger.warning("Erro ao remover %s: %s", filename, e)
+        
+        # Atualizar índice de imagens
+        unregister_product_images(id)
         
         # Atualizar produto removendo indicador de imagens
         dao_produto.atualizar_produto(
@@ -898,6 +1588,30 @@ def remove_product_image(id):
 # ---------------------------
 # 🧾 VENDA
 # ---------------------------
+def normalizar_itens_venda(itens):
+    """
+    Valida os itens de uma venda e retorna cópias com id_produto e quantidade inteiros
+    (id_produto "1" e 1 são o mesmo produto; quantidade deve ser um inteiro positivo)
+    Lança ValueError com a mensagem de erro
+    """
+    if not isinstance(itens, list):
+        raise ValueError("O campo 'itens' deve ser uma lista")
+    normalizados = []
+    for item in itens:
+        if not isinstance(item, dict) or 'id_produto' not in item or 'quantidade' not in item:
+            raise ValueError("Cada item deve conter 'id_produto' e 'quantidade'")
+        id_produto, quantidade = item['id_produto'], item['quantidade']
+        if isinstance(id_produto, bool) or isinstance(id_produto, float):
+            raise ValueError(f"ID de produto inválido: {id_produto}")
+        try:
+            id_produto = int(id_produto)
+        except (TypeError, ValueError):
+            raise ValueError(f"ID de produto inválido: {id_produto}")
+        if isinstance(quantidade, bool) or not isinstance(quantidade, int) or quantidade <= 0:
+            raise ValueError(f"Quantidade inválida para o produto {id_produto}: deve ser um inteiro maior que zero")
+        normalizados.append({**item, 'id_produto': id_produto, 'quantidade': quantidade})
+    return normalizados
+
 @app.route("/vendas", methods=["POST"])
 def criar_venda():
     try:
@@ -931,52 +1645,23 @@ def criar_venda():
         id_funcionario = dados['id_funcionario']
         data_venda = dados.get('data_venda', str(date.today()))
         total = dados.get('total', 0.0)
+        itens = dados.get('itens', [])
         
-        # Inserir venda
-        dao_venda.inserir_venda(id_venda, id_cliente, id_funcionario, data_venda, total)
+        try:
+            itens = normalizar_itens_venda(itens)
+        except ValueError as erro:
+            return jsonify({"erro": str(erro)}), 400
         
-        # Inserir itens da venda se fornecidos
-        itens = dados.get('itens', [])
-        if itens:
-            dao_item = ItemVendaDAO()
-            dao_produto = ProdutoDAO()
-            
-            total_calculado = 0.0
-            for item in itens:
-                # Verificar se produto existe
-                produto = dao_produto.buscar_produto(item['id_produto'])
-                if not produto:
-                    return jsonify({"erro": f"Produto com ID {item['id_produto']} não encontrado"}), 404
-                
-                # Verificar estoque
-                if produto['estoque'] < item['quantidade']:
-                    return jsonify({
-                        "erro": f"Estoque insuficiente para produto {produto['nome']}. Disponível: {produto['estoque']}"
-                    }), 400
-                
-                # Inserir item
-                id_item = item.get('id_item')
-                preco_unitario = item.get('preco_unitario', produto['preco'])
-                dao_item.inserir_item(id_item, id_venda, item['id_produto'], item['quantidade'], preco_unitario)
-                
-                # Atualizar estoque
-                novo_estoque = produto['estoque'] - item['quantidade']
-                dao_produto.atualizar_produto(
-                    item['id_produto'],
-                    produto['nome'],
-                    produto['descricao'],
-                    produto['preco'],
-                    novo_estoque
-                )
-                
-                total_calculado += preco_unitario * item['quantidade']
-            
-            # Atualizar total da venda se foi calculado
-            if total == 0.0 and total_calculado > 0.0:
-                dao_venda.atualizar_venda(id_venda, id_cliente, id_funcionario, data_venda, total_calculado)
+        # Venda, itens e baixa de estoque em uma única transação
+        try:
+            venda_criada = dao_venda.finalizar_venda(id_venda, id_cliente, id_funcionario, data_venda, itens, total)
+        except ProdutoNaoEncontradoError as erro:
+            return jsonify({"erro": str(erro)}), 404
+        except EstoqueInsuficienteError as erro:
+            return jsonify({"erro": str(erro)}), 400
         
-        # Buscar venda criada
-        venda_criada = dao_venda.buscar_venda(id_venda)
+        # Baixa de estoque altera os produtos vendidos
+        produto_dao().invalidar({item['id_produto'] for item in itens})
         
         return jsonify({
             "mensagem": "Venda criada com sucesso",
@@ -1002,14 +1687,121 @@ def listar_vendas():
             "mensagem": str(erro)
         }), 500
 
+# Tamanho aproximado de cada bloco enviado na exportação de vendas
+EXPORTACAO_BLOCO_BYTES = 64 * 1024
+
+
+def parse_periodo(args, parametros=('from', 'to')):
+    """
+    Lê ?from=AAAA-MM-DD&to=AAAA-MM-DD da query string (datas inclusivas; nomes em parametros)
+    Retorna (data_inicio, data_fim) ou lança ValueError com a mensagem de erro
+    """
+    periodo = []
+    for parametro in parametros:
+        valor = args.get(parametro)
+        if not valor:
+            raise ValueError(f"Parâmetro '{parametro}' é obrigatório (AAAA-MM-DD)")
+        try:
+            periodo.append(date.fromisoformat(valor))
+        except ValueError:
+            raise ValueError(f"Parâmetro '{parametro}' deve estar no formato AAAA-MM-DD")
+    if periodo[0] > periodo[1]:
+        raise ValueError(f"Parâmetro '{parametros[0]}' deve ser anterior ou igual a '{parametros[1]}'")
+    return tuple(periodo)
+
+
+def _valor_exportacao(valor):
+    return valor.isoformat() if isinstance(valor, (date, datetime)) else valor
+
+
+@app.route("/vendas/export", methods=["GET"])
+@jwt_required()
+def exportar_vendas():
+    """
+    Exporta as vendas do período com seus itens e nomes dos produtos (uma linha por item)
+    ?from=AAAA-MM-DD&to=AAAA-MM-DD&format=csv|ndjson
+    As linhas vêm de um cursor server-side/sem buffer direto para a resposta (chunked),
+    sem manter o resultado em memória.
+    """
+    try:
+        data_inicio, data_fim = parse_periodo(request.args)
+    except ValueError as erro:
+        return jsonify({"erro": str(erro)}), 400
+
+    formato = request.args.get('format', 'csv')
+    if formato not in ('csv', 'ndjson'):
+        return jsonify({"erro": "Parâmetro 'format' deve ser csv ou ndjson"}), 400
+
+    try:
+        linhas = VendaDAO().exportar_vendas(data_inicio, data_fim)
+
+        # Obter a primeira linha antes de iniciar a resposta para que erros de banco retornem 500
+        primeira = next(linhas, None)
+    except Exception as erro:
+        logger.exception("Erro na exportação de vendas")
+        return jsonify({
+            "erro": "Erro ao exportar vendas",
+            "mensagem": str(erro)
+        }), 500
+
+    def gerar():
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        if formato == 'csv':
+            escritor.writerow(VendaDAO.CAMPOS_EXPORTACAO)
+
+        linha = primeira
+        try:
+            while linha is not None:
+                if formato == 'csv':
+                    escritor.writerow([_valor_exportacao(linha[campo]) for campo in VendaDAO.CAMPOS_EXPORTACAO])
+                else:
+                    buffer.write(json.dumps(
+                        {campo: _valor_exportacao(valor) for campo, valor in linha.items()},
+                        default=str, ensure_ascii=False,
+                    ) + '\n')
+                if buffer.tell() >= EXPORTACAO_BLOCO_BYTES:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+                linha = next(linhas, None)
+            yield buffer.getvalue()
+        finally:
+            # cliente desconectou: fecha o cursor e devolve a conexão
+            linhas.close()
+
+    mimetype = 'text/csv' if formato == 'csv' else 'application/x-ndjson'
+    nome_arquivo = f"vendas_{data_inicio.isoformat()}_{data_fim.isoformat()}.{formato}"
+    return Response(
+        stream_with_context(gerar()),
+        status=200,
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{nome_arquivo}"'},
+    )
+
 @app.route("/vendas/<int:id>", methods=["GET"])
 def obter_venda(id):
-    # TODO: Obter detalhes da venda (com itens)
+    """
+    Detalhes da venda. ?expand=itens,produtos,cliente,funcionario embute as relações pedidas,
+    montadas a partir de uma única consulta com JOINs (ver VendaDAO.buscar_venda_detalhada)
+    """
+    expand = [campo.strip() for campo in request.args.get('expand', '').split(',') if campo.strip()]
     try:
         dao_venda = VendaDAO()
-        venda = dao_venda.buscar_venda(id)
+        if expand:
+            try:
+                venda = dao_venda.buscar_venda_detalhada(id, expand)
+            except ValueError as erro:
+                return jsonify({"erro": str(erro)}), 400
+        else:
+            venda = dao_venda.buscar_venda(id)
         if not venda:
             return jsonify({"erro": f"Venda com ID {id} não encontrada"}), 404
+        if expand:
+            for item in venda.get('itens', []):
+                if item.get('produto'):
+                    # mesmo formato de GET /produtos/<id> (com urls_imagem)
+                    item['produto'] = process_product_images(item['produto'])
         return jsonify(venda), 200
     except Exception as erro:
         return jsonify({
@@ -1019,7 +1811,7 @@ def obter_venda(id):
 
 @app.route("/vendas/<int:id>", methods=["DELETE"])
 def excluir_venda(id):
-    # TODO: Excluir venda
+    # Venda, itens e VendaResumoDiario em uma única transação
     try:
         dao_venda = VendaDAO()
         resultado = dao_venda.excluir_venda(id)
@@ -1033,6 +1825,72 @@ def excluir_venda(id):
         }), 500
 
 
+# ---------------------------
+# 📊 RELATÓRIOS
+# ---------------------------
+# Início do período de cada agrupamento do relatório de vendas
+AGRUPAMENTOS_RELATORIO = {
+    'dia': lambda dia: dia,
+    'semana': lambda dia: dia - timedelta(days=dia.weekday()),  # segunda-feira
+    'mes': lambda dia: dia.replace(day=1),
+}
+
+
+@app.route("/relatorios/vendas", methods=["GET"])
+@jwt_required()
+def relatorio_vendas():
+    """
+    Receita, quantidade de vendas e unidades vendidas por período
+    ?de=AAAA-MM-DD&ate=AAAA-MM-DD&agrupar=dia|semana|mes[&id_produto=<id>]
+    Lê apenas o agregado VendaResumoDiario (uma linha por dia), não Venda/Item_Venda.
+    """
+    try:
+        data_inicio, data_fim = parse_periodo(request.args, ('de', 'ate'))
+    except ValueError as erro:
+        return jsonify({"erro": str(erro)}), 400
+
+    agrupar = request.args.get('agrupar', 'dia')
+    if agrupar not in AGRUPAMENTOS_RELATORIO:
+        return jsonify({"erro": "Parâmetro 'agrupar' deve ser dia, semana ou mes"}), 400
+
+    id_produto = request.args.get('id_produto', 0)
+    try:
+        id_produto = int(id_produto)
+    except ValueError:
+        return jsonify({"erro": "Parâmetro 'id_produto' deve ser inteiro"}), 400
+
+    try:
+        dias = VendaDAO().resumo_diario(data_inicio, data_fim, id_produto=id_produto)
+    except Exception as erro:
+        logger.exception("Erro no relatório de vendas")
+        return jsonify({
+            "erro": "Erro ao gerar relatório de vendas",
+            "mensagem": str(erro)
+        }), 500
+
+    inicio_periodo = AGRUPAMENTOS_RELATORIO[agrupar]
+    periodos = {}
+    for linha in dias:
+        chave = inicio_periodo(linha['dia'])
+        periodo = periodos.setdefault(chave, {"periodo": chave.isoformat(), "receita": 0, "vendas": 0, "unidades": 0})
+        periodo["receita"] += linha['receita']
+        periodo["vendas"] += linha['vendas']
+        periodo["unidades"] += linha['unidades']
+
+    totais = {
+        campo: sum((periodo[campo] for periodo in periodos.values()), 0)
+        for campo in ("receita", "vendas", "unidades")
+    }
+    return jsonify({
+        "de": data_inicio.isoformat(),
+        "ate": data_fim.isoformat(),
+        "agrupar": agrupar,
+        "id_produto": id_produto or None,
+        "periodos": list(periodos.values()),
+        "totais": totais
+    }), 200
+
+
 # ---------------------------
 # 🧮 ITEM VENDA
 # ---------------------------
@@ -1086,37 +1944,33 @@ import secrets
 import hashlib
 from datetime import datetime, timedelta
 
-# Store para tokens de recuperação de senha (em produção, usar banco de dados)
-recovery_tokens = {}  # {token: {"email": str, "expiry": datetime, "used": bool}}
+# Tokens de recuperação de senha: tabela token_recuperacao (compartilhada entre workers) ou
+# memória do processo com RECOVERY_TOKEN_STORE=memoria (ver recovery_store.py)
+recovery_store = criar_recovery_store(TokenRecuperacaoDAO())
 
 def generate_recovery_token():
     """Gera um token seguro para recuperação de senha"""
     return secrets.token_urlsafe(32)
 
+# Emails saem pela fila email_outbox: a rota só enfileira e uma thread do worker envia em lotes,
+# reutilizando a sessão SMTP (EMAIL_SMTP_HOST/PORT/TLS, EMAIL_USER/EMAIL_PASSWORD; ver email_outbox.py)
+email_outbox = criar_email_outbox(EmailOutboxDAO(), on_commit=on_commit)
+
+
+@app.before_request
+def iniciar_envio_emails():
+    # workers criados por fork (gunicorn/uWSGI com preload) não herdam a thread enviadora
+    email_outbox.iniciar()
+
 def send_recovery_email(email, token):
     """
-    Envia email de recuperação usando SMTP do Outlook/Hotmail
+    Enfileira o email de recuperação (o envio SMTP acontece fora da requisição)
+    Retorna o id do email na fila
     """
-    try:
-        # Configurações para Outlook/Hotmail
-        smtp_server = "smtp-mail.outlook.com"
-        smtp_port = 587
-        
-        # CONFIGURE AQUI SUAS CREDENCIAIS
-        # Crie variáveis de ambiente ou coloque temporariamente aqui para testar
-        sender_email = os.getenv('EMAIL_USER', 'seu_email@hotmail.com')  # Substitua pelo seu email
-        sender_password = os.getenv('EMAIL_PASSWORD', 'sua_senha')  # Substitua pela sua senha
-        
-        recovery_link = f"http://localhost:5001/redefinir-senha?token={token}"
-        
-        # Criando a mensagem
-        msg = MIMEMultipart()
-        msg['From'] = sender_email
-        msg['To'] = email
-        msg['Subject'] = "🔐 Recuperação de Senha - Sistema de Vendas"
-        
-        # Corpo do email em HTML (mais bonito)
-        body = f"""
+    recovery_link = f"http://localhost:5001/redefinir-senha?token={token}"
+
+    # Corpo do email em HTML (mais bonito)
+    body = f"""
         <html>
         <body>
             <h2>🔐 Recuperação de Senha</h2>
@@ -1134,29 +1988,10 @@ def send_recovery_email(email, token):
         </body>
         </html>
         """
-        
-        msg.attach(MIMEText(body, 'html'))
-        
-        # Conectando e enviando
-        server = smtplib.SMTP(smtp_server, smtp_port)
-        server.starttls()  # Habilita criptografia
-        server.login(sender_email, sender_password)
-        server.send_message(msg)
-        server.quit()
-        
-        print(f"✅ [EMAIL] Email enviado com sucesso para: {email}")
-        return True
-        
-    except Exception as e:
-        print(f"❌ [EMAIL] Erro ao enviar email: {e}")
-        # Fallback: exibe no console se falhar
-        print("📧 [EMAIL] Simulando envio de email de recuperação:")
-        print(f"📧 [EMAIL] Para: {email}")
-        print(f"📧 [EMAIL] Link: {recovery_link}")
-        return False
-    print("📧 [EMAIL] Email enviado com sucesso (simulação)")
-    
-    return True
+
+    id_email = email_outbox.enfileirar(email, "🔐 Recuperação de Senha - Sistema de Vendas", body)
+    logger.info("Email de recuperação enfileirado", extra={"email": email, "id_email": id_email})
+    return id_email
 
 @app.route("/esqueci-senha", methods=["POST"])
 def esqueci_senha():
@@ -1201,27 +2036,17 @@ def esqueci_senha():
         recovery_token = generate_recovery_token()
         
         # Armazenar token com expiração de 30 minutos
-        recovery_tokens[recovery_token] = {
-            "email": email,
-            "expiry": datetime.now() + timedelta(minutes=30),
-            "used": False
-        }
+        recovery_store.salvar(recovery_token, email, datetime.now() + timedelta(minutes=30))
         
-        # Enviar email de recuperação
-        email_sent = send_recovery_email(email, recovery_token)
-        
-        if email_sent:
-            return jsonify({
-                "mensagem": "Instruções de recuperação enviadas para seu email.",
-                "status": "enviado",
-                "validade": "30 minutos",
-                "token_debug": recovery_token  # Remover em produção
-            }), 200
-        else:
-            return jsonify({
-                "erro": "Erro ao enviar email de recuperação",
-                "status": "erro_envio"
-            }), 500
+        # Enfileirar email de recuperação (enviado em segundo plano)
+        send_recovery_email(email, recovery_token)
+
+        return jsonify({
+            "mensagem": "Instruções de recuperação serão enviadas para seu email.",
+            "status": "enfileirado",
+            "validade": "30 minutos",
+            "token_debug": recovery_token  # Remover em produção
+        }), 202
             
     except Exception as e:
         return jsonify({
@@ -1244,14 +2069,13 @@ def validar_token_recuperacao():
         token = data['token']
         
         # Verificar se token existe
-        if token not in recovery_tokens:
+        token_data = recovery_store.buscar(token)
+        if token_data is None:
             return jsonify({
                 "valido": False,
                 "erro": "Token inválido ou expirado"
             }), 400
         
-        token_data = recovery_tokens[token]
-        
         # Verificar se token já foi usado
         if token_data['used']:
             return jsonify({
@@ -1262,7 +2086,7 @@ def validar_token_recuperacao():
         # Verificar se token expirou
         if datetime.now() > token_data['expiry']:
             # Remover token expirado
-            del recovery_tokens[token]
+            recovery_store.remover(token)
             return jsonify({
                 "valido": False,
                 "erro": "Token expirado"
@@ -1314,13 +2138,12 @@ def redefinir_senha():
             }), 400
         
         # Verificar se token existe e é válido
-        if token not in recovery_tokens:
+        token_data = recovery_store.buscar(token)
+        if token_data is None:
             return jsonify({
                 "erro": "Token inválido ou expirado"
             }), 400
         
-        token_data = recovery_tokens[token]
-        
         # Verificar se token já foi usado
         if token_data['used']:
             return jsonify({
@@ -1329,7 +2152,7 @@ def redefinir_senha():
         
         # Verificar se token expirou
         if datetime.now() > token_data['expiry']:
-            del recovery_tokens[token]
+            recovery_store.remover(token)
             return jsonify({
                 "erro": "Token expirado"
             }), 400
@@ -1343,8 +2166,11 @@ def redefinir_senha():
         # dao_usuario = UsuarioDAO()
         # dao_usuario.atualizar_senha(email, nova_senha_hash)
         
-        # Marcar token como usado
-        recovery_tokens[token]['used'] = True
+        # Marcar token como usado (atômico: duas requisições com o mesmo token não passam ambas)
+        if not recovery_store.marcar_usado(token):
+            return jsonify({
+                "erro": "Token já foi utilizado"
+            }), 400
         
         # Log da alteração
         print(f"🔐 [SECURITY] Senha alterada para usuário: {email}")
@@ -1380,7 +2206,8 @@ def form_redefinir_senha():
         """), 400
     
     # Verificar se token é válido
-    if token not in recovery_tokens:
+    token_data = recovery_store.buscar(token)
+    if token_data is None:
         return render_template_string("""
         <div style="text-align: center; margin-top: 50px; font-family: Arial;">
             <h2>🔐 Recuperação de Senha</h2>
@@ -1401,8 +2228,6 @@ def form_redefinir_senha():
         </div>
         """), 400
     
-    token_data = recovery_tokens[token]
-    
     if token_data['used']:
         return render_template_string("""
         <div style="text-align: center; margin-top: 50px; font-family: Arial;">
@@ -1436,22 +2261,16 @@ def recovery_status():
     Remover em produção ou adicionar autenticação admin
     """
     try:
-        # Limpar tokens expirados
-        current_time = datetime.now()
-        expired_tokens = [
-            token for token, data in recovery_tokens.items() 
-            if current_time > data['expiry']
-        ]
-        
-        for token in expired_tokens:
-            del recovery_tokens[token]
+        # Limpar tokens expirados (em lotes, pelo índice de expiração)
+        expired_tokens = recovery_store.limpar_expirados()
         
         # Preparar dados para exibição
+        current_time = datetime.now()
         active_tokens = []
-        for token, data in recovery_tokens.items():
+        for data in recovery_store.listar_ativos():
             remaining_time = data['expiry'] - current_time
             active_tokens.append({
-                "token": token[:10] + "...",  # Mostrar apenas início do token
+                "token": data['token_hash'][:10] + "...",  # Apenas início do hash (o token não é armazenado)
                 "email": data['email'],
                 "tempo_restante": str(remaining_time).split('.')[0],
                 "usado": data['used'],
@@ -1460,7 +2279,7 @@ def recovery_status():
         
         return jsonify({
             "tokens_ativos": len(active_tokens),
-            "tokens_expirados_removidos": len(expired_tokens),
+            "tokens_expirados_removidos": expired_tokens,
             "detalhes": active_tokens
         }), 200
         
@@ -1494,8 +2313,8 @@ def login():
         usuario = dao_usuario.autenticar_usuario(email, senha_hash)
         
         if usuario:
-            # Criar token JWT com informações do usuário
-            access_token = create_access_token(identity=email)
+            # Criar token JWT com o usuário e o nível de acesso nas claims (autorização sem banco)
+            access_token = create_access_token(identity=email, additional_claims=claims_usuario(usuario))
             
             return jsonify({
                 "mensagem": f"Login bem-sucedido. Bem-vindo, {usuario['nome']}!",
@@ -1526,13 +2345,13 @@ def logout():
 
 
 # ---------------------------
-# 👥 ROTAS DE USUÁRIOS (PROTEGIDAS POR JWT)
+# 👥 ROTAS DE USUÁRIOS (SOMENTE ADMIN)
 # ---------------------------
 
 @app.route("/usuarios", methods=["GET"])
-@jwt_required()
+@requires_nivel('admin')
 def listar_usuarios():
-    """Lista todos os usuários (protegida por JWT)"""
+    """Lista todos os usuários (somente admin)"""
     try:
         dao_usuario = UsuarioDAO()
         usuarios = dao_usuario.listar_usuarios()
@@ -1542,9 +2361,9 @@ def listar_usuarios():
 
 
 @app.route("/usuarios/<int:id>", methods=["GET"])
-@jwt_required()
+@requires_nivel('admin')
 def buscar_usuario(id):
-    """Busca um usuário específico por ID (protegida por JWT)"""
+    """Busca um usuário específico por ID (somente admin)"""
     try:
         dao_usuario = UsuarioDAO()
         usuario = dao_usuario.buscar_usuario(id)
@@ -1558,9 +2377,9 @@ def buscar_usuario(id):
 
 
 @app.route("/usuarios/email/<email>", methods=["GET"])
-@jwt_required()
+@requires_nivel('admin')
 def buscar_usuario_por_email(email):
-    """Busca um usuário específico por email (protegida por JWT)"""
+    """Busca um usuário específico por email (somente admin)"""
     try:
         dao_usuario = UsuarioDAO()
         usuario = dao_usuario.buscar_usuario_por_email(email)
@@ -1574,9 +2393,9 @@ def buscar_usuario_por_email(email):
 
 
 @app.route("/usuarios/nivel/<int:id_nivel>", methods=["GET"])
-@jwt_required()
+@requires_nivel('admin')
 def listar_usuarios_por_nivel(id_nivel):
-    """Lista usuários de um nível de acesso específico (protegida por JWT)"""
+    """Lista usuários de um nível de acesso específico (somente admin)"""
     try:
         dao_usuario = UsuarioDAO()
         usuarios = dao_usuario.listar_usuarios_por_nivel(id_nivel)
@@ -1586,9 +2405,9 @@ def listar_usuarios_por_nivel(id_nivel):
 
 
 @app.route("/usuarios/ativos", methods=["GET"])
-@jwt_required()
+@requires_nivel('admin')
 def listar_usuarios_ativos():
-    """Lista apenas usuários ativos (protegida por JWT)"""
+    """Lista apenas usuários ativos (somente admin)"""
     try:
         dao_usuario = UsuarioDAO()
         usuarios = dao_usuario.listar_usuarios_ativos()
@@ -1598,13 +2417,13 @@ def listar_usuarios_ativos():
 
 
 # ---------------------------
-# 🔐 ROTAS DE NÍVEIS DE ACESSO (PROTEGIDAS POR JWT)
+# 🔐 ROTAS DE NÍVEIS DE ACESSO (SOMENTE ADMIN)
 # ---------------------------
 
 @app.route("/niveis-acesso", methods=["GET"])
-@jwt_required()
+@requires_nivel('admin')
 def listar_niveis_acesso():
-    """Lista todos os níveis de acesso (protegida por JWT)"""
+    """Lista todos os níveis de acesso (somente admin)"""
     try:
         dao_nivel = NivelAcessoDAO()
         niveis = dao_nivel.listar_niveis_acesso()
@@ -0,0 +1 @@
+# Cache de leitura (catálogo de produtos)
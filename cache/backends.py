@@ -0,0 +1,145 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Marcador de chave ausente (permite diferenciar de valores None)
+AUSENTE = object()
+
+
+class TTLCache:
+    """Cache LRU em memória do processo, com expiração (TTL) por entrada."""
+
+    nome = 'memoria'
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._dados = OrderedDict()  # {chave: (expira_em, valor)}
+        self._lock = threading.Lock()
+
+    def get(self, chave):
+        agora = time.monotonic()
+        with self._lock:
+            item = self._dados.get(chave)
+            if item is None or item[0] < agora:
+                if item is not None:
+                    del self._dados[chave]
+                self.misses += 1
+                return AUSENTE
+            self._dados.move_to_end(chave)
+            self.hits += 1
+            return item[1]
+
+    def set(self, chave, valor):
+        with self._lock:
+            self._dados[chave] = (time.monotonic() + self.ttl, valor)
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.maxsize:
+                self._dados.popitem(last=False)
+
+    def delete(self, *chaves):
+        with self._lock:
+            for chave in chaves:
+                self._dados.pop(chave, None)
+
+    def delete_prefix(self, prefixo):
+        with self._lock:
+            for chave in [c for c in self._dados if c.startswith(prefixo)]:
+                del self._dados[chave]
+
+    def clear(self):
+        with self._lock:
+            self._dados.clear()
+
+    def __len__(self):
+        return len(self._dados)
+
+
+class SQLiteCache:
+    """Cache compartilhado entre os workers da mesma máquina, em um arquivo SQLite local.
+
+    Mesma interface de TTLCache. As invalidações feitas por um worker valem para todos.
+    Entradas expiradas são removidas a cada `purge_every` escritas.
+    """
+
+    nome = 'sqlite'
+
+    def __init__(self, path: str, ttl: float = 60.0, purge_every: int = 100):
+        self.path = path
+        self.ttl = ttl
+        self.purge_every = purge_every
+        self.hits = 0
+        self.misses = 0
+        self._escritas = 0
+        self._local = threading.local()
+
+        with self._conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (chave TEXT PRIMARY KEY, valor BLOB NOT NULL, expira_em REAL NOT NULL)"
+            )
+
+    def _conn(self):
+        """Conexão persistente por thread (reaberta após fork)"""
+        if getattr(self._local, 'pid', None) != os.getpid():
+            self._local.pid = os.getpid()
+            self._local.conn = sqlite3.connect(self.path, timeout=5.0)
+            self._local.conn.execute("PRAGMA synchronous=NORMAL")
+        return self._local.conn
+
+    def get(self, chave):
+        row = self._conn().execute(
+            "SELECT valor FROM cache WHERE chave = ? AND expira_em >= ?", (chave, time.time())
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return AUSENTE
+        self.hits += 1
+        return pickle.loads(row[0])
+
+    def set(self, chave, valor):
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (chave, valor, expira_em) VALUES (?, ?, ?)",
+                (chave, pickle.dumps(valor, pickle.HIGHEST_PROTOCOL), time.time() + self.ttl),
+            )
+            self._escritas += 1
+            if self._escritas % self.purge_every == 0:
+                conn.execute("DELETE FROM cache WHERE expira_em < ?", (time.time(),))
+
+    def delete(self, *chaves):
+        with self._conn() as conn:
+            conn.executemany("DELETE FROM cache WHERE chave = ?", [(chave,) for chave in chaves])
+
+    def delete_prefix(self, prefixo):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM cache WHERE substr(chave, 1, ?) = ?", (len(prefixo), prefixo))
+
+    def clear(self):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM cache")
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM cache WHERE expira_em >= ?", (time.time(),)).fetchone()[0]
+
+
+def criar_cache(config: dict = None):
+    """Cria o backend de cache. Se config não for fornecido, lê das variáveis de ambiente:
+    CACHE_BACKEND ('memoria' ou 'sqlite'), CACHE_TTL (segundos), CACHE_MAXSIZE, CACHE_SQLITE_PATH
+    """
+    if config is None:
+        config = {
+            'backend': os.getenv('CACHE_BACKEND', 'memoria'),
+            'ttl': float(os.getenv('CACHE_TTL', 60)),
+            'maxsize': int(os.getenv('CACHE_MAXSIZE', 1024)),
+            'path': os.getenv('CACHE_SQLITE_PATH', 'cache_catalogo.sqlite'),
+        }
+
+    if config.get('backend') == 'sqlite':
+        return SQLiteCache(config.get('path', 'cache_catalogo.sqlite'), ttl=config.get('ttl', 60.0))
+    return TTLCache(maxsize=config.get('maxsize', 1024), ttl=config.get('ttl', 60.0))
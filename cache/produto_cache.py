@@ -0,0 +1,129 @@
+from .backends import AUSENTE
+
+
+class ProdutoDAOCache:
+    """Cache read-through na frente de um ProdutoDAO (MySQL, SQLite ou Postgres).
+
+    - buscar_produto: cacheado por id (chave 'produto:{id}')
+    - listar_produtos / iterar_produtos: cacheados por página de keyset
+      (chave 'lista:{after}:{limit}:{fields}'); listagens sem limit percorrem páginas de page_size
+    - escritas delegam ao DAO e invalidam o produto e todas as páginas
+
+    on_commit: função opcional que adia um callback para depois do commit da transação atual
+    (ex.: dao_mysql.db.on_commit). A invalidação é feita na hora e repetida após o commit, para
+    que uma leitura concorrente não recoloque no cache dados ainda não commitados.
+    on_rollback: idem para depois do rollback (ex.: dao_mysql.db.on_rollback). Um miss da própria
+    requisição lê as escritas ainda não commitadas; se a requisição for desfeita, a invalidação
+    é repetida para não deixar essa versão no cache até o TTL.
+    Os misses leem do primário (primario=True): com réplicas, uma leitura logo após a invalidação
+    poderia trazer a versão anterior da réplica atrasada e guardá-la até o TTL vencer.
+    Métodos não cacheados são repassados ao DAO original.
+    """
+
+    def __init__(self, dao, cache, on_commit=None, on_rollback=None, page_size: int = 500):
+        self._dao = dao
+        self._cache = cache
+        self._on_commit = on_commit
+        self._on_rollback = on_rollback
+        self.page_size = page_size
+
+    def __getattr__(self, nome):
+        return getattr(self._dao, nome)
+
+    # ---- leitura ----
+
+    def buscar_produto(self, id_produto):
+        chave = f"produto:{int(id_produto)}"
+        produto = self._cache.get(chave)
+        if produto is AUSENTE:
+            produto = self._dao.buscar_produto(id_produto, primario=True)
+            if produto is not None:
+                self._cache.set(chave, produto)
+        return produto
+
+    def listar_produtos(self, after=None, limit=None, fields=None):
+        return list(self.iterar_produtos(after=after, limit=limit, fields=fields))
+
+    def iterar_produtos(self, after=None, limit=None, fields=None, batch_size=None):
+        restante = limit
+        while True:
+            tamanho = self.page_size if restante is None else min(self.page_size, restante)
+            pagina = self._pagina(after, tamanho, fields)
+            yield from pagina
+
+            if restante is not None:
+                restante -= len(pagina)
+                if restante <= 0:
+                    return
+            if len(pagina) < tamanho:
+                return
+            ultimo = pagina[-1]
+            after = ultimo['id_produto'] if isinstance(ultimo, dict) else ultimo.id_produto
+
+    def _pagina(self, after, limit, fields):
+        chave = f"lista:{after}:{limit}:{','.join(fields) if fields else '*'}"
+        pagina = self._cache.get(chave)
+        if pagina is AUSENTE:
+            pagina = self._dao.listar_produtos(after=after, limit=limit, fields=fields, primario=True)
+            self._cache.set(chave, pagina)
+        return pagina
+
+    # ---- escrita ----
+
+    def criar_produto(self, dados):
+        produto = self._dao.criar_produto(dados)
+        self.invalidar()
+        return produto
+
+    def inserir_produtos_lote(self, produtos):
+        inseridos = self._dao.inserir_produtos_lote(produtos)
+        self.invalidar()
+        return inseridos
+
+    def inserir_produto(self, id_produto, *args, **kwargs):
+        resultado = self._dao.inserir_produto(id_produto, *args, **kwargs)
+        self.invalidar([id_produto])
+        return resultado
+
+    def atualizar_produto(self, id_produto, *args, **kwargs):
+        resultado = self._dao.atualizar_produto(id_produto, *args, **kwargs)
+        self.invalidar([id_produto])
+        return resultado
+
+    def atualizar_nome_imagem(self, id_produto, nome_imagem):
+        resultado = self._dao.atualizar_nome_imagem(id_produto, nome_imagem)
+        self.invalidar([id_produto])
+        return resultado
+
+    def deletar_produto(self, id_produto):
+        resultado = self._dao.deletar_produto(id_produto)
+        self.invalidar([id_produto])
+        return resultado
+
+    def invalidar(self, ids_produtos=()):
+        """Remove do cache os produtos informados e todas as páginas de listagem
+        (também usado por escritas fora do ProdutoDAO, ex.: baixa de estoque em vendas)"""
+        chaves = [f"produto:{int(id_produto)}" for id_produto in ids_produtos]
+
+        def _invalidar():
+            if chaves:
+                self._cache.delete(*chaves)
+            self._cache.delete_prefix('lista:')
+
+        _invalidar()
+        if self._on_commit is not None:
+            self._on_commit(_invalidar)
+        if self._on_rollback is not None:
+            self._on_rollback(_invalidar)
+
+    def estatisticas(self):
+        """Contadores de hit/miss do cache (deste processo)"""
+        total = self._cache.hits + self._cache.misses
+        return {
+            "backend": self._cache.nome,
+            "ttl": self._cache.ttl,
+            "hits": self._cache.hits,
+            "misses": self._cache.misses,
+            "hit_ratio": round(self._cache.hits / total, 4) if total else None,
+            "entradas": len(self._cache),
+        }
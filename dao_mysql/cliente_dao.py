@@ -1,13 +1,14 @@
 from .db import get_cursor
+from models.cliente import Cliente
 
 class ClienteDAO:
     def __init__(self):
         pass
 
     def listar_clientes(self):
-        with get_cursor() as cur:
+        with get_cursor(readonly=True, dictionary=False) as cur:
             cur.execute("SELECT id_cliente, nome, email, telefone, endereco FROM Cliente;")
-            return cur.fetchall()
+            return [Cliente(*row) for row in cur.fetchall()]
 
     def inserir_cliente(self, id_cliente, nome, email=None, telefone=None, endereco=None):
         with get_cursor() as cur:
@@ -20,13 +21,13 @@ class ClienteDAO:
             )
 
     def buscar_cliente(self, id_cliente):
-        with get_cursor() as cur:
+        with get_cursor(readonly=True, dictionary=False) as cur:
             cur.execute(
                 "SELECT id_cliente, nome, email, telefone, endereco FROM Cliente WHERE id_cliente = %s;",
                 (id_cliente,),
             )
             row = cur.fetchone()
-            return row
+            return Cliente(*row) if row else None
 
     def atualizar_cliente(self, id_cliente, nome, email=None, telefone=None, endereco=None):
         with get_cursor() as cur:
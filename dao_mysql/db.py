@@ -1,12 +1,23 @@
+import itertools
 import os
+import time
 from contextlib import contextmanager
 import mysql.connector
 from mysql.connector import pooling
+from flask import current_app, g, has_request_context
+from metrics import DAO_QUERY_SECONDS, DB_POOL_WAIT_SECONDS, DB_POOL_EM_USO, operacao_chamadora
 
 _pool = None
 
+# Pools das réplicas de leitura (get_cursor(readonly=True)), usados em round-robin
+_replica_pools = []
+_replica_contador = itertools.count()
 
-def init_db(db_config: dict = None, minconn: int = 1, maxconn: int = 5):
+# Chave em flask.g com a unidade de trabalho (conexão compartilhada) da requisição atual
+_UOW_KEY = '_mysql_unit_of_work'
+
+
+def init_db(db_config: dict = None, minconn: int = 1, maxconn: int = 5, replica_config=None):
     """Inicializa o pool de conexões MySQL. Se db_config não for fornecido, lê das variáveis de ambiente:
     MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE
 
@@ -18,6 +29,10 @@ def init_db(db_config: dict = None, minconn: int = 1, maxconn: int = 5):
         'password': '123456',
         'database': 'e_comerce_flask'
       }
+
+    replica_config: réplicas de leitura opcionais (dict ou lista de dicts). Cada dict sobrescreve
+      chaves de db_config (normalmente host/port). Se não for fornecido, lê MYSQL_REPLICA_HOSTS
+      (ex.: 'replica1,replica2:3307'). Sem réplicas, todas as consultas vão para o primário.
     """
     global _pool
     if _pool is not None:
@@ -42,9 +57,233 @@ def init_db(db_config: dict = None, minconn: int = 1, maxconn: int = 5):
         **db_config
     )
 
+    if replica_config is None:
+        replica_config = [
+            {'host': host, 'port': int(port or db_config.get('port', 3306))}
+            for host, _, port in (item.strip().partition(':') for item in os.getenv('MYSQL_REPLICA_HOSTS', '').split(','))
+            if host
+        ]
+    elif isinstance(replica_config, dict):
+        replica_config = [replica_config]
+
+    for indice, config in enumerate(replica_config):
+        _replica_pools.append(pooling.MySQLConnectionPool(
+            pool_name=f"mysql_replica_{indice}",
+            pool_size=maxconn,
+            pool_reset_session=True,
+            **{**db_config, **config}
+        ))
+
+
+def init_app(app):
+    """Ativa a unidade de trabalho por requisição no app Flask.
+
+    Com ela, todas as chamadas a get_cursor() dentro de uma requisição reutilizam uma única
+    conexão do pool (obtida na primeira chamada e guardada em flask.g). O commit é feito uma vez
+    só, ao final da requisição, se houve escrita e status < 400; caso contrário é feito rollback
+    (exceções não tratadas viram 500). Cada bloco de escrita abre um SAVEPOINT: um erro dentro do
+    bloco desfaz só as escritas dele, e uma rota que trata o erro e continua mantém as demais.
+    A conexão volta ao pool no teardown da requisição.
+
+    Com réplicas configuradas, get_cursor(readonly=True) usa uma conexão de réplica (também uma
+    por requisição) enquanto a requisição não tiver usado o primário. Depois da primeira escrita,
+    as leituras da requisição ficam no primário (read-your-writes).
+    """
+    app.extensions['dao_mysql_uow'] = True
+    app.after_request(_finalizar_unidade_de_trabalho)
+    app.teardown_request(_liberar_unidade_de_trabalho)
+
+
+def _unidade_de_trabalho():
+    """Retorna o estado da unidade de trabalho da requisição atual ou None fora de uma requisição"""
+    if not has_request_context() or not current_app.extensions.get('dao_mysql_uow'):
+        return None
+    uow = g.get(_UOW_KEY)
+    if uow is None:
+        uow = {'conn': None, 'conn_replica': None, 'pendente': False, 'falhou': False, 'savepoints': 0,
+               'apos_commit': [], 'apos_rollback': []}
+        setattr(g, _UOW_KEY, uow)
+    return uow
+
+
+def _finalizar_unidade_de_trabalho(response):
+    """after_request: commit único da requisição (ou rollback se houve erro)"""
+    uow = g.get(_UOW_KEY)
+    if uow is None or uow['conn'] is None or not uow['pendente']:
+        return response
+
+    uow['pendente'] = False
+    apos_commit, apos_rollback = uow['apos_commit'], uow['apos_rollback']
+    uow['apos_commit'], uow['apos_rollback'] = [], []
+    if uow['falhou'] or response.status_code >= 400:
+        _reverter(uow['conn'], apos_rollback)
+        return response
+    try:
+        uow['conn'].commit()
+    except Exception:
+        _reverter(uow['conn'], apos_rollback)
+        raise
+    for callback in apos_commit:
+        callback()
+    return response
+
+
+def _reverter(conn, callbacks):
+    """Rollback da unidade de trabalho seguido dos callbacks registrados com on_rollback"""
+    try:
+        conn.rollback()
+    finally:
+        for callback in callbacks:
+            callback()
+
+
+def on_commit(callback):
+    """Executa callback depois do commit da unidade de trabalho da requisição atual
+    (ex.: invalidar cache). Fora de uma requisição o commit já aconteceu: executa na hora.
+    Em caso de rollback o callback é descartado.
+    """
+    uow = _unidade_de_trabalho()
+    if uow is None or uow['conn'] is None:
+        callback()
+        return
+    uow['apos_commit'].append(callback)
+
+
+def on_rollback(callback):
+    """Executa callback depois do rollback da unidade de trabalho da requisição atual (ex.: limpar
+    do cache o que foi lido das escritas desfeitas). Sem transação da requisição não há o que
+    desfazer: o callback é ignorado. Em caso de commit o callback é descartado.
+    """
+    uow = _unidade_de_trabalho()
+    if uow is None or uow['conn'] is None:
+        return
+    uow['apos_rollback'].append(callback)
+
+
+def _liberar_unidade_de_trabalho(exc=None):
+    """teardown_request: devolve as conexões da requisição aos pools"""
+    uow = g.pop(_UOW_KEY, None)
+    if uow is None:
+        return
+
+    if uow['conn_replica'] is not None:
+        _devolver_conexao(uow['conn_replica'], 'mysql_replica')
+    if uow['conn'] is None:
+        return
+
+    conn = uow['conn']
+    if uow['pendente']:
+        # after_request não rodou (exceção não tratada): descartar as escritas
+        try:
+            _reverter(conn, uow['apos_rollback'])
+        except Exception:
+            pass
+    _devolver_conexao(conn, 'mysql')
+
+
+def _obter_conexao(pool=None, backend='mysql'):
+    """Obtém uma conexão do pool registrando o tempo de espera e o gauge de conexões em uso"""
+    with DB_POOL_WAIT_SECONDS.time(backend=backend):
+        conn = (pool or _pool).get_connection()
+    DB_POOL_EM_USO.inc(backend=backend)
+    return conn
+
+
+def _devolver_conexao(conn, backend='mysql'):
+    try:
+        conn.close()
+    except Exception:
+        pass
+    DB_POOL_EM_USO.dec(backend=backend)
+
+
+def _obter_conexao_replica():
+    """Conexão da próxima réplica (round-robin); None se nenhuma réplica responder"""
+    inicio = next(_replica_contador) % len(_replica_pools)
+    for pool in _replica_pools[inicio:] + _replica_pools[:inicio]:
+        try:
+            return _obter_conexao(pool, 'mysql_replica')
+        except mysql.connector.Error:
+            continue
+    return None
+
+
+def descartar_conexao(cur):
+    """Fecha o socket da conexão de um cursor sem buffer abandonado no meio do resultado, sem ler
+    as linhas restantes (o servidor descarta o resto). A conexão volta ao pool desconectada e o
+    pool reconecta no próximo get_connection"""
+    conn = getattr(cur, '_connection', None)
+    if conn is None:
+        return
+    try:
+        if hasattr(conn, '_cmysql'):
+            # extensão C: não tem shutdown() e o close() normal libera o resultado lendo o resto
+            conn._cmysql.close()
+        else:
+            conn.shutdown()
+    except Exception:
+        pass
+
 
 @contextmanager
-def get_cursor(commit: bool = True):
+def _cursor_replica(conn, operacao, devolver, buffered=None, dictionary=True):
+    """Cursor somente leitura em uma conexão de réplica (sem commit)"""
+    cur = conn.cursor(dictionary=dictionary, buffered=buffered)
+    inicio = time.perf_counter()
+    try:
+        yield cur
+    finally:
+        try:
+            cur.close()
+        except Exception:
+            pass
+        try:
+            # encerra a transação/snapshot de leitura
+            conn.rollback()
+        except Exception:
+            pass
+        DAO_QUERY_SECONDS.observe(time.perf_counter() - inicio, backend='mysql_replica', operacao=operacao)
+        if devolver:
+            _devolver_conexao(conn, 'mysql_replica')
+
+
+def _abrir_savepoint(conn, uow):
+    """SAVEPOINT antes de um bloco de escrita na conexão da requisição. Não é liberado ao final do
+    bloco (economiza um round trip): o commit/rollback da requisição descarta todos"""
+    uow['savepoints'] += 1
+    nome = f"uow_{uow['savepoints']}"
+    cur = conn.cursor()
+    try:
+        cur.execute(f"SAVEPOINT {nome}")
+    finally:
+        cur.close()
+    return nome
+
+
+def _desfazer_savepoint(conn, cur, uow, nome):
+    """ROLLBACK TO SAVEPOINT após um erro no bloco. Se o servidor já desfez a transação inteira
+    (deadlock, timeout de lock) o savepoint não existe mais: a requisição inteira é revertida"""
+    try:
+        cur.close()
+        if conn.unread_result:
+            conn.consume_results()
+        desfazer = conn.cursor()
+        try:
+            desfazer.execute(f"ROLLBACK TO SAVEPOINT {nome}")
+        finally:
+            desfazer.close()
+    except Exception:
+        uow['falhou'] = True
+        uow['pendente'] = True
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+
+
+@contextmanager
+def get_cursor(commit: bool = True, readonly: bool = False, isolado: bool = False, buffered: bool = None,
+               dictionary: bool = True):
     """Context manager que fornece um cursor MySQL e devolve a conexão ao pool ao sair.
 
     Uso:
@@ -54,12 +293,70 @@ def get_cursor(commit: bool = True):
           rows = cur.fetchall()
 
     O commit é executado automaticamente se nenhum erro for lançado.
+
+    Dentro de uma requisição Flask com init_app(app) ativo, o cursor é aberto na conexão
+    da requisição e o commit é adiado para o final da requisição (ver init_app).
+
+    readonly=True indica um método somente SELECT: não faz commit e, havendo réplicas,
+    é atendido por uma réplica (exceto se a requisição atual já usou o primário).
+
+    isolado=True ignora a unidade de trabalho da requisição: usa uma conexão própria do pool e
+    faz commit ao sair (transações curtas e independentes, ex.: importação em lote).
+
+    buffered=False força um cursor sem buffer (linhas lidas do servidor sob demanda; o resultado
+    deve ser lido até o fim antes da próxima consulta). None usa o padrão da conexão (sem buffer).
+
+    dictionary=False retorna as linhas como tuplas na ordem do SELECT (sem um dict por linha),
+    para os DAOs que montam os modelos de linha (models.*) direto da tupla.
     """
     if _pool is None:
         raise RuntimeError("Connection pool não inicializado. Chame init_db(...) primeiro.")
 
-    conn = _pool.get_connection()
-    cur = conn.cursor(dictionary=True)  # Retorna resultados como dicionários
+    operacao = operacao_chamadora(2)
+    if readonly:
+        commit = False
+
+    uow = None if isolado else _unidade_de_trabalho()
+
+    if readonly and _replica_pools and (uow is None or uow['conn'] is None):
+        if uow is not None:
+            if uow['conn_replica'] is None:
+                uow['conn_replica'] = _obter_conexao_replica()
+            conn_replica, devolver = uow['conn_replica'], False
+        else:
+            conn_replica, devolver = _obter_conexao_replica(), True
+        if conn_replica is not None:
+            with _cursor_replica(conn_replica, operacao, devolver, buffered, dictionary) as cur:
+                yield cur
+            return
+        # nenhuma réplica disponível: segue para o primário
+    if uow is not None:
+        if uow['conn'] is None:
+            uow['conn'] = _obter_conexao()
+        conn = uow['conn']
+        savepoint = _abrir_savepoint(conn, uow) if commit else None
+        cur = conn.cursor(dictionary=dictionary, buffered=buffered)
+        inicio = time.perf_counter()
+        try:
+            yield cur
+            if commit:
+                uow['pendente'] = True
+        except Exception:
+            # desfaz só o que este bloco escreveu; o commit/rollback final fica com o status da resposta
+            if savepoint is not None:
+                _desfazer_savepoint(conn, cur, uow, savepoint)
+            raise
+        finally:
+            try:
+                cur.close()
+            except Exception:
+                pass
+            DAO_QUERY_SECONDS.observe(time.perf_counter() - inicio, backend='mysql', operacao=operacao)
+        return
+
+    conn = _obter_conexao()
+    cur = conn.cursor(dictionary=dictionary, buffered=buffered)  # Por padrão retorna resultados como dicionários
+    inicio = time.perf_counter()
     try:
         yield cur
         if commit:
@@ -76,15 +373,16 @@ def get_cursor(commit: bool = True):
             cur.close()
         except Exception:
             pass
-        try:
-            conn.close()
-        except Exception:
-            pass
+        DAO_QUERY_SECONDS.observe(time.perf_counter() - inicio, backend='mysql', operacao=operacao)
+        _devolver_conexao(conn, 'mysql')
 
 
 def close_pool():
-    """Fecha o pool de conexões"""
+    """Fecha os pools de conexões (primário e réplicas)"""
     global _pool
     if _pool is not None:
         _pool._remove_connections()
-        _pool = None
\ No newline at end of file
+        _pool = None
+    for pool in _replica_pools:
+        pool._remove_connections()
+    _replica_pools.clear()
\ No newline at end of file
@@ -47,7 +47,8 @@ def init_db(db_config: dict = None, minconn: int = 1, maxconn: int = 3):
 
 
 @contextmanager
-def get_cursor(commit: bool = True):
+def get_cursor(commit: bool = True, readonly: bool = False, isolado: bool = False, buffered: bool = True,
+               dictionary: bool = True):
     """Context manager otimizado para PythonAnywhere
     
     Uso:
@@ -55,7 +56,15 @@ def get_cursor(commit: bool = True):
       with get_cursor() as cur:
           cur.execute("SELECT ...")
           rows = cur.fetchall()
+
+    readonly=True não faz commit; isolado é aceito por compatibilidade com dao_mysql.db
+    (aqui toda chamada já usa uma conexão própria).
+    buffered=False lê as linhas do servidor sob demanda (consultas grandes/streaming);
+    o resultado deve ser lido até o fim antes de sair do bloco.
+    dictionary=False retorna as linhas como tuplas na ordem do SELECT.
     """
+    if readonly:
+        commit = False
     if _pool is None:
         raise RuntimeError("Connection pool não inicializado. Chame init_db() primeiro.")
 
@@ -63,7 +72,7 @@ def get_cursor(commit: bool = True):
     cur = None
     try:
         conn = _pool.get_connection()
-        cur = conn.cursor(dictionary=True, buffered=True)
+        cur = conn.cursor(dictionary=dictionary, buffered=buffered)
         yield cur
         if commit:
             conn.commit()
@@ -0,0 +1,92 @@
+from .db import get_cursor
+
+
+class EmailOutboxDAO:
+    """DAO da tabela email_outbox (fila durável de emails, ver email_outbox.py)
+
+    status: 'pendente' -> 'enviando' (reservado por um enviador até proxima_tentativa) -> 'enviado'
+    ou 'falhou' (tentativas esgotadas). Um email 'enviando' cuja reserva venceu (enviador parou no
+    meio do lote) volta a ser reservável. O índice (status, proxima_tentativa) atende a reserva.
+    """
+
+    def inserir_email(self, destinatario, assunto, corpo_html, agora):
+        """Enfileira na transação atual (com a unidade de trabalho, só é visível após o commit da requisição)"""
+        with get_cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO email_outbox (destinatario, assunto, corpo_html, status, tentativas, proxima_tentativa, criado_em)
+                VALUES (%s, %s, %s, 'pendente', 0, %s, %s)
+                """,
+                (destinatario, assunto, corpo_html, agora, agora),
+            )
+            return cur.lastrowid
+
+    def reservar_lote(self, lote, agora, reservado_ate, limite=50):
+        """
+        Reserva até `limite` emails prontos para envio (pendentes ou com reserva vencida),
+        marcando-os com o identificador `lote`, e retorna os emails reservados
+        """
+        with get_cursor(isolado=True) as cur:
+            cur.execute(
+                """
+                UPDATE email_outbox SET status = 'enviando', lote = %s, proxima_tentativa = %s
+                WHERE status IN ('pendente', 'enviando') AND proxima_tentativa <= %s
+                ORDER BY proxima_tentativa LIMIT %s
+                """,
+                (lote, reservado_ate, agora, int(limite)),
+            )
+            if cur.rowcount == 0:
+                return []
+            cur.execute(
+                """
+                SELECT id_email, destinatario, assunto, corpo_html, tentativas FROM email_outbox
+                WHERE lote = %s AND status = 'enviando' ORDER BY id_email
+                """,
+                (lote,),
+            )
+            return cur.fetchall()
+
+    def marcar_enviados(self, ids_email, agora):
+        if not ids_email:
+            return
+        marcadores = ', '.join(['%s'] * len(ids_email))
+        with get_cursor(isolado=True) as cur:
+            cur.execute(
+                f"UPDATE email_outbox SET status = 'enviado', enviado_em = %s, lote = NULL, ultimo_erro = NULL "
+                f"WHERE id_email IN ({marcadores})",
+                (agora, *ids_email),
+            )
+
+    def reagendar(self, id_email, tentativas, proxima_tentativa, erro):
+        """Registra a falha e devolve o email para a fila a partir de proxima_tentativa"""
+        with get_cursor(isolado=True) as cur:
+            cur.execute(
+                """
+                UPDATE email_outbox SET status = 'pendente', tentativas = %s, proxima_tentativa = %s,
+                       ultimo_erro = %s, lote = NULL
+                WHERE id_email = %s
+                """,
+                (tentativas, proxima_tentativa, erro[:500], id_email),
+            )
+
+    def marcar_falhou(self, id_email, tentativas, erro):
+        with get_cursor(isolado=True) as cur:
+            cur.execute(
+                "UPDATE email_outbox SET status = 'falhou', tentativas = %s, ultimo_erro = %s, lote = NULL "
+                "WHERE id_email = %s",
+                (tentativas, erro[:500], id_email),
+            )
+
+    def remover_enviados(self, antes, lote=500):
+        """Remove até `lote` emails enviados antes de `antes`. Retorna a quantidade removida"""
+        with get_cursor(isolado=True) as cur:
+            cur.execute(
+                "DELETE FROM email_outbox WHERE status = 'enviado' AND enviado_em < %s ORDER BY enviado_em LIMIT %s",
+                (antes, int(lote)),
+            )
+            return cur.rowcount
+
+    def contar_por_status(self):
+        with get_cursor(readonly=True) as cur:
+            cur.execute("SELECT status, COUNT(*) AS total FROM email_outbox GROUP BY status")
+            return {row['status']: row['total'] for row in cur.fetchall()}
@@ -1,13 +1,14 @@
 from .db import get_cursor
+from models.funcionario import Funcionario
 
 class FuncionarioDAO:
     def __init__(self):
         pass
 
     def listar_funcionarios(self):
-        with get_cursor() as cur:
+        with get_cursor(readonly=True, dictionary=False) as cur:
             cur.execute("SELECT id_funcionario, nome, cargo, salario, data_contratacao FROM Funcionario;")
-            return cur.fetchall()
+            return [Funcionario(*row) for row in cur.fetchall()]
 
     def inserir_funcionario(self, id_funcionario, nome, cargo, salario, data_contratacao):
         with get_cursor() as cur:
@@ -20,13 +21,13 @@ class FuncionarioDAO:
             )
 
     def buscar_funcionario(self, id_funcionario):
-        with get_cursor() as cur:
+        with get_cursor(readonly=True, dictionary=False) as cur:
             cur.execute(
                 "SELECT id_funcionario, nome, cargo, salario, data_contratacao FROM Funcionario WHERE id_funcionario = %s;",
                 (id_funcionario,),
             )
             row = cur.fetchone()
-            return row
+            return Funcionario(*row) if row else None
 
     def atualizar_funcionario(self, id_funcionario, nome, cargo, salario, data_contratacao):
         with get_cursor() as cur:
@@ -1,13 +1,14 @@
 from .db import get_cursor
+from models.item_venda import ItemVenda
 
 class ItemVendaDAO:
     def __init__(self):
         pass
 
     def listar_items_por_venda(self, id_venda):
-        with get_cursor() as cur:
+        with get_cursor(readonly=True, dictionary=False) as cur:
             cur.execute("SELECT id_item, id_venda, id_produto, quantidade, preco_unitario FROM Item_Venda WHERE id_venda = %s;", (id_venda,))
-            return cur.fetchall()
+            return [ItemVenda(*row) for row in cur.fetchall()]
 
     def inserir_item(self, id_item, id_venda, id_produto, quantidade, preco_unitario):
         with get_cursor() as cur:
@@ -20,13 +21,13 @@ class ItemVendaDAO:
             )
 
     def buscar_item(self, id_item):
-        with get_cursor() as cur:
+        with get_cursor(readonly=True, dictionary=False) as cur:
             cur.execute(
                 "SELECT id_item, id_venda, id_produto, quantidade, preco_unitario FROM Item_Venda WHERE id_item = %s;",
                 (id_item,),
             )
             row = cur.fetchone()
-            return row
+            return ItemVenda(*row) if row else None
 
     def atualizar_item(self, id_item, quantidade, preco_unitario):
         with get_cursor() as cur:
@@ -1,16 +1,95 @@
+import logging
+import re
+
 from .db import get_cursor
+from models.produto import Produto
+
+logger = logging.getLogger(__name__)
+
+CAMPOS_PRODUTO = ('id_produto', 'nome', 'descricao', 'preco', 'estoque', 'nome_imagem')
+
+
+def _termos_busca(texto, maximo=10):
+    """Palavras da busca sem operadores/pontuação (nada do texto do usuário vira sintaxe de busca)"""
+    return re.findall(r'\w+', (texto or '').lower())[:maximo]
+
 
 class ProdutoDAO:
     def __init__(self):
         pass
 
-    def listar_produtos(self):
-        """Lista todos os produtos"""
-        with get_cursor() as cur:
-            sql = "SELECT id_produto, nome, descricao, preco, estoque, nome_imagem FROM Produto"
-            cur.execute(sql)
-            rows = cur.fetchall()
-            return rows
+    def listar_produtos(self, after=None, limit=None, fields=None, primario=False):
+        """Lista os produtos ordenados por id_produto (paginação por cursor opcional)"""
+        return list(self.iterar_produtos(after=after, limit=limit, fields=fields, primario=primario))
+
+    def iterar_produtos(self, after=None, limit=None, fields=None, batch_size=500, primario=False):
+        """
+        Percorre os produtos com paginação por cursor (keyset), sem carregar tudo em memória
+
+        after: retorna apenas produtos com id_produto maior que este valor
+        limit: quantidade máxima de produtos
+        fields: colunas desejadas (id_produto é sempre incluído)
+        primario: lê do primário mesmo havendo réplicas (ex.: para preencher o cache, que não
+        pode guardar a versão atrasada de uma réplica logo após uma escrita)
+
+        Sem projeção retorna modelos Produto (montados direto da tupla do cursor); com projeção,
+        dicts apenas com as colunas pedidas
+        """
+        colunas = self.colunas_projecao(fields)
+        sql = f"SELECT {', '.join(colunas)} FROM Produto"
+        params = []
+        if after is not None:
+            sql += " WHERE id_produto > %s"
+            params.append(int(after))
+        sql += " ORDER BY id_produto"
+        if limit is not None:
+            sql += " LIMIT %s"
+            params.append(int(limit))
+
+        with get_cursor(commit=False, readonly=not primario, dictionary=bool(fields)) as cur:
+            cur.execute(sql, tuple(params))
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                if fields:
+                    yield from rows
+                else:
+                    yield from map(Produto.from_row, rows)
+
+    @staticmethod
+    def colunas_projecao(fields=None):
+        """Valida a projeção de campos e retorna as colunas do SELECT"""
+        if not fields:
+            return list(CAMPOS_PRODUTO)
+        invalidos = [campo for campo in fields if campo not in CAMPOS_PRODUTO]
+        if invalidos:
+            raise ValueError(f"Campos inválidos: {', '.join(invalidos)}")
+        return ['id_produto'] + [campo for campo in CAMPOS_PRODUTO if campo in fields and campo != 'id_produto']
+
+    def buscar_texto(self, texto, limit=20, offset=0):
+        """
+        Busca textual em nome e descrição pelo índice FULLTEXT ft_produto_busca
+
+        Cada palavra de `texto` é obrigatória e casa por prefixo ("frei" encontra "freio");
+        palavras menores que innodb_ft_min_token_size (3) ou stopwords são ignoradas pelo MySQL.
+        Retorna [(Produto, relevancia)] da maior para a menor relevância, paginado por limit/offset
+        """
+        termos = _termos_busca(texto)
+        if not termos:
+            return []
+        consulta = ' '.join(f'+{termo}*' for termo in termos)
+        sql = f"""
+            SELECT {', '.join(CAMPOS_PRODUTO)},
+                   MATCH(nome, descricao) AGAINST (%s IN BOOLEAN MODE) AS relevancia
+            FROM Produto
+            WHERE MATCH(nome, descricao) AGAINST (%s IN BOOLEAN MODE)
+            ORDER BY relevancia DESC, id_produto
+            LIMIT %s OFFSET %s
+        """
+        with get_cursor(readonly=True, dictionary=False) as cur:
+            cur.execute(sql, (consulta, consulta, int(limit), int(offset)))
+            return [(Produto(*row[:-1]), float(row[-1])) for row in cur.fetchall()]
 
     def inserir_produto(self, id_produto, nome, descricao, preco, estoque, url=None):
         with get_cursor() as cur:
@@ -22,13 +101,13 @@ class ProdutoDAO:
                 (id_produto, nome, descricao, preco, estoque, url),
             )
 
-    def buscar_produto(self, id_produto):
-        """Busca um produto específico pelo ID"""
-        with get_cursor() as cur:
+    def buscar_produto(self, id_produto, primario=False):
+        """Busca um produto específico pelo ID (primario=True: ignora as réplicas, ver iterar_produtos)"""
+        with get_cursor(commit=False, readonly=not primario, dictionary=False) as cur:
             sql = "SELECT id_produto, nome, descricao, preco, estoque, nome_imagem FROM Produto WHERE id_produto = %s"
             cur.execute(sql, (id_produto,))
             row = cur.fetchone()
-            return row
+            return Produto(*row) if row else None
 
     def atualizar_produto(self, id_produto, nome, descricao, preco, estoque, nome_imagem=None):
         with get_cursor() as cur:
@@ -40,6 +119,14 @@ class ProdutoDAO:
                 (nome, descricao, preco, estoque, nome_imagem, id_produto),
             )
 
+    def atualizar_nome_imagem(self, id_produto, nome_imagem):
+        """Atualiza apenas o indicador de imagem, sem sobrescrever os demais campos"""
+        with get_cursor() as cur:
+            cur.execute(
+                "UPDATE Produto SET nome_imagem = %s WHERE id_produto = %s",
+                (nome_imagem, id_produto),
+            )
+
     def deletar_produto(self, id_produto):
         with get_cursor() as cur:
             cur.execute("DELETE FROM Produto WHERE id_produto = %s;", (id_produto,))
@@ -54,53 +141,48 @@ class ProdutoDAO:
             getattr(produto, 'url', None),
         )
 
+    def inserir_produtos_lote(self, produtos):
+        """
+        Insere vários produtos (dicts com nome, descricao, preco, estoque) em uma única
+        transação com executemany. Se alguma linha falhar, nenhuma é inserida.
+        A transação é própria e commitada na hora, mesmo dentro de uma requisição (isolado=True).
+        Retorna a quantidade de produtos inseridos
+        """
+        if not produtos:
+            return 0
+        with get_cursor(isolado=True) as cur:
+            cur.executemany(
+                "INSERT INTO Produto (nome, descricao, preco, estoque) VALUES (%s, %s, %s, %s)",
+                [(p['nome'], p.get('descricao', ''), p['preco'], p['estoque']) for p in produtos],
+            )
+        return len(produtos)
+
     def criar_produto(self, dados):
         """
         Cria um novo produto sem especificar ID (auto-increment)
         Retorna o produto criado com o ID gerado
         """
-        print(f"🗄️ [DAO DEBUG] Iniciando criação de produto com dados: {dados}")
-        
-        try:
-            with get_cursor() as cur:
-                print("🗄️ [DAO DEBUG] Cursor obtido, executando INSERT...")
-                
-                # INSERT do produto
-                sql_insert = """
-                INSERT INTO Produto (nome, descricao, preco, estoque, nome_imagem)
-                VALUES (%s, %s, %s, %s, %s)
-                """
-                params = (dados['nome'], dados.get('descricao', ''), dados['preco'], dados['estoque'], dados.get('nome_imagem'))
-                
-                print(f"🗄️ [DAO DEBUG] SQL INSERT: {sql_insert}")
-                print(f"🗄️ [DAO DEBUG] Parâmetros: {params}")
-                
-                cur.execute(sql_insert, params)
-                
-                # Obter o ID do produto criado
-                produto_id = cur.lastrowid
-                print(f"🗄️ [DAO DEBUG] Produto inserido com ID: {produto_id}")
-                
-                # Buscar o produto na MESMA transação
-                print(f"🗄️ [DAO DEBUG] Buscando produto na mesma transação...")
-                sql_select = "SELECT id_produto, nome, descricao, preco, estoque, nome_imagem FROM Produto WHERE id_produto = %s"
-                print(f"🗄️ [DAO DEBUG] SQL SELECT: {sql_select}")
-                print(f"🗄️ [DAO DEBUG] ID para busca: {produto_id}")
-                
-                cur.execute(sql_select, (produto_id,))
-                row = cur.fetchone()
-                
-                if row:
-                    produto_criado = row
-                    print(f"🗄️ [DAO DEBUG] Produto encontrado na mesma transação: {produto_criado}")
-                    return produto_criado
-                else:
-                    print(f"🗄️ [DAO DEBUG] ERRO: Produto não encontrado mesmo na mesma transação!")
-                    return None
-                
-        except Exception as e:
-            print(f"💥 [DAO ERROR] Erro ao criar produto: {e}")
-            import traceback
-            print("📊 [DAO ERROR] Stack trace:")
-            traceback.print_exc()
-            raise e
\ No newline at end of file
+        with get_cursor(dictionary=False) as cur:
+            # INSERT do produto
+            sql_insert = """
+            INSERT INTO Produto (nome, descricao, preco, estoque, nome_imagem)
+            VALUES (%s, %s, %s, %s, %s)
+            """
+            params = (dados['nome'], dados.get('descricao', ''), dados['preco'], dados['estoque'], dados.get('nome_imagem'))
+            cur.execute(sql_insert, params)
+
+            # Obter o ID do produto criado
+            produto_id = cur.lastrowid
+            logger.debug("Produto inserido", extra={"id_produto": produto_id, "params": params})
+
+            # Buscar o produto na MESMA transação
+            cur.execute(
+                "SELECT id_produto, nome, descricao, preco, estoque, nome_imagem FROM Produto WHERE id_produto = %s",
+                (produto_id,),
+            )
+            row = cur.fetchone()
+
+            if not row:
+                logger.error("Produto %s não encontrado na mesma transação do INSERT", produto_id)
+                return None
+            return Produto(*row)
@@ -0,0 +1,63 @@
+from .db import get_cursor
+
+
+class TokenRecuperacaoDAO:
+    """DAO da tabela token_recuperacao (tokens de recuperação de senha)
+
+    A chave é o SHA256 do token (token_hash): o token em si só existe no link enviado por email.
+    O índice em expira_em atende a limpeza dos expirados (remover_expirados) sem varrer a tabela.
+    """
+
+    def inserir_token(self, token_hash, email, expira_em):
+        with get_cursor() as cur:
+            cur.execute(
+                "INSERT INTO token_recuperacao (token_hash, email, expira_em, usado) VALUES (%s, %s, %s, 0)",
+                (token_hash, email, expira_em),
+            )
+
+    def buscar_token(self, token_hash):
+        """Busca o token no primário (não na réplica): o token acabou de ser criado por outro worker"""
+        with get_cursor(commit=False) as cur:
+            cur.execute(
+                "SELECT token_hash, email, expira_em, usado FROM token_recuperacao WHERE token_hash = %s",
+                (token_hash,),
+            )
+            return cur.fetchone()
+
+    def marcar_usado(self, token_hash, agora):
+        """
+        Marca o token como usado se ainda não foi usado nem expirou
+        Retorna True se este chamador marcou o token (atômico entre workers)
+        """
+        with get_cursor() as cur:
+            cur.execute(
+                "UPDATE token_recuperacao SET usado = 1 WHERE token_hash = %s AND usado = 0 AND expira_em > %s",
+                (token_hash, agora),
+            )
+            return cur.rowcount == 1
+
+    def remover_token(self, token_hash):
+        with get_cursor() as cur:
+            cur.execute("DELETE FROM token_recuperacao WHERE token_hash = %s", (token_hash,))
+
+    def remover_expirados(self, agora, lote=500):
+        """
+        Remove até `lote` tokens expirados (pelo índice de expira_em), em uma transação própria
+        Retorna a quantidade removida (menor que lote: não há mais expirados)
+        """
+        with get_cursor(isolado=True) as cur:
+            cur.execute(
+                "DELETE FROM token_recuperacao WHERE expira_em <= %s ORDER BY expira_em LIMIT %s",
+                (agora, int(lote)),
+            )
+            return cur.rowcount
+
+    def listar_ativos(self, agora, limite=100):
+        """Tokens ainda não expirados, dos que expiram primeiro aos últimos"""
+        with get_cursor(readonly=True) as cur:
+            cur.execute(
+                "SELECT token_hash, email, expira_em, usado FROM token_recuperacao "
+                "WHERE expira_em > %s ORDER BY expira_em LIMIT %s",
+                (agora, int(limite)),
+            )
+            return cur.fetchall()
@@ -8,7 +8,7 @@ class UsuarioDAO:
 
     def listar_usuarios(self):
         """Lista todos os usuários com seus dados básicos (sem senha_hash)"""
-        with get_cursor() as cur:
+        with get_cursor(readonly=True) as cur:
             cur.execute("""
                 SELECT u.id_usuario, u.nome, u.email, u.telefone, u.ativo, 
                        u.data_criacao, u.id_nivel_acesso, n.nome as nivel_acesso_nome
@@ -20,7 +20,7 @@ class UsuarioDAO:
 
     def buscar_usuario(self, id_usuario):
         """Busca um usuário específico por ID (sem senha_hash)"""
-        with get_cursor() as cur:
+        with get_cursor(readonly=True) as cur:
             cur.execute("""
                 SELECT u.id_usuario, u.nome, u.email, u.telefone, u.ativo, 
                        u.data_criacao, u.id_nivel_acesso, n.nome as nivel_acesso_nome
@@ -33,7 +33,7 @@ class UsuarioDAO:
 
     def buscar_usuario_por_email(self, email):
         """Busca um usuário específico por email (sem senha_hash)"""
-        with get_cursor() as cur:
+        with get_cursor(readonly=True) as cur:
             cur.execute("""
                 SELECT u.id_usuario, u.nome, u.email, u.telefone, u.ativo, 
                        u.data_criacao, u.id_nivel_acesso, n.nome as nivel_acesso_nome
@@ -46,7 +46,7 @@ class UsuarioDAO:
 
     def listar_usuarios_por_nivel(self, id_nivel_acesso):
         """Lista todos os usuários de um nível de acesso específico"""
-        with get_cursor() as cur:
+        with get_cursor(readonly=True) as cur:
             cur.execute("""
                 SELECT u.id_usuario, u.nome, u.email, u.telefone, u.ativo, 
                        u.data_criacao, u.id_nivel_acesso, n.nome as nivel_acesso_nome
@@ -59,7 +59,7 @@ class UsuarioDAO:
 
     def listar_usuarios_ativos(self):
         """Lista apenas usuários ativos"""
-        with get_cursor() as cur:
+        with get_cursor(readonly=True) as cur:
             cur.execute("""
                 SELECT u.id_usuario, u.nome, u.email, u.telefone, u.ativo, 
                        u.data_criacao, u.id_nivel_acesso, n.nome as nivel_acesso_nome
@@ -75,7 +75,7 @@ class UsuarioDAO:
         Autentica um usuário por email e hash da senha
         Retorna dados do usuário se autenticação for bem-sucedida, None caso contrário
         """
-        with get_cursor() as cur:
+        with get_cursor(readonly=True) as cur:
             cur.execute("""
                 SELECT u.id_usuario, u.nome, u.email, u.telefone, u.ativo, 
                        u.data_criacao, u.id_nivel_acesso, n.nome as nivel_acesso_nome
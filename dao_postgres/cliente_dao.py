@@ -1,4 +1,4 @@
-from dao.db import get_cursor
+from .db import get_cursor
 from models.cliente import Cliente
 
 class ClienteDAO:
@@ -1,6 +1,8 @@
 import os
+import time
 from contextlib import contextmanager
 from psycopg2 import pool
+from metrics import DAO_QUERY_SECONDS, DB_POOL_WAIT_SECONDS, DB_POOL_EM_USO, operacao_chamadora
 
 _pool = None
 
@@ -35,22 +37,29 @@ def init_db(db_config: dict = None, minconn: int = 1, maxconn: int = 5):
 
 
 @contextmanager
-def get_cursor(commit: bool = True):
+def get_cursor(commit: bool = True, nome: str = None):
     """Context manager que fornece um cursor e devolve a conexão ao pool ao sair.
 
     Uso:
-      from dao.db import get_cursor
+      from dao_postgres.db import get_cursor
       with get_cursor() as cur:
           cur.execute("SELECT ...")
           rows = cur.fetchall()
 
     O commit é executado automaticamente se nenhum erro for lançado.
+    nome: cria um cursor nomeado (server-side), que busca as linhas do servidor em blocos
+    de cur.itersize ao iterar, em vez de carregar todo o resultado no cliente.
     """
     if _pool is None:
         raise RuntimeError("Connection pool não inicializado. Chame init_db(...) primeiro.")
 
-    conn = _pool.getconn()
-    cur = conn.cursor()
+    operacao = operacao_chamadora(2)
+
+    with DB_POOL_WAIT_SECONDS.time(backend='postgres'):
+        conn = _pool.getconn()
+    DB_POOL_EM_USO.inc(backend='postgres')
+    cur = conn.cursor(name=nome) if nome else conn.cursor()
+    inicio = time.perf_counter()
     try:
         yield cur
         if commit:
@@ -67,7 +76,9 @@ def get_cursor(commit: bool = True):
             cur.close()
         except Exception:
             pass
+        DAO_QUERY_SECONDS.observe(time.perf_counter() - inicio, backend='postgres', operacao=operacao)
         _pool.putconn(conn)
+        DB_POOL_EM_USO.dec(backend='postgres')
 
 
 def close_pool():
@@ -1,14 +1,91 @@
-from dao.db import get_cursor
+import csv
+import io
+import re
+
+from .db import get_cursor
 from models.produto import Produto
 
+CAMPOS_PRODUTO = ('id_produto', 'nome', 'descricao', 'preco', 'estoque')
+
+
+def _termos_busca(texto, maximo=10):
+    """Palavras da busca sem operadores/pontuação (nada do texto do usuário vira sintaxe de busca)"""
+    return re.findall(r'\w+', (texto or '').lower())[:maximo]
+
+
 class ProdutoDAO:
     def __init__(self):
         pass
 
-    def listar_produtos(self):
-        with get_cursor() as cur:
-            cur.execute("SELECT id_produto, nome, descricao, preco, estoque FROM Produto;")
-            return [Produto(*row) for row in cur.fetchall()]
+    def listar_produtos(self, after=None, limit=None, fields=None, primario=False):
+        """Lista os produtos ordenados por id_produto (paginação por cursor opcional)"""
+        return list(self.iterar_produtos(after=after, limit=limit, fields=fields))
+
+    def iterar_produtos(self, after=None, limit=None, fields=None, batch_size=500, primario=False):
+        """
+        Percorre os produtos com paginação por cursor (keyset), sem carregar tudo em memória
+
+        after: retorna apenas produtos com id_produto maior que este valor
+        limit: quantidade máxima de produtos
+        fields: colunas desejadas (id_produto é sempre incluído)
+        primario: aceito por compatibilidade com o DAO MySQL (este backend não tem réplicas)
+        """
+        colunas = self.colunas_projecao(fields)
+        sql = f"SELECT {', '.join(colunas)} FROM Produto"
+        params = []
+        if after is not None:
+            sql += " WHERE id_produto > %s"
+            params.append(int(after))
+        sql += " ORDER BY id_produto"
+        if limit is not None:
+            sql += " LIMIT %s"
+            params.append(int(limit))
+
+        # cursor nomeado (server-side): fetchmany traz batch_size linhas por vez do servidor; um
+        # cursor comum do psycopg2 carregaria o resultado inteiro já no execute
+        with get_cursor(commit=False, nome='iterar_produtos') as cur:
+            cur.itersize = batch_size
+            cur.execute(sql, tuple(params))
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    # Sem projeção mantém o modelo Produto; com projeção retorna dict
+                    yield Produto(*row) if not fields else dict(zip(colunas, row))
+
+    @staticmethod
+    def colunas_projecao(fields=None):
+        """Valida a projeção de campos e retorna as colunas do SELECT"""
+        if not fields:
+            return list(CAMPOS_PRODUTO)
+        invalidos = [campo for campo in fields if campo not in CAMPOS_PRODUTO]
+        if invalidos:
+            raise ValueError(f"Campos inválidos: {', '.join(invalidos)}")
+        return ['id_produto'] + [campo for campo in CAMPOS_PRODUTO if campo in fields and campo != 'id_produto']
+
+    def buscar_texto(self, texto, limit=20, offset=0):
+        """
+        Busca textual em nome e descrição pela coluna tsvector Produto.busca (índice GIN)
+
+        Cada palavra de `texto` é obrigatória e casa por prefixo, com stemming em português.
+        Relevância = ts_rank (nome com peso A, descrição com peso B).
+        Retorna [(Produto, relevancia)] da maior para a menor relevância, paginado por limit/offset
+        """
+        termos = _termos_busca(texto)
+        if not termos:
+            return []
+        consulta = ' & '.join(f'{termo}:*' for termo in termos)
+        sql = f"""
+            SELECT {', '.join(CAMPOS_PRODUTO)}, ts_rank(busca, consulta) AS relevancia
+            FROM Produto, to_tsquery('portuguese', %s) AS consulta
+            WHERE busca @@ consulta
+            ORDER BY relevancia DESC, id_produto
+            LIMIT %s OFFSET %s
+        """
+        with get_cursor(commit=False) as cur:
+            cur.execute(sql, (consulta, int(limit), int(offset)))
+            return [(Produto(*row[:-1]), float(row[-1])) for row in cur.fetchall()]
 
     def inserir_produto(self, id_produto, nome, descricao=None, preco=0.0, estoque=0):
         with get_cursor() as cur:
@@ -20,7 +97,7 @@ class ProdutoDAO:
                 (id_produto, nome, descricao, preco, estoque),
             )
 
-    def buscar_produto(self, id_produto):
+    def buscar_produto(self, id_produto, primario=False):
         with get_cursor() as cur:
             cur.execute(
                 "SELECT id_produto, nome, descricao, preco, estoque FROM Produto WHERE id_produto = %s;",
@@ -52,3 +129,24 @@ class ProdutoDAO:
             produto.preco,
             produto.estoque,
         )
+
+    def inserir_produtos_lote(self, produtos):
+        """
+        Insere vários produtos (dicts com nome, descricao, preco, estoque) em uma única
+        transação usando COPY ... FROM STDIN. Se alguma linha falhar, nenhuma é inserida.
+        Retorna a quantidade de produtos inseridos
+        """
+        if not produtos:
+            return 0
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        for p in produtos:
+            # com NULL '\N', descrição vazia é gravada como '' (e não NULL), como nos demais backends
+            escritor.writerow((p['nome'], p.get('descricao', ''), p['preco'], p['estoque']))
+        buffer.seek(0)
+        with get_cursor() as cur:
+            cur.copy_expert(
+                "COPY Produto (nome, descricao, preco, estoque) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                buffer,
+            )
+        return len(produtos)
@@ -1,7 +1,73 @@
-from dao.db import get_cursor
+from datetime import timedelta
+from decimal import Decimal
+from psycopg2.extras import execute_values
+from .db import get_cursor
 from models.venda import Venda
 
+
+# Colunas da exportação de vendas (uma linha por item; vendas sem itens vêm com os campos do item nulos)
+CAMPOS_EXPORTACAO_VENDA = (
+    'id_venda', 'data_venda', 'id_cliente', 'id_funcionario', 'total',
+    'id_item', 'id_produto', 'nome_produto', 'quantidade', 'preco_unitario',
+)
+
+
+# Expansões de buscar_venda_detalhada: {expansão: (prefixo no documento, alias, colunas, JOIN)}
+# A ordem importa: 'produtos' depende da junção de 'itens'
+EXPANSOES_VENDA = {
+    'cliente': ('cliente', 'c', ('id_cliente', 'nome', 'email', 'telefone', 'endereco'),
+                "LEFT JOIN Cliente c ON c.id_cliente = v.id_cliente"),
+    'funcionario': ('funcionario', 'f', ('id_funcionario', 'nome', 'cargo', 'salario', 'data_contratacao'),
+                    "LEFT JOIN Funcionario f ON f.id_funcionario = v.id_funcionario"),
+    'itens': ('item', 'i', ('id_item', 'id_produto', 'quantidade', 'preco_unitario'),
+              "LEFT JOIN Item_Venda i ON i.id_venda = v.id_venda"),
+    'produtos': ('produto', 'p', ('id_produto', 'nome', 'descricao', 'preco', 'estoque'),
+                 "LEFT JOIN Produto p ON p.id_produto = i.id_produto"),
+}
+
+CAMPOS_VENDA = ('id_venda', 'id_cliente', 'id_funcionario', 'data_venda', 'total')
+
+
+def _extrair(linha, prefixo, colunas):
+    """Campos de uma relação (colunas '{prefixo}__{coluna}') ou None se o LEFT JOIN não encontrou"""
+    if linha[f"{prefixo}__{colunas[0]}"] is None:
+        return None
+    return {coluna: linha[f"{prefixo}__{coluna}"] for coluna in colunas}
+
+
+def _montar_venda_detalhada(linhas, expand):
+    """Monta o documento aninhado da venda a partir das linhas do JOIN (uma por item)"""
+    venda = None
+    for linha in linhas:
+        if venda is None:
+            venda = _extrair(linha, 'venda', CAMPOS_VENDA)
+            for relacao in ('cliente', 'funcionario'):
+                if relacao in expand:
+                    prefixo, _, colunas, _ = EXPANSOES_VENDA[relacao]
+                    venda[relacao] = _extrair(linha, prefixo, colunas)
+            if 'itens' in expand:
+                venda['itens'] = []
+        if 'itens' in expand:
+            item = _extrair(linha, 'item', EXPANSOES_VENDA['itens'][2])
+            if item is None:
+                continue
+            if 'produtos' in expand:
+                item['produto'] = _extrair(linha, 'produto', EXPANSOES_VENDA['produtos'][2])
+            venda['itens'].append(item)
+    return venda
+
+
+class ProdutoNaoEncontradoError(ValueError):
+    """Produto de um item da venda não existe"""
+
+
+class EstoqueInsuficienteError(ValueError):
+    """Estoque do produto não atende a quantidade do item"""
+
+
 class VendaDAO:
+    CAMPOS_EXPORTACAO = CAMPOS_EXPORTACAO_VENDA
+
     def __init__(self):
         pass
 
@@ -29,6 +95,38 @@ class VendaDAO:
             row = cur.fetchone()
             return Venda(*row) if row else None
 
+    def buscar_venda_detalhada(self, id_venda, expand=()):
+        """
+        Busca a venda com as relações de expand (itens, produtos, cliente, funcionario) em uma
+        única consulta com JOINs e monta o documento aninhado:
+          {...venda, 'cliente': {...}, 'funcionario': {...}, 'itens': [{...item, 'produto': {...}}]}
+        'produtos' implica 'itens'. Retorna None se a venda não existir
+        Lança ValueError para expansões desconhecidas
+        """
+        expand = set(expand)
+        invalidas = expand - set(EXPANSOES_VENDA)
+        if invalidas:
+            raise ValueError(f"Expansões inválidas: {', '.join(sorted(invalidas))}")
+        if 'produtos' in expand:
+            expand.add('itens')
+
+        aliases = [f"venda__{campo}" for campo in CAMPOS_VENDA]
+        colunas = [f"v.{campo} AS venda__{campo}" for campo in CAMPOS_VENDA]
+        juncoes = []
+        for relacao, (prefixo, alias, campos, juncao) in EXPANSOES_VENDA.items():
+            if relacao in expand:
+                aliases += [f"{prefixo}__{campo}" for campo in campos]
+                colunas += [f"{alias}.{campo} AS {prefixo}__{campo}" for campo in campos]
+                juncoes.append(juncao)
+
+        sql = f"SELECT {', '.join(colunas)} FROM Venda v {' '.join(juncoes)} WHERE v.id_venda = %s"
+        if 'itens' in expand:
+            sql += " ORDER BY i.id_item"
+
+        with get_cursor(commit=False) as cur:
+            cur.execute(sql, (id_venda,))
+            return _montar_venda_detalhada([dict(zip(aliases, row)) for row in cur.fetchall()], expand)
+
     def atualizar_venda(self, id_venda, id_cliente, id_funcionario, data_venda, total=None):
         with get_cursor() as cur:
             cur.execute(
@@ -40,8 +138,103 @@ class VendaDAO:
             )
 
     def deletar_venda(self, id_venda):
+        return self.excluir_venda(id_venda)
+
+    def excluir_venda(self, id_venda):
+        """
+        Exclui a venda e seus itens e desconta a venda do VendaResumoDiario, em uma única transação
+        Retorna False se a venda não existir
+        """
         with get_cursor() as cur:
+            cur.execute("SELECT id_venda FROM Venda WHERE id_venda = %s FOR UPDATE;", (id_venda,))
+            if not cur.fetchone():
+                return False
+            self._atualizar_resumo_diario(cur, id_venda, -1)
+            cur.execute("DELETE FROM Item_Venda WHERE id_venda = %s;", (id_venda,))
             cur.execute("DELETE FROM Venda WHERE id_venda = %s;", (id_venda,))
+            return True
+
+    def _atualizar_resumo_diario(self, cur, id_venda, sinal):
+        """
+        Soma (sinal=1) ou desconta (sinal=-1) uma venda do VendaResumoDiario, no cursor (transação)
+        de quem chamou: uma linha por produto vendido no dia e a linha do total do dia (id_produto 0)
+        """
+        cur.execute(
+            """
+            INSERT INTO VendaResumoDiario (dia, id_produto, receita, vendas, unidades)
+            SELECT CAST(v.data_venda AS DATE), i.id_produto, %s * SUM(i.quantidade * i.preco_unitario), %s, %s * SUM(i.quantidade)
+            FROM Venda v
+            JOIN Item_Venda i ON i.id_venda = v.id_venda
+            WHERE v.id_venda = %s
+            GROUP BY CAST(v.data_venda AS DATE), i.id_produto
+            ON CONFLICT (dia, id_produto) DO UPDATE SET receita = VendaResumoDiario.receita + EXCLUDED.receita,
+                vendas = VendaResumoDiario.vendas + EXCLUDED.vendas,
+                unidades = VendaResumoDiario.unidades + EXCLUDED.unidades
+            """,
+            (sinal, sinal, sinal, id_venda),
+        )
+        cur.execute(
+            """
+            INSERT INTO VendaResumoDiario (dia, id_produto, receita, vendas, unidades)
+            SELECT CAST(v.data_venda AS DATE), 0, %s * COALESCE(v.total, 0), %s,
+                   %s * COALESCE((SELECT SUM(i.quantidade) FROM Item_Venda i WHERE i.id_venda = v.id_venda), 0)
+            FROM Venda v
+            WHERE v.id_venda = %s
+            ON CONFLICT (dia, id_produto) DO UPDATE SET receita = VendaResumoDiario.receita + EXCLUDED.receita,
+                vendas = VendaResumoDiario.vendas + EXCLUDED.vendas,
+                unidades = VendaResumoDiario.unidades + EXCLUDED.unidades
+            """,
+            (sinal, sinal, sinal, id_venda),
+        )
+        if sinal < 0:
+            cur.execute(
+                "DELETE FROM VendaResumoDiario WHERE vendas <= 0 "
+                "AND dia = (SELECT CAST(v.data_venda AS DATE) FROM Venda v WHERE v.id_venda = %s);",
+                (id_venda,),
+            )
+
+    def resumo_diario(self, data_inicio, data_fim, id_produto=0):
+        """
+        Lê apenas o agregado VendaResumoDiario: dicts com dia, receita, vendas e unidades de cada dia
+        com vendas entre data_inicio e data_fim (inclusivas), em ordem de dia.
+        id_produto=0 (padrão) retorna o total de cada dia
+        """
+        with get_cursor(commit=False) as cur:
+            cur.execute(
+                "SELECT dia, receita, vendas, unidades FROM VendaResumoDiario "
+                "WHERE id_produto = %s AND dia BETWEEN %s AND %s ORDER BY dia;",
+                (id_produto, data_inicio, data_fim),
+            )
+            return [dict(zip(('dia', 'receita', 'vendas', 'unidades'), row)) for row in cur.fetchall()]
+
+    def reconstruir_resumo_diario(self):
+        """
+        Recalcula todo o VendaResumoDiario a partir de Venda/Item_Venda
+        (carga inicial em bancos com histórico ou correção após alterações manuais)
+        """
+        with get_cursor() as cur:
+            cur.execute("DELETE FROM VendaResumoDiario;")
+            cur.execute(
+                """
+                INSERT INTO VendaResumoDiario (dia, id_produto, receita, vendas, unidades)
+                SELECT CAST(v.data_venda AS DATE), i.id_produto, SUM(i.quantidade * i.preco_unitario),
+                       COUNT(DISTINCT v.id_venda), SUM(i.quantidade)
+                FROM Venda v
+                JOIN Item_Venda i ON i.id_venda = v.id_venda
+                GROUP BY CAST(v.data_venda AS DATE), i.id_produto
+                """
+            )
+            cur.execute(
+                """
+                INSERT INTO VendaResumoDiario (dia, id_produto, receita, vendas, unidades)
+                SELECT CAST(v.data_venda AS DATE), 0, SUM(COALESCE(v.total, 0)), COUNT(*), SUM(COALESCE(iv.unidades, 0))
+                FROM Venda v
+                LEFT JOIN (
+                    SELECT id_venda, SUM(quantidade) AS unidades FROM Item_Venda GROUP BY id_venda
+                ) iv ON iv.id_venda = v.id_venda
+                GROUP BY CAST(v.data_venda AS DATE)
+                """
+            )
 
     def inserir_venda_obj(self, venda: Venda):
         """Convenience: insere usando um modelo Venda"""
@@ -52,3 +245,115 @@ class VendaDAO:
             venda.data_venda,
             venda.total,
         )
+
+    def exportar_vendas(self, data_inicio, data_fim, batch_size=1000):
+        """
+        Percorre as vendas de data_inicio a data_fim (datas inclusivas) com seus itens e o nome
+        dos produtos, uma linha (dict com CAMPOS_EXPORTACAO_VENDA) por item, sem carregar o
+        resultado em memória: cursor nomeado (server-side), lido em blocos de batch_size
+        """
+        with get_cursor(commit=False, nome='exportar_vendas') as cur:
+            cur.itersize = batch_size
+            cur.execute(
+                """
+                SELECT v.id_venda, v.data_venda, v.id_cliente, v.id_funcionario, v.total,
+                       i.id_item, i.id_produto, p.nome AS nome_produto, i.quantidade, i.preco_unitario
+                FROM Venda v
+                LEFT JOIN Item_Venda i ON i.id_venda = v.id_venda
+                LEFT JOIN Produto p ON p.id_produto = i.id_produto
+                WHERE v.data_venda >= %s AND v.data_venda < %s
+                ORDER BY v.data_venda, v.id_venda, i.id_item
+                """,
+                (data_inicio, data_fim + timedelta(days=1)),
+            )
+            for row in cur:
+                yield dict(zip(CAMPOS_EXPORTACAO_VENDA, row))
+
+    def finalizar_venda(self, id_venda, id_cliente, id_funcionario, data_venda, itens, total=None):
+        """
+        Registra a venda e seus itens em uma única transação, com número constante de round trips:
+        - bloqueia todos os produtos dos itens com um único SELECT ... FOR UPDATE
+        - insere a Venda com o total calculado (se total não for informado)
+        - insere os itens com execute_values (um único INSERT multi-linha)
+        - decrementa o estoque com um único UPDATE ... FROM (VALUES ...)
+
+        itens: lista de dicts com id_produto, quantidade e opcionalmente preco_unitario e id_item
+        Lança ProdutoNaoEncontradoError / EstoqueInsuficienteError (nada é gravado nesses casos)
+        """
+        quantidades = {}
+        for item in itens:
+            quantidades[item['id_produto']] = quantidades.get(item['id_produto'], 0) + item['quantidade']
+        ids_produtos = sorted(quantidades)
+
+        with get_cursor() as cur:
+            produtos = {}
+            if ids_produtos:
+                cur.execute(
+                    "SELECT id_produto, nome, preco, estoque FROM Produto WHERE id_produto = ANY(%s) "
+                    "ORDER BY id_produto FOR UPDATE",
+                    (ids_produtos,),
+                )
+                produtos = {row[0]: row for row in cur.fetchall()}
+
+            for id_produto in ids_produtos:
+                produto = produtos.get(id_produto)
+                if not produto:
+                    raise ProdutoNaoEncontradoError(f"Produto com ID {id_produto} não encontrado")
+                if produto[3] < quantidades[id_produto]:
+                    raise EstoqueInsuficienteError(
+                        f"Estoque insuficiente para produto {produto[1]}. Disponível: {produto[3]}"
+                    )
+
+            precos = [Decimal(str(item.get('preco_unitario', produtos[item['id_produto']][2]))) for item in itens]
+            total_calculado = sum((preco * item['quantidade'] for item, preco in zip(itens, precos)), Decimal('0'))
+
+            if not total:
+                total = total_calculado
+
+            cur.execute(
+                """
+                INSERT INTO Venda (id_venda, id_cliente, id_funcionario, data_venda, total)
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                (id_venda, id_cliente, id_funcionario, data_venda, total),
+            )
+
+            # gerar id_item para itens sem id (mesma estratégia de ItemVendaDAO.add_item_to_venda)
+            proximo_id = None
+            if any(item.get('id_item') is None for item in itens):
+                cur.execute("SELECT COALESCE(MAX(id_item), 0) FROM Item_Venda")
+                proximo_id = cur.fetchone()[0]
+
+            linhas_itens = []
+            for item, preco_unitario in zip(itens, precos):
+                id_item = item.get('id_item')
+                if id_item is None:
+                    proximo_id += 1
+                    id_item = proximo_id
+                linhas_itens.append((id_item, id_venda, item['id_produto'], item['quantidade'], preco_unitario))
+
+            if linhas_itens:
+                execute_values(
+                    cur,
+                    "INSERT INTO Item_Venda (id_item, id_venda, id_produto, quantidade, preco_unitario) VALUES %s",
+                    linhas_itens,
+                )
+
+                execute_values(
+                    cur,
+                    """
+                    UPDATE Produto SET estoque = Produto.estoque - v.quantidade
+                    FROM (VALUES %s) AS v(id_produto, quantidade)
+                    WHERE Produto.id_produto = v.id_produto
+                    """,
+                    [(id_produto, quantidades[id_produto]) for id_produto in ids_produtos],
+                )
+
+            self._atualizar_resumo_diario(cur, id_venda, 1)
+
+            cur.execute(
+                "SELECT id_venda, id_cliente, id_funcionario, data_venda, total FROM Venda WHERE id_venda = %s;",
+                (id_venda,),
+            )
+            row = cur.fetchone()
+            return Venda(*row) if row else None
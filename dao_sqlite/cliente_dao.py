@@ -1,10 +1,11 @@
 from .db import get_cursor
+from models.cliente import Cliente
 
 class ClienteDAO:
     def listar_clientes(self):
-        with get_cursor() as cur:
+        with get_cursor(readonly=True) as cur:
             cur.execute("SELECT id_cliente, nome, email, telefone, endereco FROM Cliente;")
-            return [dict(row) for row in cur.fetchall()]
+            return [Cliente(*row) for row in cur.fetchall()]
 
     def inserir_cliente(self, id_cliente, nome, email, telefone, endereco):
         with get_cursor() as cur:
@@ -17,13 +18,13 @@ class ClienteDAO:
             )
 
     def buscar_cliente(self, id_cliente):
-        with get_cursor() as cur:
+        with get_cursor(readonly=True) as cur:
             cur.execute(
                 "SELECT id_cliente, nome, email, telefone, endereco FROM Cliente WHERE id_cliente = ?;",
                 (id_cliente,),
             )
             row = cur.fetchone()
-            return dict(row) if row else None
+            return Cliente(*row) if row else None
 
     def atualizar_cliente(self, id_cliente, nome, email, telefone, endereco):
         with get_cursor() as cur:
@@ -1,62 +1,188 @@
 import os
+import queue
 import sqlite3
 import threading
+import time
 from contextlib import contextmanager
+from metrics import DAO_QUERY_SECONDS, DB_POOL_WAIT_SECONDS, DB_POOL_EM_USO, operacao_chamadora
 
 # Configuração global
 _db_path = None
 _db_lock = threading.Lock()
+_cached_statements = 256
+_readonly_pool = False
+
+# Pools de conexões persistentes (escrita e, opcionalmente, somente leitura), criados por processo
+_pool_tamanho = 5
+_pool_timeout = 30.0
+_pools = {}
+_pools_pid = None
 
 
 def init_db(db_config: dict = None, minconn: int = 1, maxconn: int = 5):
     """Inicializa o caminho do banco SQLite.
-    
+
     db_config: dict com chave 'database' (caminho do arquivo SQLite).
       Exemplo: {'database': 'app_sqlite.db'}
+    Chaves opcionais:
+      'cached_statements': tamanho do cache de prepared statements por conexão (padrão 256)
+      'readonly_pool': True para usar conexões somente leitura (mode=ro) em get_cursor(readonly=True)
     Se db_config for None, usa variável de ambiente SQLITE_DB ou padrão 'banco_api.sqlite'.
-    
-    Os parâmetros minconn e maxconn são ignorados (compatibilidade com interface PostgreSQL).
+
+    maxconn: conexões persistentes por pool (escrita e somente leitura), abertas sob demanda e
+    reutilizadas por todas as threads (ver get_cursor). minconn é ignorado (compatibilidade com
+    a interface PostgreSQL). 'pool_timeout' (segundos, padrão 30) limita a espera por uma
+    conexão livre quando todas estão em uso.
     """
-    global _db_path
+    global _db_path, _cached_statements, _readonly_pool, _pool_tamanho, _pool_timeout
     if _db_path is not None:
         return
-    
-    if db_config is None:
-        _db_path = os.getenv('SQLITE_DB', 'banco_api.sqlite')
+
+    db_config = db_config or {}
+    _db_path = db_config.get('database') or os.getenv('SQLITE_DB', 'banco_api.sqlite')
+    _cached_statements = int(db_config.get('cached_statements', 256))
+    _readonly_pool = bool(db_config.get('readonly_pool', False))
+    _pool_tamanho = max(1, int(db_config.get('maxconn', maxconn)))
+    _pool_timeout = float(db_config.get('pool_timeout', 30.0))
+
+    # journal_mode=WAL é persistente no arquivo: basta configurar uma vez
+    conn = sqlite3.connect(_db_path, timeout=30.0)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")  # Write-Ahead Logging
+    finally:
+        conn.close()
+
+
+def _connect(readonly: bool = False):
+    """Abre e configura (uma única vez) uma conexão persistente do pool.
+    check_same_thread=False porque a conexão passa entre threads (uma de cada vez, via pool).
+    """
+    if readonly:
+        conn = sqlite3.connect(
+            f"file:{_db_path}?mode=ro", uri=True, timeout=30.0,
+            cached_statements=_cached_statements, check_same_thread=False,
+        )
+        conn.execute("PRAGMA query_only=ON")
     else:
-        _db_path = db_config.get('database', 'banco_api.sqlite')
+        conn = sqlite3.connect(
+            _db_path, timeout=30.0, cached_statements=_cached_statements, check_same_thread=False
+        )
+    conn.row_factory = sqlite3.Row
+
+    # Configurações por conexão para melhor performance
+    conn.execute("PRAGMA synchronous=NORMAL")  # Sincronização mais rápida
+    conn.execute("PRAGMA cache_size=10000")  # Cache maior
+    conn.execute("PRAGMA temp_store=memory")  # Temporários em memória
+
+    return conn
+
+
+class _PoolConexoes:
+    """Pool limitado de conexões: abre até `tamanho` conexões sob demanda e as reutiliza.
+    Sem conexão livre, espera até `timeout` segundos por uma devolução."""
+
+    def __init__(self, readonly, tamanho, timeout):
+        self.readonly = readonly
+        self.tamanho = tamanho
+        self.timeout = timeout
+        self._livres = queue.LifoQueue()
+        self._abertas = 0
+        self._lock = threading.Lock()
+
+    def obter(self):
+        try:
+            return self._livres.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            abrir = self._abertas < self.tamanho
+            if abrir:
+                self._abertas += 1
+        if abrir:
+            try:
+                return _connect(self.readonly)
+            except Exception:
+                with self._lock:
+                    self._abertas -= 1
+                raise
+        try:
+            return self._livres.get(timeout=self.timeout)
+        except queue.Empty:
+            raise RuntimeError(
+                f"Pool SQLite esgotado: {self.tamanho} conexões em uso há mais de {self.timeout:g}s"
+            )
+
+    def devolver(self, conn):
+        if _pools.get(self.readonly) is not self:
+            # pool fechado (close_pool/novo init_db) enquanto a conexão estava em uso
+            conn.close()
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        self._livres.put(conn)
+
+    def fechar(self):
+        while True:
+            try:
+                conn = self._livres.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+def _obter_pool(readonly: bool = False):
+    """Pool do processo atual (após fork o filho cria os seus; as conexões do pai não são usadas)"""
+    global _pools_pid
+    readonly = bool(readonly and _readonly_pool)
+    if _pools_pid != os.getpid():
+        with _db_lock:
+            if _pools_pid != os.getpid():
+                _pools.clear()
+                _pools_pid = os.getpid()
+    pool = _pools.get(readonly)
+    if pool is None:
+        with _db_lock:
+            pool = _pools.get(readonly)
+            if pool is None:
+                pool = _pools[readonly] = _PoolConexoes(readonly, _pool_tamanho, _pool_timeout)
+    return pool
 
 
 @contextmanager
-def get_cursor(commit: bool = True):
+def get_cursor(commit: bool = True, readonly: bool = False):
     """Context manager que fornece um cursor SQLite e executa commit/rollback automaticamente.
-    
+
     Uso:
       from dao_sqlite.db import get_cursor
       with get_cursor() as cur:
           cur.execute("SELECT ...")
           rows = cur.fetchall()
-    
+
     O commit é executado automaticamente se nenhum erro for lançado.
+    readonly=True indica um método somente SELECT (usa a conexão somente leitura se habilitada).
+
+    Cada bloco obtém uma conexão do pool e a devolve ao sair, inclusive blocos aninhados na mesma
+    thread: o commit/rollback de um bloco interno não afeta a transação do bloco externo.
     """
     if _db_path is None:
         raise RuntimeError("Database path não inicializado. Chame init_db(...) primeiro.")
-    
-    # Remover lock global para melhorar performance
-    # SQLite lida com concorrência internamente
-    conn = sqlite3.connect(_db_path, timeout=30.0)  # Timeout de 30 segundos
-    conn.row_factory = sqlite3.Row
-    
-    # Configurações para melhor performance
-    conn.execute("PRAGMA journal_mode=WAL")  # Write-Ahead Logging
-    conn.execute("PRAGMA synchronous=NORMAL")  # Sincronização mais rápida
-    conn.execute("PRAGMA cache_size=10000")  # Cache maior
-    conn.execute("PRAGMA temp_store=memory")  # Temporários em memória
-    
+
+    operacao = operacao_chamadora(2)
+
+    # Conexão persistente do pool: PRAGMAs já aplicados na abertura
+    pool = _obter_pool(readonly)
+    with DB_POOL_WAIT_SECONDS.time(backend='sqlite'):
+        conn = pool.obter()
+    DB_POOL_EM_USO.inc(backend='sqlite')
+
     cur = conn.cursor()
+    inicio = time.perf_counter()
     try:
         yield cur
-        if commit:
+        if commit and not readonly:
             conn.commit()
     except Exception:
         try:
@@ -69,16 +195,19 @@ def get_cursor(commit: bool = True):
             cur.close()
         except Exception:
             pass
-        try:
-            conn.close()
-        except Exception:
-            pass
+        DAO_QUERY_SECONDS.observe(time.perf_counter() - inicio, backend='sqlite', operacao=operacao)
+        DB_POOL_EM_USO.dec(backend='sqlite')
+        pool.devolver(conn)
 
 
 def close_pool():
-    """Fecha o pool (compatibilidade com interface PostgreSQL).
-    Para SQLite, apenas reseta o caminho do banco.
+    """Fecha as conexões livres dos pools (compatibilidade com interface PostgreSQL)
+    e reseta o caminho do banco. Conexões em uso são fechadas ao serem devolvidas.
     """
     global _db_path
+    with _db_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.fechar()
     _db_path = None
-
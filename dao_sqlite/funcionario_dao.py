@@ -1,10 +1,11 @@
 from .db import get_cursor
+from models.funcionario import Funcionario
 
 class FuncionarioDAO:
     def listar_funcionarios(self):
-        with get_cursor() as cur:
+        with get_cursor(readonly=True) as cur:
             cur.execute("SELECT id_funcionario, nome, cargo, salario, data_contratacao FROM Funcionario;")
-            return [dict(row) for row in cur.fetchall()]
+            return [Funcionario(*row) for row in cur.fetchall()]
 
     def inserir_funcionario(self, id_funcionario, nome, cargo, salario, data_contratacao):
         with get_cursor() as cur:
@@ -17,13 +18,13 @@ class FuncionarioDAO:
             )
 
     def buscar_funcionario(self, id_funcionario):
-        with get_cursor() as cur:
+        with get_cursor(readonly=True) as cur:
             cur.execute(
                 "SELECT id_funcionario, nome, cargo, salario, data_contratacao FROM Funcionario WHERE id_funcionario = ?;",
                 (id_funcionario,),
             )
             row = cur.fetchone()
-            return dict(row) if row else None
+            return Funcionario(*row) if row else None
 
     def atualizar_funcionario(self, id_funcionario, nome, cargo, salario, data_contratacao):
         with get_cursor() as cur:
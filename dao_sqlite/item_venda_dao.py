@@ -1,10 +1,11 @@
 from .db import get_cursor
+from models.item_venda import ItemVenda
 
 class ItemVendaDAO:
     def listar_items_por_venda(self, id_venda):
-        with get_cursor() as cur:
+        with get_cursor(readonly=True) as cur:
             cur.execute("SELECT id_item, id_venda, id_produto, quantidade, preco_unitario FROM Item_Venda WHERE id_venda = ?;", (id_venda,))
-            return [dict(row) for row in cur.fetchall()]
+            return [ItemVenda(*row) for row in cur.fetchall()]
 
     def inserir_item(self, id_item, id_venda, id_produto, quantidade, preco_unitario):
         with get_cursor() as cur:
@@ -17,13 +18,13 @@ class ItemVendaDAO:
             )
 
     def buscar_item(self, id_item):
-        with get_cursor() as cur:
+        with get_cursor(readonly=True) as cur:
             cur.execute(
                 "SELECT id_item, id_venda, id_produto, quantidade, preco_unitario FROM Item_Venda WHERE id_item = ?;",
                 (id_item,),
             )
             row = cur.fetchone()
-            return dict(row) if row else None
+            return ItemVenda(*row) if row else None
 
     def atualizar_item(self, id_item, quantidade, preco_unitario):
         with get_cursor() as cur:
@@ -0,0 +1,30 @@
+from .db import get_cursor
+
+class NivelAcessoDAO:
+    """DAO para operações de leitura da tabela nivel_acesso"""
+
+    def listar_niveis_acesso(self):
+        """Lista todos os níveis de acesso disponíveis"""
+        with get_cursor(readonly=True) as cur:
+            cur.execute("SELECT id_nivel_acesso, nome FROM nivel_acesso ORDER BY nome;")
+            return [dict(row) for row in cur.fetchall()]
+
+    def buscar_nivel_acesso(self, id_nivel_acesso):
+        """Busca um nível de acesso específico por ID"""
+        with get_cursor(readonly=True) as cur:
+            cur.execute(
+                "SELECT id_nivel_acesso, nome FROM nivel_acesso WHERE id_nivel_acesso = ?;",
+                (id_nivel_acesso,),
+            )
+            row = cur.fetchone()
+            return dict(row) if row else None
+
+    def buscar_nivel_acesso_por_nome(self, nome):
+        """Busca um nível de acesso específico por nome"""
+        with get_cursor(readonly=True) as cur:
+            cur.execute(
+                "SELECT id_nivel_acesso, nome FROM nivel_acesso WHERE nome = ?;",
+                (nome,),
+            )
+            row = cur.fetchone()
+            return dict(row) if row else None
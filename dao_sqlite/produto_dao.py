@@ -1,13 +1,93 @@
+import logging
+import re
+
 from .db import get_cursor
+from models.produto import Produto
+
+logger = logging.getLogger(__name__)
+
+CAMPOS_PRODUTO = ('id_produto', 'nome', 'descricao', 'preco', 'estoque', 'nome_imagem')
+
+
+def _termos_busca(texto, maximo=10):
+    """Palavras da busca sem operadores/pontuação (nada do texto do usuário vira sintaxe de busca)"""
+    return re.findall(r'\w+', (texto or '').lower())[:maximo]
+
 
 class ProdutoDAO:
-    def listar_produtos(self):
-        """Lista todos os produtos"""
-        with get_cursor() as cur:
-            sql = "SELECT id_produto, nome, descricao, preco, estoque, nome_imagem FROM Produto"
-            cur.execute(sql)
-            rows = cur.fetchall()
-            return [dict(row) for row in rows]
+    def listar_produtos(self, after=None, limit=None, fields=None, primario=False):
+        """Lista os produtos ordenados por id_produto (paginação por cursor opcional)"""
+        return list(self.iterar_produtos(after=after, limit=limit, fields=fields))
+
+    def iterar_produtos(self, after=None, limit=None, fields=None, batch_size=500, primario=False):
+        """
+        Percorre os produtos com paginação por cursor (keyset), sem carregar tudo em memória
+
+        after: retorna apenas produtos com id_produto maior que este valor
+        limit: quantidade máxima de produtos
+        fields: colunas desejadas (id_produto é sempre incluído)
+        primario: aceito por compatibilidade com o DAO MySQL (este backend não tem réplicas)
+
+        Sem projeção retorna modelos Produto (montados direto da tupla do cursor); com projeção,
+        dicts apenas com as colunas pedidas
+        """
+        colunas = self.colunas_projecao(fields)
+        sql = f"SELECT {', '.join(colunas)} FROM Produto"
+        params = []
+        if after is not None:
+            sql += " WHERE id_produto > ?"
+            params.append(int(after))
+        sql += " ORDER BY id_produto"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with get_cursor(commit=False, readonly=True) as cur:
+            cur.execute(sql, tuple(params))
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                if fields:
+                    for row in rows:
+                        yield dict(row)
+                else:
+                    yield from map(Produto.from_row, rows)
+
+    @staticmethod
+    def colunas_projecao(fields=None):
+        """Valida a projeção de campos e retorna as colunas do SELECT"""
+        if not fields:
+            return list(CAMPOS_PRODUTO)
+        invalidos = [campo for campo in fields if campo not in CAMPOS_PRODUTO]
+        if invalidos:
+            raise ValueError(f"Campos inválidos: {', '.join(invalidos)}")
+        return ['id_produto'] + [campo for campo in CAMPOS_PRODUTO if campo in fields and campo != 'id_produto']
+
+    def buscar_texto(self, texto, limit=20, offset=0):
+        """
+        Busca textual em nome e descrição pela tabela FTS5 produto_fts (mantida por triggers)
+
+        Cada palavra de `texto` é obrigatória e casa por prefixo ("frei" encontra "freio"), sem
+        diferenciar acentos. Relevância = bm25 com peso maior para o nome.
+        Retorna [(Produto, relevancia)] da maior para a menor relevância, paginado por limit/offset
+        """
+        termos = _termos_busca(texto)
+        if not termos:
+            return []
+        consulta = ' '.join(f'"{termo}"*' for termo in termos)
+        colunas = ', '.join(f'p.{campo}' for campo in CAMPOS_PRODUTO)
+        sql = f"""
+            SELECT {colunas}, -bm25(produto_fts, 10.0, 1.0) AS relevancia
+            FROM produto_fts
+            JOIN Produto p ON p.id_produto = produto_fts.rowid
+            WHERE produto_fts MATCH ?
+            ORDER BY relevancia DESC, p.id_produto
+            LIMIT ? OFFSET ?
+        """
+        with get_cursor(readonly=True) as cur:
+            cur.execute(sql, (consulta, int(limit), int(offset)))
+            return [(Produto(*tuple(row)[:-1]), row['relevancia']) for row in cur.fetchall()]
 
     def inserir_produto(self, id_produto, nome, descricao, preco, estoque, url=None):
         with get_cursor() as cur:
@@ -19,13 +99,13 @@ class ProdutoDAO:
                 (id_produto, nome, descricao, preco, estoque, url),
             )
 
-    def buscar_produto(self, id_produto):
+    def buscar_produto(self, id_produto, primario=False):
         """Busca um produto específico pelo ID"""
-        with get_cursor() as cur:
+        with get_cursor(readonly=True) as cur:
             sql = "SELECT id_produto, nome, descricao, preco, estoque, nome_imagem FROM Produto WHERE id_produto = ?"
             cur.execute(sql, (id_produto,))
             row = cur.fetchone()
-            return dict(row) if row else None
+            return Produto(*row) if row else None
 
     def atualizar_produto(self, id_produto, nome, descricao, preco, estoque, nome_imagem=None):
         with get_cursor() as cur:
@@ -37,6 +117,14 @@ class ProdutoDAO:
                 (nome, descricao, preco, estoque, nome_imagem, id_produto),
             )
 
+    def atualizar_nome_imagem(self, id_produto, nome_imagem):
+        """Atualiza apenas o indicador de imagem, sem sobrescrever os demais campos"""
+        with get_cursor() as cur:
+            cur.execute(
+                "UPDATE Produto SET nome_imagem = ? WHERE id_produto = ?",
+                (nome_imagem, id_produto),
+            )
+
     def deletar_produto(self, id_produto):
         with get_cursor() as cur:
             cur.execute("DELETE FROM Produto WHERE id_produto = ?;", (id_produto,))
@@ -51,53 +139,47 @@ class ProdutoDAO:
             getattr(produto, 'url', None),
         )
 
+    def inserir_produtos_lote(self, produtos):
+        """
+        Insere vários produtos (dicts com nome, descricao, preco, estoque) em uma única
+        transação com executemany. Se alguma linha falhar, nenhuma é inserida.
+        Retorna a quantidade de produtos inseridos
+        """
+        if not produtos:
+            return 0
+        with get_cursor() as cur:
+            cur.executemany(
+                "INSERT INTO Produto (nome, descricao, preco, estoque) VALUES (?, ?, ?, ?)",
+                [(p['nome'], p.get('descricao', ''), p['preco'], p['estoque']) for p in produtos],
+            )
+        return len(produtos)
+
     def criar_produto(self, dados):
         """
         Cria um novo produto sem especificar ID (auto-increment)
         Retorna o produto criado com o ID gerado
         """
-        print(f"🗄️ [DAO DEBUG] Iniciando criação de produto com dados: {dados}")
-        
-        try:
-            with get_cursor() as cur:
-                print("🗄️ [DAO DEBUG] Cursor obtido, executando INSERT...")
-                
-                # INSERT do produto
-                sql_insert = """
-                INSERT INTO Produto (nome, descricao, preco, estoque, nome_imagem)
-                VALUES (?, ?, ?, ?, ?)
-                """
-                params = (dados['nome'], dados.get('descricao', ''), dados['preco'], dados['estoque'], dados.get('nome_imagem'))
-                
-                print(f"🗄️ [DAO DEBUG] SQL INSERT: {sql_insert}")
-                print(f"🗄️ [DAO DEBUG] Parâmetros: {params}")
-                
-                cur.execute(sql_insert, params)
-                
-                # Obter o ID do produto criado
-                produto_id = cur.lastrowid
-                print(f"🗄️ [DAO DEBUG] Produto inserido com ID: {produto_id}")
-                
-                # Buscar o produto na MESMA transação
-                print(f"🗄️ [DAO DEBUG] Buscando produto na mesma transação...")
-                sql_select = "SELECT id_produto, nome, descricao, preco, estoque, nome_imagem FROM Produto WHERE id_produto = ?"
-                print(f"🗄️ [DAO DEBUG] SQL SELECT: {sql_select}")
-                print(f"🗄️ [DAO DEBUG] ID para busca: {produto_id}")
-                
-                cur.execute(sql_select, (produto_id,))
-                row = cur.fetchone()
-                
-                if row:
-                    produto_criado = dict(row)
-                    print(f"🗄️ [DAO DEBUG] Produto encontrado na mesma transação: {produto_criado}")
-                    return produto_criado
-                else:
-                    print(f"🗄️ [DAO DEBUG] ERRO: Produto não encontrado mesmo na mesma transação!")
-                    return None
-                
-        except Exception as e:
-            print(f"💥 [DAO ERROR] Erro ao criar produto: {e}")
-            import traceback
-            print("📊 [DAO ERROR] Stack trace:")
-            traceback.print_exc()
-            raise e
+        with get_cursor() as cur:
+            # INSERT do produto
+            sql_insert = """
+            INSERT INTO Produto (nome, descricao, preco, estoque, nome_imagem)
+            VALUES (?, ?, ?, ?, ?)
+            """
+            params = (dados['nome'], dados.get('descricao', ''), dados['preco'], dados['estoque'], dados.get('nome_imagem'))
+            cur.execute(sql_insert, params)
+
+            # Obter o ID do produto criado
+            produto_id = cur.lastrowid
+            logger.debug("Produto inserido", extra={"id_produto": produto_id, "params": params})
+
+            # Buscar o produto na MESMA transação
+            cur.execute(
+                "SELECT id_produto, nome, descricao, preco, estoque, nome_imagem FROM Produto WHERE id_produto = ?",
+                (produto_id,),
+            )
+            row = cur.fetchone()
+
+            if not row:
+                logger.error("Produto %s não encontrado na mesma transação do INSERT", produto_id)
+                return None
+            return Produto(*row)
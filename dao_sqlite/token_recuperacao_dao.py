@@ -0,0 +1,81 @@
+from datetime import datetime
+
+from .db import get_cursor
+
+
+def _texto_data(valor):
+    """expira_em é gravado como texto ISO ('YYYY-MM-DD HH:MM:SS'), comparável como string"""
+    return valor.isoformat(sep=' ', timespec='seconds')
+
+
+def _linha_token(row):
+    if row is None:
+        return None
+    token = dict(row)
+    token['expira_em'] = datetime.fromisoformat(token['expira_em'])
+    return token
+
+
+class TokenRecuperacaoDAO:
+    """DAO da tabela token_recuperacao (tokens de recuperação de senha)
+
+    A chave é o SHA256 do token (token_hash): o token em si só existe no link enviado por email.
+    O índice em expira_em atende a limpeza dos expirados (remover_expirados) sem varrer a tabela.
+    """
+
+    def inserir_token(self, token_hash, email, expira_em):
+        with get_cursor() as cur:
+            cur.execute(
+                "INSERT INTO token_recuperacao (token_hash, email, expira_em, usado) VALUES (?, ?, ?, 0)",
+                (token_hash, email, _texto_data(expira_em)),
+            )
+
+    def buscar_token(self, token_hash):
+        with get_cursor(readonly=True) as cur:
+            cur.execute(
+                "SELECT token_hash, email, expira_em, usado FROM token_recuperacao WHERE token_hash = ?",
+                (token_hash,),
+            )
+            return _linha_token(cur.fetchone())
+
+    def marcar_usado(self, token_hash, agora):
+        """
+        Marca o token como usado se ainda não foi usado nem expirou
+        Retorna True se este chamador marcou o token (atômico entre workers)
+        """
+        with get_cursor() as cur:
+            cur.execute(
+                "UPDATE token_recuperacao SET usado = 1 WHERE token_hash = ? AND usado = 0 AND expira_em > ?",
+                (token_hash, _texto_data(agora)),
+            )
+            return cur.rowcount == 1
+
+    def remover_token(self, token_hash):
+        with get_cursor() as cur:
+            cur.execute("DELETE FROM token_recuperacao WHERE token_hash = ?", (token_hash,))
+
+    def remover_expirados(self, agora, lote=500):
+        """
+        Remove até `lote` tokens expirados (pelo índice de expira_em)
+        Retorna a quantidade removida (menor que lote: não há mais expirados)
+        """
+        with get_cursor() as cur:
+            cur.execute(
+                """
+                DELETE FROM token_recuperacao WHERE token_hash IN (
+                    SELECT token_hash FROM token_recuperacao WHERE expira_em <= ? ORDER BY expira_em LIMIT ?
+                )
+                """,
+                (_texto_data(agora), int(lote)),
+            )
+            return cur.rowcount
+
+    def listar_ativos(self, agora, limite=100):
+        """Tokens ainda não expirados, dos que expiram primeiro aos últimos"""
+        with get_cursor(readonly=True) as cur:
+            cur.execute(
+                "SELECT token_hash, email, expira_em, usado FROM token_recuperacao "
+                "WHERE expira_em > ? ORDER BY expira_em LIMIT ?",
+                (_texto_data(agora), int(limite)),
+            )
+            return [_linha_token(row) for row in cur.fetchall()]
@@ -1,10 +1,75 @@
+from datetime import date, timedelta
 from .db import get_cursor
+from models.venda import Venda
+
+
+# Colunas da exportação de vendas (uma linha por item; vendas sem itens vêm com os campos do item nulos)
+CAMPOS_EXPORTACAO_VENDA = (
+    'id_venda', 'data_venda', 'id_cliente', 'id_funcionario', 'total',
+    'id_item', 'id_produto', 'nome_produto', 'quantidade', 'preco_unitario',
+)
+
+
+# Expansões de buscar_venda_detalhada: {expansão: (prefixo no documento, alias, colunas, JOIN)}
+# A ordem importa: 'produtos' depende da junção de 'itens'
+EXPANSOES_VENDA = {
+    'cliente': ('cliente', 'c', ('id_cliente', 'nome', 'email', 'telefone', 'endereco'),
+                "LEFT JOIN Cliente c ON c.id_cliente = v.id_cliente"),
+    'funcionario': ('funcionario', 'f', ('id_funcionario', 'nome', 'cargo', 'salario', 'data_contratacao'),
+                    "LEFT JOIN Funcionario f ON f.id_funcionario = v.id_funcionario"),
+    'itens': ('item', 'i', ('id_item', 'id_produto', 'quantidade', 'preco_unitario'),
+              "LEFT JOIN Item_Venda i ON i.id_venda = v.id_venda"),
+    'produtos': ('produto', 'p', ('id_produto', 'nome', 'descricao', 'preco', 'estoque'),
+                 "LEFT JOIN Produto p ON p.id_produto = i.id_produto"),
+}
+
+CAMPOS_VENDA = ('id_venda', 'id_cliente', 'id_funcionario', 'data_venda', 'total')
+
+
+def _extrair(linha, prefixo, colunas):
+    """Campos de uma relação (colunas '{prefixo}__{coluna}') ou None se o LEFT JOIN não encontrou"""
+    if linha[f"{prefixo}__{colunas[0]}"] is None:
+        return None
+    return {coluna: linha[f"{prefixo}__{coluna}"] for coluna in colunas}
+
+
+def _montar_venda_detalhada(linhas, expand):
+    """Monta o documento aninhado da venda a partir das linhas do JOIN (uma por item)"""
+    venda = None
+    for linha in linhas:
+        if venda is None:
+            venda = _extrair(linha, 'venda', CAMPOS_VENDA)
+            for relacao in ('cliente', 'funcionario'):
+                if relacao in expand:
+                    prefixo, _, colunas, _ = EXPANSOES_VENDA[relacao]
+                    venda[relacao] = _extrair(linha, prefixo, colunas)
+            if 'itens' in expand:
+                venda['itens'] = []
+        if 'itens' in expand:
+            item = _extrair(linha, 'item', EXPANSOES_VENDA['itens'][2])
+            if item is None:
+                continue
+            if 'produtos' in expand:
+                item['produto'] = _extrair(linha, 'produto', EXPANSOES_VENDA['produtos'][2])
+            venda['itens'].append(item)
+    return venda
+
+
+class ProdutoNaoEncontradoError(ValueError):
+    """Produto de um item da venda não existe"""
+
+
+class EstoqueInsuficienteError(ValueError):
+    """Estoque do produto não atende a quantidade do item"""
+
 
 class VendaDAO:
+    CAMPOS_EXPORTACAO = CAMPOS_EXPORTACAO_VENDA
+
     def listar_vendas(self):
-        with get_cursor() as cur:
+        with get_cursor(readonly=True) as cur:
             cur.execute("SELECT id_venda, id_cliente, id_funcionario, data_venda, total FROM Venda;")
-            return [dict(row) for row in cur.fetchall()]
+            return [Venda(*row) for row in cur.fetchall()]
 
     def inserir_venda(self, id_venda, id_cliente, id_funcionario, data_venda, total):
         with get_cursor() as cur:
@@ -17,13 +82,43 @@ class VendaDAO:
             )
 
     def buscar_venda(self, id_venda):
-        with get_cursor() as cur:
+        with get_cursor(readonly=True) as cur:
             cur.execute(
                 "SELECT id_venda, id_cliente, id_funcionario, data_venda, total FROM Venda WHERE id_venda = ?;",
                 (id_venda,),
             )
             row = cur.fetchone()
-            return dict(row) if row else None
+            return Venda(*row) if row else None
+
+    def buscar_venda_detalhada(self, id_venda, expand=()):
+        """
+        Busca a venda com as relações de expand (itens, produtos, cliente, funcionario) em uma
+        única consulta com JOINs e monta o documento aninhado:
+          {...venda, 'cliente': {...}, 'funcionario': {...}, 'itens': [{...item, 'produto': {...}}]}
+        'produtos' implica 'itens'. Retorna None se a venda não existir
+        Lança ValueError para expansões desconhecidas
+        """
+        expand = set(expand)
+        invalidas = expand - set(EXPANSOES_VENDA)
+        if invalidas:
+            raise ValueError(f"Expansões inválidas: {', '.join(sorted(invalidas))}")
+        if 'produtos' in expand:
+            expand.add('itens')
+
+        colunas = [f"v.{campo} AS venda__{campo}" for campo in CAMPOS_VENDA]
+        juncoes = []
+        for relacao, (prefixo, alias, campos, juncao) in EXPANSOES_VENDA.items():
+            if relacao in expand:
+                colunas += [f"{alias}.{campo} AS {prefixo}__{campo}" for campo in campos]
+                juncoes.append(juncao)
+
+        sql = f"SELECT {', '.join(colunas)} FROM Venda v {' '.join(juncoes)} WHERE v.id_venda = ?"
+        if 'itens' in expand:
+            sql += " ORDER BY i.id_item"
+
+        with get_cursor(readonly=True) as cur:
+            cur.execute(sql, (id_venda,))
+            return _montar_venda_detalhada([dict(row) for row in cur.fetchall()], expand)
 
     def atualizar_venda(self, id_venda, id_cliente, id_funcionario, data_venda, total):
         with get_cursor() as cur:
@@ -36,8 +131,101 @@ class VendaDAO:
             )
 
     def deletar_venda(self, id_venda):
+        return self.excluir_venda(id_venda)
+
+    def excluir_venda(self, id_venda):
+        """
+        Exclui a venda e seus itens e desconta a venda do VendaResumoDiario, em uma única transação
+        Retorna False se a venda não existir
+        """
         with get_cursor() as cur:
+            cur.execute("SELECT id_venda FROM Venda WHERE id_venda = ?;", (id_venda,))
+            if not cur.fetchone():
+                return False
+            self._atualizar_resumo_diario(cur, id_venda, -1)
+            cur.execute("DELETE FROM Item_Venda WHERE id_venda = ?;", (id_venda,))
             cur.execute("DELETE FROM Venda WHERE id_venda = ?;", (id_venda,))
+            return True
+
+    def _atualizar_resumo_diario(self, cur, id_venda, sinal):
+        """
+        Soma (sinal=1) ou desconta (sinal=-1) uma venda do VendaResumoDiario, no cursor (transação)
+        de quem chamou: uma linha por produto vendido no dia e a linha do total do dia (id_produto 0)
+        """
+        cur.execute(
+            """
+            INSERT INTO VendaResumoDiario (dia, id_produto, receita, vendas, unidades)
+            SELECT DATE(v.data_venda), i.id_produto, ? * SUM(i.quantidade * i.preco_unitario), ?, ? * SUM(i.quantidade)
+            FROM Venda v
+            JOIN Item_Venda i ON i.id_venda = v.id_venda
+            WHERE v.id_venda = ?
+            GROUP BY DATE(v.data_venda), i.id_produto
+            ON CONFLICT (dia, id_produto) DO UPDATE SET receita = receita + excluded.receita,
+                vendas = vendas + excluded.vendas, unidades = unidades + excluded.unidades
+            """,
+            (sinal, sinal, sinal, id_venda),
+        )
+        cur.execute(
+            """
+            INSERT INTO VendaResumoDiario (dia, id_produto, receita, vendas, unidades)
+            SELECT DATE(v.data_venda), 0, ? * COALESCE(v.total, 0), ?,
+                   ? * COALESCE((SELECT SUM(i.quantidade) FROM Item_Venda i WHERE i.id_venda = v.id_venda), 0)
+            FROM Venda v
+            WHERE v.id_venda = ?
+            ON CONFLICT (dia, id_produto) DO UPDATE SET receita = receita + excluded.receita,
+                vendas = vendas + excluded.vendas, unidades = unidades + excluded.unidades
+            """,
+            (sinal, sinal, sinal, id_venda),
+        )
+        if sinal < 0:
+            cur.execute(
+                "DELETE FROM VendaResumoDiario WHERE vendas <= 0 "
+                "AND dia = (SELECT DATE(v.data_venda) FROM Venda v WHERE v.id_venda = ?);",
+                (id_venda,),
+            )
+
+    def resumo_diario(self, data_inicio, data_fim, id_produto=0):
+        """
+        Lê apenas o agregado VendaResumoDiario: dicts com dia, receita, vendas e unidades de cada dia
+        com vendas entre data_inicio e data_fim (inclusivas), em ordem de dia.
+        id_produto=0 (padrão) retorna o total de cada dia
+        """
+        with get_cursor(readonly=True) as cur:
+            cur.execute(
+                "SELECT dia, receita, vendas, unidades FROM VendaResumoDiario "
+                "WHERE id_produto = ? AND dia BETWEEN ? AND ? ORDER BY dia;",
+                (id_produto, data_inicio.isoformat(), data_fim.isoformat()),
+            )
+            return [{**dict(row), 'dia': date.fromisoformat(row['dia'])} for row in cur.fetchall()]
+
+    def reconstruir_resumo_diario(self):
+        """
+        Recalcula todo o VendaResumoDiario a partir de Venda/Item_Venda
+        (carga inicial em bancos com histórico ou correção após alterações manuais)
+        """
+        with get_cursor() as cur:
+            cur.execute("DELETE FROM VendaResumoDiario;")
+            cur.execute(
+                """
+                INSERT INTO VendaResumoDiario (dia, id_produto, receita, vendas, unidades)
+                SELECT DATE(v.data_venda), i.id_produto, SUM(i.quantidade * i.preco_unitario),
+                       COUNT(DISTINCT v.id_venda), SUM(i.quantidade)
+                FROM Venda v
+                JOIN Item_Venda i ON i.id_venda = v.id_venda
+                GROUP BY DATE(v.data_venda), i.id_produto
+                """
+            )
+            cur.execute(
+                """
+                INSERT INTO VendaResumoDiario (dia, id_produto, receita, vendas, unidades)
+                SELECT DATE(v.data_venda), 0, SUM(COALESCE(v.total, 0)), COUNT(*), SUM(COALESCE(iv.unidades, 0))
+                FROM Venda v
+                LEFT JOIN (
+                    SELECT id_venda, SUM(quantidade) AS unidades FROM Item_Venda GROUP BY id_venda
+                ) iv ON iv.id_venda = v.id_venda
+                GROUP BY DATE(v.data_venda)
+                """
+            )
 
     def inserir_venda_obj(self, venda):
         return self.inserir_venda(
@@ -47,3 +235,113 @@ class VendaDAO:
             venda.data_venda,
             venda.total,
         )
+
+    def exportar_vendas(self, data_inicio, data_fim, batch_size=1000):
+        """
+        Percorre as vendas de data_inicio a data_fim (datas inclusivas) com seus itens e o nome
+        dos produtos, uma linha (dict com CAMPOS_EXPORTACAO_VENDA) por item, sem carregar o
+        resultado em memória (o cursor do SQLite avança sob demanda)
+        """
+        with get_cursor(readonly=True) as cur:
+            cur.execute(
+                """
+                SELECT v.id_venda, v.data_venda, v.id_cliente, v.id_funcionario, v.total,
+                       i.id_item, i.id_produto, p.nome AS nome_produto, i.quantidade, i.preco_unitario
+                FROM Venda v
+                LEFT JOIN Item_Venda i ON i.id_venda = v.id_venda
+                LEFT JOIN Produto p ON p.id_produto = i.id_produto
+                WHERE v.data_venda >= ? AND v.data_venda < ?
+                ORDER BY v.data_venda, v.id_venda, i.id_item
+                """,
+                (data_inicio.isoformat(), (data_fim + timedelta(days=1)).isoformat()),
+            )
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+
+    def finalizar_venda(self, id_venda, id_cliente, id_funcionario, data_venda, itens, total=None):
+        """
+        Registra a venda e seus itens em uma única transação, com número constante de comandos:
+        - BEGIN IMMEDIATE obtém o lock de escrita antes de ler o estoque (equivalente ao FOR UPDATE)
+        - insere a Venda com o total calculado (se total não for informado)
+        - insere os itens com executemany
+        - decrementa o estoque com um único UPDATE
+
+        itens: lista de dicts com id_produto, quantidade e opcionalmente preco_unitario e id_item
+        Lança ProdutoNaoEncontradoError / EstoqueInsuficienteError (nada é gravado nesses casos)
+        """
+        quantidades = {}
+        for item in itens:
+            quantidades[item['id_produto']] = quantidades.get(item['id_produto'], 0) + item['quantidade']
+        ids_produtos = sorted(quantidades)
+        marcadores = ', '.join(['?'] * len(ids_produtos))
+
+        with get_cursor() as cur:
+            cur.execute("BEGIN IMMEDIATE")
+
+            produtos = {}
+            if ids_produtos:
+                cur.execute(
+                    f"SELECT id_produto, nome, preco, estoque FROM Produto WHERE id_produto IN ({marcadores})",
+                    tuple(ids_produtos),
+                )
+                produtos = {row['id_produto']: dict(row) for row in cur.fetchall()}
+
+            for id_produto in ids_produtos:
+                produto = produtos.get(id_produto)
+                if not produto:
+                    raise ProdutoNaoEncontradoError(f"Produto com ID {id_produto} não encontrado")
+                if produto['estoque'] < quantidades[id_produto]:
+                    raise EstoqueInsuficienteError(
+                        f"Estoque insuficiente para produto {produto['nome']}. Disponível: {produto['estoque']}"
+                    )
+
+            precos = [float(item.get('preco_unitario', produtos[item['id_produto']]['preco'])) for item in itens]
+            total_calculado = sum(preco * item['quantidade'] for item, preco in zip(itens, precos))
+
+            if not total:
+                total = total_calculado
+
+            cur.execute(
+                """
+                INSERT INTO Venda (id_venda, id_cliente, id_funcionario, data_venda, total)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (id_venda, id_cliente, id_funcionario, data_venda, total),
+            )
+            if id_venda is None:
+                id_venda = cur.lastrowid
+
+            linhas_itens = [
+                (item.get('id_item'), id_venda, item['id_produto'], item['quantidade'], preco_unitario)
+                for item, preco_unitario in zip(itens, precos)
+            ]
+
+            if linhas_itens:
+                cur.executemany(
+                    """
+                    INSERT INTO Item_Venda (id_item, id_venda, id_produto, quantidade, preco_unitario)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    linhas_itens,
+                )
+
+                casos = ' '.join(['WHEN ? THEN ?'] * len(ids_produtos))
+                params = [valor for id_produto in ids_produtos for valor in (id_produto, quantidades[id_produto])]
+                cur.execute(
+                    f"UPDATE Produto SET estoque = estoque - CASE id_produto {casos} END "
+                    f"WHERE id_produto IN ({marcadores})",
+                    tuple(params + ids_produtos),
+                )
+
+            self._atualizar_resumo_diario(cur, id_venda, 1)
+
+            cur.execute(
+                "SELECT id_venda, id_cliente, id_funcionario, data_venda, total FROM Venda WHERE id_venda = ?;",
+                (id_venda,),
+            )
+            row = cur.fetchone()
+            return dict(row) if row else None
@@ -10,6 +10,9 @@
 
 -- Limpar tabelas existentes se necessário
 SET FOREIGN_KEY_CHECKS = 0;
+DROP TABLE IF EXISTS email_outbox;
+DROP TABLE IF EXISTS token_recuperacao;
+DROP TABLE IF EXISTS VendaResumoDiario;
 DROP TABLE IF EXISTS Item_Venda;
 DROP TABLE IF EXISTS Venda;
 DROP TABLE IF EXISTS Cliente;
@@ -73,9 +76,14 @@ CREATE TABLE Produto (
     estoque INT DEFAULT 0,
     nome_imagem VARCHAR(255),
     url VARCHAR(255),
-    PRIMARY KEY (id_produto)
+    PRIMARY KEY (id_produto),
+    -- Busca textual (ProdutoDAO.buscar_texto / GET /produtos/busca)
+    FULLTEXT KEY ft_produto_busca (nome, descricao)
 );
 
+-- Em bancos existentes:
+-- ALTER TABLE Produto ADD FULLTEXT KEY ft_produto_busca (nome, descricao);
+
 -- Tabela Venda
 CREATE TABLE Venda (
     id_venda INT NOT NULL AUTO_INCREMENT,
@@ -101,6 +109,48 @@ CREATE TABLE Item_Venda (
     KEY idx_item_produto (id_produto)
 );
 
+-- Tabela VendaResumoDiario (agregado mantido por finalizar_venda/excluir_venda na mesma transação)
+-- Uma linha por dia e produto; id_produto = 0 guarda o total do dia (receita = soma de Venda.total)
+CREATE TABLE VendaResumoDiario (
+    dia DATE NOT NULL,
+    id_produto INT NOT NULL,
+    receita DECIMAL(14,2) NOT NULL DEFAULT 0,
+    vendas INT NOT NULL DEFAULT 0,
+    unidades INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (dia, id_produto),
+    KEY idx_resumo_produto_dia (id_produto, dia)
+);
+
+-- Tokens de recuperação de senha (recovery_store.RecoveryTokenStoreBanco)
+-- Chave = SHA256 do token (o token só existe no link enviado); índice em expira_em para a limpeza
+CREATE TABLE token_recuperacao (
+    token_hash CHAR(64) NOT NULL,
+    email VARCHAR(100) NOT NULL,
+    expira_em DATETIME NOT NULL,
+    usado TINYINT(1) NOT NULL DEFAULT 0,
+    PRIMARY KEY (token_hash),
+    KEY idx_token_recuperacao_expira (expira_em)
+);
+
+-- Fila de saída de emails (email_outbox.EmailOutbox): status pendente -> enviando -> enviado/falhou
+-- Índice (status, proxima_tentativa) para a reserva dos lotes prontos para envio
+CREATE TABLE email_outbox (
+    id_email BIGINT NOT NULL AUTO_INCREMENT,
+    destinatario VARCHAR(255) NOT NULL,
+    assunto VARCHAR(255) NOT NULL,
+    corpo_html MEDIUMTEXT NOT NULL,
+    status VARCHAR(10) NOT NULL DEFAULT 'pendente',
+    tentativas INT NOT NULL DEFAULT 0,
+    proxima_tentativa DATETIME NOT NULL,
+    lote CHAR(32) NULL,
+    ultimo_erro VARCHAR(500) NULL,
+    criado_em DATETIME NOT NULL,
+    enviado_em DATETIME NULL,
+    PRIMARY KEY (id_email),
+    KEY idx_email_outbox_fila (status, proxima_tentativa),
+    KEY idx_email_outbox_lote (lote)
+);
+
 -- Adicionar Foreign Keys após criar todas as tabelas
 ALTER TABLE Venda 
 ADD CONSTRAINT fk_venda_cliente 
@@ -126,6 +176,9 @@ ALTER TABLE Funcionario ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_un
 ALTER TABLE Produto ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 ALTER TABLE Venda ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 ALTER TABLE Item_Venda ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+ALTER TABLE VendaResumoDiario ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+ALTER TABLE token_recuperacao ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+ALTER TABLE email_outbox ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Inserir dados default das tabelas
 INSERT INTO nivel_acesso (nome) VALUES
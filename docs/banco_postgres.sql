@@ -0,0 +1,64 @@
+-- Criação das tabelas para o banco PostgreSQL (dao_postgres)
+
+DROP TABLE IF EXISTS VendaResumoDiario, Item_Venda, Venda, Produto, Cliente, Funcionario CASCADE;
+
+CREATE TABLE Funcionario (
+    id_funcionario SERIAL PRIMARY KEY,
+    nome VARCHAR(255) NOT NULL,
+    cargo VARCHAR(100),
+    salario NUMERIC(10,2),
+    data_contratacao DATE
+);
+
+CREATE TABLE Cliente (
+    id_cliente SERIAL PRIMARY KEY,
+    nome VARCHAR(255) NOT NULL,
+    email VARCHAR(255) UNIQUE,
+    telefone VARCHAR(20),
+    endereco TEXT
+);
+
+CREATE TABLE Produto (
+    id_produto SERIAL PRIMARY KEY,
+    nome VARCHAR(255) NOT NULL,
+    descricao TEXT,
+    preco NUMERIC(10,2) NOT NULL,
+    estoque INTEGER DEFAULT 0,
+    -- Busca textual (ProdutoDAO.buscar_texto / GET /produtos/busca): nome com peso A, descrição B
+    busca tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese', coalesce(nome, '')), 'A') ||
+        setweight(to_tsvector('portuguese', coalesce(descricao, '')), 'B')
+    ) STORED
+);
+CREATE INDEX idx_produto_busca ON Produto USING GIN (busca);
+
+CREATE TABLE Venda (
+    id_venda SERIAL PRIMARY KEY,
+    id_cliente INTEGER REFERENCES Cliente(id_cliente) ON DELETE SET NULL,
+    id_funcionario INTEGER REFERENCES Funcionario(id_funcionario) ON DELETE SET NULL,
+    data_venda TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    total NUMERIC(10,2)
+);
+CREATE INDEX idx_venda_data ON Venda (data_venda);
+
+CREATE TABLE Item_Venda (
+    id_item SERIAL PRIMARY KEY,
+    id_venda INTEGER NOT NULL REFERENCES Venda(id_venda) ON DELETE CASCADE,
+    id_produto INTEGER NOT NULL REFERENCES Produto(id_produto) ON DELETE CASCADE,
+    quantidade INTEGER NOT NULL DEFAULT 1,
+    preco_unitario NUMERIC(10,2) NOT NULL
+);
+CREATE INDEX idx_item_venda ON Item_Venda (id_venda);
+CREATE INDEX idx_item_produto ON Item_Venda (id_produto);
+
+-- Agregado diário mantido por finalizar_venda/excluir_venda na mesma transação
+-- Uma linha por dia e produto; id_produto = 0 guarda o total do dia (receita = soma de Venda.total)
+CREATE TABLE VendaResumoDiario (
+    dia DATE NOT NULL,
+    id_produto INTEGER NOT NULL,
+    receita NUMERIC(14,2) NOT NULL DEFAULT 0,
+    vendas INTEGER NOT NULL DEFAULT 0,
+    unidades INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (dia, id_produto)
+);
+CREATE INDEX idx_resumo_produto_dia ON VendaResumoDiario (id_produto, dia);
@@ -1,5 +1,22 @@
 -- Criação das tabelas para o banco SQLite
 
+CREATE TABLE IF NOT EXISTS nivel_acesso (
+    id_nivel_acesso INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS usuario (
+    id_usuario INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL,
+    email TEXT NOT NULL UNIQUE,
+    senha_hash TEXT NOT NULL, -- HASH da senha (SHA256), nunca a senha pura
+    telefone TEXT,
+    ativo INTEGER DEFAULT 1,
+    data_criacao TEXT DEFAULT CURRENT_TIMESTAMP,
+    id_nivel_acesso INTEGER NOT NULL,
+    FOREIGN KEY (id_nivel_acesso) REFERENCES nivel_acesso(id_nivel_acesso)
+);
+
 CREATE TABLE IF NOT EXISTS Funcionario (
     id_funcionario INTEGER PRIMARY KEY,
     nome TEXT NOT NULL,
@@ -25,6 +42,30 @@ CREATE TABLE IF NOT EXISTS Produto (
     nome_imagem TEXT
 );
 
+-- Busca textual (ProdutoDAO.buscar_texto / GET /produtos/busca): índice FTS5 com conteúdo externo
+-- (o texto fica só em Produto), mantido pelos triggers abaixo
+CREATE VIRTUAL TABLE IF NOT EXISTS produto_fts USING fts5(
+    nome, descricao,
+    content='Produto', content_rowid='id_produto',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS produto_fts_insert AFTER INSERT ON Produto BEGIN
+    INSERT INTO produto_fts (rowid, nome, descricao) VALUES (new.id_produto, new.nome, new.descricao);
+END;
+
+CREATE TRIGGER IF NOT EXISTS produto_fts_delete AFTER DELETE ON Produto BEGIN
+    INSERT INTO produto_fts (produto_fts, rowid, nome, descricao) VALUES ('delete', old.id_produto, old.nome, old.descricao);
+END;
+
+CREATE TRIGGER IF NOT EXISTS produto_fts_update AFTER UPDATE OF nome, descricao ON Produto BEGIN
+    INSERT INTO produto_fts (produto_fts, rowid, nome, descricao) VALUES ('delete', old.id_produto, old.nome, old.descricao);
+    INSERT INTO produto_fts (rowid, nome, descricao) VALUES (new.id_produto, new.nome, new.descricao);
+END;
+
+-- Em bancos que já tinham produtos, popular o índice uma vez:
+-- INSERT INTO produto_fts (produto_fts) VALUES ('rebuild');
+
 CREATE TABLE IF NOT EXISTS Venda (
     id_venda INTEGER PRIMARY KEY,
     id_cliente INTEGER NOT NULL,
@@ -45,17 +86,70 @@ CREATE TABLE IF NOT EXISTS Item_Venda (
     FOREIGN KEY (id_produto) REFERENCES Produto(id_produto)
 );
 
+CREATE INDEX IF NOT EXISTS idx_venda_data ON Venda (data_venda);
+CREATE INDEX IF NOT EXISTS idx_item_venda ON Item_Venda (id_venda);
+
+-- Agregado diário mantido por finalizar_venda/excluir_venda na mesma transação
+-- Uma linha por dia e produto; id_produto = 0 guarda o total do dia (receita = soma de Venda.total)
+CREATE TABLE IF NOT EXISTS VendaResumoDiario (
+    dia TEXT NOT NULL,
+    id_produto INTEGER NOT NULL,
+    receita REAL NOT NULL DEFAULT 0,
+    vendas INTEGER NOT NULL DEFAULT 0,
+    unidades INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (dia, id_produto)
+);
+CREATE INDEX IF NOT EXISTS idx_resumo_produto_dia ON VendaResumoDiario (id_produto, dia);
+
+-- Tokens de recuperação de senha (recovery_store.RecoveryTokenStoreBanco)
+-- Chave = SHA256 do token; expira_em em texto ISO ('YYYY-MM-DD HH:MM:SS'), indexado para a limpeza
+CREATE TABLE IF NOT EXISTS token_recuperacao (
+    token_hash TEXT PRIMARY KEY,
+    email TEXT NOT NULL,
+    expira_em TEXT NOT NULL,
+    usado INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_token_recuperacao_expira ON token_recuperacao (expira_em);
+
+-- Fila de saída de emails (email_outbox.EmailOutbox); datas em texto ISO
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id_email INTEGER PRIMARY KEY AUTOINCREMENT,
+    destinatario TEXT NOT NULL,
+    assunto TEXT NOT NULL,
+    corpo_html TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pendente',
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    proxima_tentativa TEXT NOT NULL,
+    lote TEXT,
+    ultimo_erro TEXT,
+    criado_em TEXT NOT NULL,
+    enviado_em TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_email_outbox_fila ON email_outbox (status, proxima_tentativa);
+CREATE INDEX IF NOT EXISTS idx_email_outbox_lote ON email_outbox (lote);
+
 -- Seleciona todos os registros das tabelas
 
+SELECT * FROM nivel_acesso;
+SELECT * FROM usuario;
 SELECT * FROM Funcionario;
 SELECT * FROM Cliente;
 SELECT * FROM Produto;
 SELECT * FROM Venda;
 SELECT * FROM Item_Venda;
+SELECT * FROM VendaResumoDiario;
+SELECT * FROM token_recuperacao;
+SELECT * FROM email_outbox;
 
 -- Comandos de apagamento de tabelas
+DROP TABLE IF EXISTS email_outbox;
+DROP TABLE IF EXISTS token_recuperacao;
+DROP TABLE IF EXISTS VendaResumoDiario;
 DROP TABLE IF EXISTS Item_Venda;
 DROP TABLE IF EXISTS Venda;
+DROP TABLE IF EXISTS produto_fts;
 DROP TABLE IF EXISTS Produto;
 DROP TABLE IF EXISTS Cliente;
 DROP TABLE IF EXISTS Funcionario;
+DROP TABLE IF EXISTS usuario;
+DROP TABLE IF EXISTS nivel_acesso;
@@ -0,0 +1,405 @@
+"""
+Fila de saída de emails (outbox)
+
+- As rotas só enfileiram (EmailOutbox.enfileirar): o email é gravado na tabela email_outbox
+  (EmailOutboxDAO do backend em uso) e a resposta volta sem esperar pelo SMTP
+- Uma thread enviadora por processo (iniciada no primeiro enfileiramento) reserva lotes de
+  emails prontos, envia todos pela mesma sessão SMTP autenticada (ConexaoSMTP) e marca o
+  resultado. Com vários workers, cada um reserva lotes diferentes (coluna lote)
+- Falhas são reagendadas com backoff exponencial (com variação aleatória, para os workers não
+  tentarem todos ao mesmo tempo); depois de max_tentativas o email fica com status 'falhou'
+- ServidorSMTPDebug: servidor SMTP local que só guarda as mensagens recebidas, para testar o
+  fluxo sem um provedor real (scripts/smtp_debug.py)
+"""
+
+import base64
+import logging
+import os
+import random
+import smtplib
+import socketserver
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from email import message_from_bytes
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+logger = logging.getLogger(__name__)
+
+# Erros recusando um email específico (remetente, destinatário ou conteúdo): só ele é reagendado
+ERROS_MENSAGEM = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+# Demais erros (sessão/servidor; SMTPException é subclasse de OSError): o restante do lote volta para a fila
+ERROS_CONEXAO = (OSError,)
+
+
+class ConexaoSMTP:
+    """
+    Sessão SMTP reutilizada entre envios: conecta (STARTTLS + login) no primeiro envio e
+    mantém a conexão aberta. Antes de reutilizar uma sessão parada há mais de verificar_apos
+    segundos envia NOOP; se o servidor derrubou a conexão, reconecta uma vez e reenvia.
+    """
+
+    def __init__(self, host, port=587, usuario=None, senha=None, tls=True, timeout=10.0,
+                 verificar_apos=30.0, ocioso_max=120.0):
+        self.host = host
+        self.port = port
+        self.usuario = usuario
+        self.senha = senha
+        self.tls = tls
+        self.timeout = timeout
+        self.verificar_apos = verificar_apos
+        self.ocioso_max = ocioso_max
+        self.conexoes_abertas = 0
+        self._smtp = None
+        self._ultimo_uso = 0.0
+
+    def _conectar(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            smtp.ehlo()
+            if self.tls:
+                smtp.starttls()
+                smtp.ehlo()
+            if self.usuario:
+                smtp.login(self.usuario, self.senha)
+        except Exception:
+            smtp.close()
+            raise
+        self.conexoes_abertas += 1
+        return smtp
+
+    def _sessao(self):
+        if self._smtp is not None and time.monotonic() - self._ultimo_uso > self.verificar_apos:
+            try:
+                self._smtp.noop()
+            except ERROS_CONEXAO:
+                self.fechar()
+        if self._smtp is None:
+            self._smtp = self._conectar()
+        return self._smtp
+
+    def enviar(self, mensagem):
+        try:
+            self._sessao().send_message(mensagem)
+        except smtplib.SMTPServerDisconnected:
+            # servidor encerrou a sessão ociosa: uma nova tentativa com conexão nova
+            self.fechar()
+            self._sessao().send_message(mensagem)
+        self._ultimo_uso = time.monotonic()
+
+    def fechar_se_ociosa(self):
+        if self._smtp is not None and time.monotonic() - self._ultimo_uso > self.ocioso_max:
+            self.fechar()
+
+    def fechar(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            self._smtp.close()
+        self._smtp = None
+
+
+class EmailOutbox:
+    """Fila durável de emails + thread enviadora (ver docstring do módulo)"""
+
+    def __init__(self, dao, conexao, remetente, on_commit=None, lote=50, max_tentativas=5,
+                 backoff_base=30.0, backoff_max=3600.0, intervalo=5.0, reserva=300.0,
+                 retencao_dias=7, intervalo_limpeza=3600.0):
+        """
+        dao: EmailOutboxDAO do backend em uso
+        conexao: ConexaoSMTP (usada só pela thread enviadora)
+        on_commit: registra um callback para depois do commit da requisição (dao_mysql.db.on_commit);
+                   a thread é acordada só quando o email já está visível para ela
+        reserva: segundos que um lote fica reservado para este processo antes de voltar à fila
+        """
+        self._dao = dao
+        self._conexao = conexao
+        self.remetente = remetente
+        self._on_commit = on_commit
+        self.lote = lote
+        self.max_tentativas = max_tentativas
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.intervalo = intervalo
+        self.reserva = reserva
+        self.retencao_dias = retencao_dias
+        self.intervalo_limpeza = intervalo_limpeza
+        self._proxima_limpeza = 0.0
+        self._acordar = threading.Event()
+        self._parar = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    # ---- usado pelas rotas ----
+
+    def enfileirar(self, destinatario, assunto, corpo_html):
+        """Grava o email na fila e retorna o id_email; o envio acontece na thread enviadora"""
+        id_email = self._dao.inserir_email(destinatario, assunto, corpo_html, datetime.now())
+        self.iniciar()
+        if self._on_commit is not None:
+            self._on_commit(self._acordar.set)
+        else:
+            self._acordar.set()
+        return id_email
+
+    def contar_por_status(self):
+        return self._dao.contar_por_status()
+
+    # ---- thread enviadora ----
+
+    def iniciar(self):
+        """Inicia a thread enviadora deste processo (após fork, cada worker inicia a sua)"""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._parar.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._executar, name='email-outbox', daemon=True)
+            self._thread.start()
+
+    def parar(self, timeout=None):
+        self._parar.set()
+        self._acordar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._conexao.fechar()
+
+    def _executar(self):
+        while not self._parar.is_set():
+            try:
+                processados = self.processar_lote()
+                self.limpar_se_necessario()
+            except Exception:
+                logger.exception("Falha ao processar a fila de emails")
+                processados = 0
+            if processados >= self.lote:
+                continue  # ainda há emails prontos: próximo lote sem esperar
+            self._conexao.fechar_se_ociosa()
+            self._acordar.wait(self.intervalo)
+            self._acordar.clear()
+
+    def processar_lote(self):
+        """Reserva e envia um lote pela sessão SMTP atual. Retorna a quantidade de emails reservados"""
+        agora = datetime.now()
+        emails = self._dao.reservar_lote(
+            uuid.uuid4().hex, agora, agora + timedelta(seconds=self.reserva), self.lote
+        )
+        enviados = []
+        try:
+            for indice, email in enumerate(emails):
+                try:
+                    self._conexao.enviar(self._mensagem(email))
+                except ERROS_MENSAGEM as e:
+                    self._registrar_falha(email, e)
+                except ERROS_CONEXAO as e:
+                    # sessão/servidor indisponível: os demais emails do lote voltam sem gastar tentativa
+                    self._conexao.fechar()
+                    espera = self._registrar_falha(email, e)
+                    for restante in emails[indice + 1:]:
+                        self._dao.reagendar(restante['id_email'], restante['tentativas'],
+                                            datetime.now() + espera, f"Lote interrompido: {e}")
+                    break
+                else:
+                    enviados.append(email['id_email'])
+        finally:
+            self._dao.marcar_enviados(enviados, datetime.now())
+        if emails:
+            logger.info("Fila de emails: %d enviados, %d com falha", len(enviados), len(emails) - len(enviados))
+        return len(emails)
+
+    def _mensagem(self, email):
+        msg = MIMEMultipart()
+        msg['From'] = self.remetente
+        msg['To'] = email['destinatario']
+        msg['Subject'] = email['assunto']
+        msg.attach(MIMEText(email['corpo_html'], 'html'))
+        return msg
+
+    def _backoff(self, tentativas):
+        espera = min(self.backoff_base * 2 ** (tentativas - 1), self.backoff_max)
+        return timedelta(seconds=espera * random.uniform(0.8, 1.2))
+
+    def _registrar_falha(self, email, erro):
+        """Reagenda o email (ou marca como 'falhou'). Retorna a espera aplicada"""
+        tentativas = email['tentativas'] + 1
+        espera = self._backoff(tentativas)
+        # 5xx: recusa permanente (ex.: destinatário inexistente), não adianta reenviar
+        permanente = getattr(erro, 'smtp_code', 0) >= 500
+        if permanente or tentativas >= self.max_tentativas:
+            logger.error("Email %s descartado após %d tentativas: %s", email['id_email'], tentativas, erro)
+            self._dao.marcar_falhou(email['id_email'], tentativas, str(erro))
+        else:
+            logger.warning("Email %s falhou (tentativa %d), nova tentativa em %.0fs: %s",
+                           email['id_email'], tentativas, espera.total_seconds(), erro)
+            self._dao.reagendar(email['id_email'], tentativas, datetime.now() + espera, str(erro))
+        return espera
+
+    def limpar_se_necessario(self):
+        """Remove (em lotes) os emails enviados há mais de retencao_dias, a cada intervalo_limpeza"""
+        if time.monotonic() < self._proxima_limpeza:
+            return 0
+        self._proxima_limpeza = time.monotonic() + self.intervalo_limpeza
+        antes = datetime.now() - timedelta(days=self.retencao_dias)
+        total = 0
+        while True:
+            removidos = self._dao.remover_enviados(antes, 500)
+            total += removidos
+            if removidos < 500:
+                return total
+
+
+def criar_email_outbox(dao, on_commit=None, config: dict = None, iniciar: bool = True):
+    """Cria a fila de emails. Se config não for fornecido, lê das variáveis de ambiente:
+    EMAIL_SMTP_HOST, EMAIL_SMTP_PORT, EMAIL_SMTP_TLS ('0' desliga o STARTTLS), EMAIL_SMTP_TIMEOUT,
+    EMAIL_USER, EMAIL_PASSWORD, EMAIL_OUTBOX_LOTE (emails por lote/sessão) e
+    EMAIL_OUTBOX_TENTATIVAS (tentativas antes de marcar como 'falhou')
+
+    iniciar=True já inicia a thread enviadora: emails pendentes de antes de um restart saem sem
+    esperar o próximo enfileirar()
+    """
+    if config is None:
+        config = {
+            'host': os.getenv('EMAIL_SMTP_HOST', 'smtp-mail.outlook.com'),
+            'port': int(os.getenv('EMAIL_SMTP_PORT', 587)),
+            'tls': os.getenv('EMAIL_SMTP_TLS', '1') != '0',
+            'timeout': float(os.getenv('EMAIL_SMTP_TIMEOUT', 10)),
+            'usuario': os.getenv('EMAIL_USER', 'seu_email@hotmail.com'),
+            'senha': os.getenv('EMAIL_PASSWORD', 'sua_senha'),
+            'lote': int(os.getenv('EMAIL_OUTBOX_LOTE', 50)),
+            'max_tentativas': int(os.getenv('EMAIL_OUTBOX_TENTATIVAS', 5)),
+        }
+
+    conexao = ConexaoSMTP(
+        config['host'], config.get('port', 587),
+        usuario=config.get('usuario'), senha=config.get('senha'),
+        tls=config.get('tls', True), timeout=config.get('timeout', 10.0),
+    )
+    opcoes = {k: config[k] for k in ('lote', 'max_tentativas', 'backoff_base', 'intervalo') if k in config}
+    outbox = EmailOutbox(dao, conexao, config.get('remetente') or config.get('usuario'), on_commit=on_commit, **opcoes)
+    if iniciar:
+        outbox.iniciar()
+    return outbox
+
+
+# ---- servidor SMTP de depuração ----
+
+class _SessaoSMTPDebug(socketserver.StreamRequestHandler):
+    """Uma sessão SMTP: EHLO/HELO, AUTH PLAIN/LOGIN (aceita qualquer senha), MAIL, RCPT, DATA,
+    RSET, NOOP e QUIT. Sem STARTTLS (use EMAIL_SMTP_TLS=0)"""
+
+    def _responder(self, linha):
+        self.wfile.write(linha.encode() + b'\r\n')
+
+    def _ler(self):
+        linha = self.rfile.readline()
+        return linha.rstrip(b'\r\n').decode('utf-8', 'replace') if linha else None
+
+    def handle(self):
+        servidor = self.server
+        servidor.registrar_conexao()
+        self._responder('220 localhost ESMTP debug')
+        remetente, destinatarios = None, []
+        while True:
+            linha = self._ler()
+            if linha is None:
+                return
+            comando, _, argumento = linha.partition(' ')
+            comando = comando.upper()
+            if comando == 'EHLO':
+                self.wfile.write(b'250-localhost\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n')
+            elif comando == 'HELO':
+                self._responder('250 localhost')
+            elif comando == 'AUTH':
+                if argumento.upper().startswith('LOGIN'):
+                    self._responder('334 VXNlcm5hbWU6')
+                    usuario = base64.b64decode(self._ler() or '').decode()
+                    self._responder('334 UGFzc3dvcmQ6')
+                    self._ler()
+                else:
+                    usuario = base64.b64decode(argumento.split(' ', 1)[1]).split(b'\0')[1].decode()
+                servidor.usuarios.append(usuario)
+                self._responder('235 Autenticado')
+            elif comando == 'MAIL':
+                remetente, destinatarios = argumento[5:].strip('<>'), []
+                self._responder('250 OK')
+            elif comando == 'RCPT':
+                destinatarios.append(argumento[3:].strip('<>'))
+                self._responder('250 OK')
+            elif comando == 'DATA':
+                self._responder('354 Termine com <CRLF>.<CRLF>')
+                linhas = []
+                while True:
+                    bruta = self.rfile.readline()
+                    if not bruta or bruta in (b'.\r\n', b'.\n'):
+                        break
+                    linhas.append(bruta[1:] if bruta.startswith(b'..') else bruta)
+                if servidor.consumir_falha():
+                    self._responder('451 Falha temporaria simulada')
+                else:
+                    servidor.guardar(remetente, destinatarios, message_from_bytes(b''.join(linhas)))
+                    self._responder('250 OK: mensagem recebida')
+            elif comando == 'RSET':
+                remetente, destinatarios = None, []
+                self._responder('250 OK')
+            elif comando == 'NOOP':
+                self._responder('250 OK')
+            elif comando == 'QUIT':
+                self._responder('221 Tchau')
+                return
+            else:
+                self._responder('502 Comando nao implementado')
+
+
+class ServidorSMTPDebug(socketserver.ThreadingTCPServer):
+    """
+    Servidor SMTP local para testes: guarda as mensagens em self.mensagens
+    ([(remetente, destinatarios, email.message.Message)]) em vez de entregá-las.
+    falhar_proximos = n faz os próximos n DATA responderem 451 (testar reenvio/backoff)
+    port=0 escolhe uma porta livre (self.port)
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=0):
+        super().__init__((host, port), _SessaoSMTPDebug)
+        self.host, self.port = self.server_address[:2]
+        self.mensagens = []
+        self.usuarios = []
+        self.conexoes = 0
+        self.falhar_proximos = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def registrar_conexao(self):
+        with self._lock:
+            self.conexoes += 1
+
+    def consumir_falha(self):
+        with self._lock:
+            if self.falhar_proximos > 0:
+                self.falhar_proximos -= 1
+                return True
+            return False
+
+    def guardar(self, remetente, destinatarios, mensagem):
+        with self._lock:
+            self.mensagens.append((remetente, destinatarios, mensagem))
+        logger.info("[SMTP DEBUG] %s -> %s: %s", remetente, ', '.join(destinatarios), mensagem['Subject'])
+
+    def iniciar(self):
+        """Atende em uma thread em segundo plano (para testes); retorna self"""
+        self._thread = threading.Thread(target=self.serve_forever, name='smtp-debug', daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,92 @@
+import os
+
+from flask.json.provider import DefaultJSONProvider
+
+from models.base import Modelo
+from models.serializacao import SerializadorJSON
+
+try:
+    import orjson
+except ImportError:  # encoder rápido opcional: sem ele as respostas usam o ModelosJSONProvider (stdlib)
+    orjson = None
+
+
+class ModelosJSONProvider(DefaultJSONProvider):
+    """Provider JSON do Flask que aceita os modelos de linha (models.base.Modelo). O formato é o
+    do DefaultJSONProvider (Decimal -> str, date -> http_date, chaves ordenadas).
+
+    dumps() usa o encoder C da stdlib (mais rápido para listas inteiras); dumps_modelo() escreve um
+    modelo direto dos atributos, sem dict intermediário (linhas de uma resposta em streaming).
+
+    Uso: app.json = ModelosJSONProvider(app)
+    """
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, Modelo):
+            # to_dict da base: Funcionario.to_dict converte salário/data para outro formato
+            return Modelo.to_dict(o)
+        return DefaultJSONProvider.default(o)
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._serializadores = {}
+
+    def serializador(self, separadores=(', ', ': '), ensure_ascii=None):
+        ensure_ascii = self.ensure_ascii if ensure_ascii is None else ensure_ascii
+        serializador = self._serializadores.get((separadores, ensure_ascii))
+        if serializador is None:
+            serializador = self._serializadores[separadores, ensure_ascii] = SerializadorJSON(
+                self.default, separadores, ensure_ascii, self.sort_keys
+            )
+        return serializador
+
+    def dumps_modelo(self, modelo, campos=None, extras=None):
+        """JSON de um modelo (subconjunto de campos e valores extras opcionais), sem dict intermediário"""
+        return self.serializador().dumps_modelo(modelo, campos, extras)
+
+
+class OrjsonJSONProvider(ModelosJSONProvider):
+    """ModelosJSONProvider com o encoder orjson (C) no lugar do json da stdlib.
+
+    Mantém o formato das respostas: Decimal -> str, date/datetime -> http_date (datas passam pelo
+    default, como no DefaultJSONProvider, em vez do ISO 8601 nativo do orjson), chaves ordenadas,
+    modelos como objetos. Diferenças: não-ASCII sai em UTF-8 em vez de \\uXXXX e dumps() sem
+    indent é sempre compacto. Indentação diferente de 2, opções extras do json.dumps e valores que
+    o orjson recusa (ex.: inteiros acima de 64 bits) caem no caminho da stdlib. dumps_modelo
+    (linhas em streaming) continua no SerializadorJSON, no formato compacto do orjson.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._opcoes = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            self._opcoes |= orjson.OPT_SORT_KEYS
+
+    def dumps(self, obj, **kwargs):
+        indent = kwargs.pop('indent', None)
+        if indent not in (None, 2) or set(kwargs) - {'separators'}:
+            return super().dumps(obj, indent=indent, **kwargs)
+        opcoes = self._opcoes | orjson.OPT_INDENT_2 if indent else self._opcoes
+        try:
+            return orjson.dumps(obj, default=self.default, option=opcoes).decode()
+        except orjson.JSONEncodeError:
+            # o erro real (ou o valor que só a stdlib aceita) fica com o caminho padrão
+            if indent:
+                kwargs['indent'] = indent
+            return super().dumps(obj, **kwargs)
+
+    def dumps_modelo(self, modelo, campos=None, extras=None):
+        # mesmo texto que orjson.dumps daria (compacto, UTF-8), mas sem montar um dict por linha
+        return self.serializador((',', ':'), ensure_ascii=False).dumps_modelo(modelo, campos, extras)
+
+
+def criar_json_provider(app):
+    """Provider JSON do app conforme JSON_PROVIDER: 'orjson' (padrão se o pacote estiver
+    instalado) ou 'stdlib' (ModelosJSONProvider)"""
+    escolha = os.getenv('JSON_PROVIDER', 'orjson' if orjson is not None else 'stdlib')
+    if escolha == 'orjson':
+        if orjson is None:
+            raise RuntimeError("JSON_PROVIDER=orjson, mas o pacote orjson não está instalado")
+        return OrjsonJSONProvider(app)
+    return ModelosJSONProvider(app)
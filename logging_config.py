@@ -0,0 +1,121 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Níveis padrão por módulo: o debug dos DAOs fica desligado (logger.debug não monta o registro)
+NIVEIS_PADRAO = {
+    'dao_mysql': 'WARNING',
+    'dao_sqlite': 'WARNING',
+    'dao_postgres': 'WARNING',
+}
+
+# Atributos padrão de LogRecord (o restante veio de extra={...} e vai para o JSON)
+_ATRIBUTOS_RECORD = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+_listener = None
+_handler_fila = None
+
+
+class JSONFormatter(logging.Formatter):
+    """Formata cada registro como uma linha JSON: ts, nivel, logger, mensagem, campos extras e exc"""
+
+    def format(self, record):
+        registro = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'nivel': record.levelname,
+            'logger': record.name,
+            'mensagem': record.getMessage(),
+        }
+        for chave, valor in vars(record).items():
+            if chave not in _ATRIBUTOS_RECORD and not chave.startswith('_'):
+                registro[chave] = valor
+        if record.exc_info:
+            registro['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            registro['exc'] = record.exc_text
+        return json.dumps(registro, ensure_ascii=False, default=str)
+
+
+class _QueueHandlerSemFormatacao(QueueHandler):
+    """QueueHandler que só resolve a mensagem na thread da requisição;
+    a formatação (JSON, traceback) e a escrita ficam com a thread do QueueListener"""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def parse_niveis(texto):
+    """Converte 'app=INFO,dao_mysql=DEBUG' em {'app': 'INFO', 'dao_mysql': 'DEBUG'}"""
+    niveis = {}
+    for parte in (texto or '').split(','):
+        if '=' in parte:
+            modulo, nivel = parte.split('=', 1)
+            niveis[modulo.strip()] = nivel.strip().upper()
+    return niveis
+
+
+def configurar_logging(nivel=None, niveis=None, stream=None):
+    """Configura o logging estruturado (JSON) e não bloqueante da aplicação.
+
+    nivel: nível do logger raiz (padrão: variável LOG_LEVEL ou INFO)
+    niveis: dict {modulo: nível} (padrão: NIVEIS_PADRAO + variável LOG_LEVELS, ex.: 'dao_mysql=DEBUG')
+    stream: destino das linhas JSON (padrão: sys.stdout)
+
+    Os registros vão para uma fila em memória; um QueueListener em thread própria formata e escreve.
+    Chamadas repetidas não duplicam handlers. Processos filhos (fork de workers do gunicorn/uWSGI)
+    ganham fila e listener próprios (ver _reiniciar_apos_fork).
+    """
+    global _listener, _handler_fila
+    if _listener is not None:
+        return
+
+    if niveis is None:
+        niveis = {**NIVEIS_PADRAO, **parse_niveis(os.getenv('LOG_LEVELS'))}
+
+    saida = logging.StreamHandler(stream or sys.stdout)
+    saida.setFormatter(JSONFormatter())
+
+    fila = queue.SimpleQueue()
+    _listener = QueueListener(fila, saida, respect_handler_level=True)
+    _listener.start()
+    atexit.register(parar_logging)
+
+    raiz = logging.getLogger()
+    _handler_fila = _QueueHandlerSemFormatacao(fila)
+    raiz.handlers = [_handler_fila]
+    raiz.setLevel((nivel or os.getenv('LOG_LEVEL', 'INFO')).upper())
+    for modulo, nivel_modulo in niveis.items():
+        logging.getLogger(modulo).setLevel(nivel_modulo)
+
+
+def parar_logging():
+    """Esvazia a fila e para a thread de escrita dos logs"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _reiniciar_apos_fork():
+    """A thread do QueueListener não sobrevive ao fork: sem isso o filho só enfileiraria os logs.
+    Usa uma fila nova (a herdada pode ter registros que o pai ainda vai escrever)"""
+    global _listener
+    if _listener is None:
+        return
+    fila = queue.SimpleQueue()
+    _listener = QueueListener(fila, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+    _handler_fila.queue = fila
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reiniciar_apos_fork)
@@ -0,0 +1,283 @@
+"""
+Métricas no formato de exposição de texto do Prometheus (sem dependências externas)
+
+Uso:
+  from metrics import Histogram
+  LATENCIA = Histogram('minha_latencia_seconds', 'Descrição', labels=('rota',))
+  with LATENCIA.time(rota='/produtos'):
+      ...
+
+Agregação entre processos (workers do gunicorn/uwsgi): defina METRICS_DIR com uma pasta
+compartilhada pelos workers (limpe-a ao iniciar o deploy). Cada processo grava periodicamente
+um snapshot em METRICS_DIR/<pid>.json e /metrics soma os snapshots de todos os processos.
+Counters e histogramas de processos encerrados continuam somados; gauges só dos processos vivos.
+Sem METRICS_DIR, /metrics expõe apenas o processo atual.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+BUCKETS_PADRAO = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS_DIR = os.getenv('METRICS_DIR')
+METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', 5))
+
+_metricas = {}
+_registro_lock = threading.Lock()
+_escritor = {'pid': None}
+
+
+class _Metrica:
+    tipo = None
+
+    def __init__(self, nome, ajuda, labels=()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.labels = tuple(labels)
+        self._valores = {}
+        self._lock = threading.Lock()
+        with _registro_lock:
+            _metricas[nome] = self
+
+    def _chave(self, labels):
+        return tuple(str(labels[label]) for label in self.labels)
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(chave), valor if not isinstance(valor, list) else list(valor)]
+                    for chave, valor in self._valores.items()]
+
+
+class Counter(_Metrica):
+    tipo = 'counter'
+
+    def inc(self, valor=1.0, **labels):
+        chave = self._chave(labels)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0.0) + valor
+        _garantir_escritor()
+
+
+class Gauge(_Metrica):
+    tipo = 'gauge'
+
+    def inc(self, valor=1.0, **labels):
+        chave = self._chave(labels)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0.0) + valor
+        _garantir_escritor()
+
+    def dec(self, valor=1.0, **labels):
+        self.inc(-valor, **labels)
+
+    def set(self, valor, **labels):
+        with self._lock:
+            self._valores[self._chave(labels)] = float(valor)
+        _garantir_escritor()
+
+
+class Histogram(_Metrica):
+    tipo = 'histogram'
+
+    def __init__(self, nome, ajuda, labels=(), buckets=BUCKETS_PADRAO):
+        super().__init__(nome, ajuda, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, valor, **labels):
+        chave = self._chave(labels)
+        with self._lock:
+            # [contagem por bucket (não cumulativa)..., +Inf, soma]
+            dados = self._valores.get(chave)
+            if dados is None:
+                dados = self._valores[chave] = [0] * (len(self.buckets) + 1) + [0.0]
+            for indice, limite in enumerate(self.buckets):
+                if valor <= limite:
+                    break
+            else:
+                indice = len(self.buckets)
+            dados[indice] += 1
+            dados[-1] += valor
+        _garantir_escritor()
+
+    @contextmanager
+    def time(self, **labels):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - inicio, **labels)
+
+
+def operacao_chamadora(profundidade=1):
+    """Nome qualificado (Classe.metodo) da função `profundidade` níveis acima de quem chamou"""
+    codigo = sys._getframe(profundidade + 1).f_code
+    return getattr(codigo, 'co_qualname', codigo.co_name)
+
+
+# ---- agregação entre processos ----
+
+def _snapshot_processo():
+    with _registro_lock:
+        metricas = list(_metricas.values())
+    return {
+        metrica.nome: {
+            'tipo': metrica.tipo,
+            'ajuda': metrica.ajuda,
+            'labels': list(metrica.labels),
+            'buckets': list(getattr(metrica, 'buckets', ())),
+            'valores': metrica.snapshot(),
+        }
+        for metrica in metricas
+    }
+
+
+def gravar_snapshot():
+    """Grava o snapshot deste processo em METRICS_DIR/<pid>.json (escrita atômica)"""
+    if not METRICS_DIR:
+        return
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    caminho = os.path.join(METRICS_DIR, f"{os.getpid()}.json")
+    temporario = f"{caminho}.tmp"
+    with open(temporario, 'w') as arquivo:
+        json.dump(_snapshot_processo(), arquivo)
+    os.replace(temporario, caminho)
+
+
+def _loop_escritor():
+    while True:
+        time.sleep(METRICS_FLUSH_SECONDS)
+        try:
+            gravar_snapshot()
+        except OSError:
+            pass
+
+
+def _garantir_escritor():
+    """Inicia (uma vez por processo, inclusive após fork) a thread que grava os snapshots"""
+    if not METRICS_DIR or _escritor['pid'] == os.getpid():
+        return
+    with _registro_lock:
+        if _escritor['pid'] == os.getpid():
+            return
+        _escritor['pid'] = os.getpid()
+    threading.Thread(target=_loop_escritor, name='metrics-escritor', daemon=True).start()
+    atexit.register(gravar_snapshot)
+
+
+def _resetar_apos_fork():
+    """No processo filho: zera os valores herdados do pai (senão seriam somados duas vezes)"""
+    for metrica in _metricas.values():
+        metrica._lock = threading.Lock()
+        metrica._valores = {}
+    _escritor['pid'] = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_resetar_apos_fork)
+
+
+def _processo_vivo(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _snapshots():
+    """Snapshots de todos os processos: o atual (em memória) e os demais de METRICS_DIR"""
+    snapshots = [(True, _snapshot_processo())]
+    if not METRICS_DIR or not os.path.isdir(METRICS_DIR):
+        return snapshots
+    for nome_arquivo in os.listdir(METRICS_DIR):
+        if not nome_arquivo.endswith('.json'):
+            continue
+        pid = int(nome_arquivo[:-5]) if nome_arquivo[:-5].isdigit() else None
+        if pid is None or pid == os.getpid():
+            continue
+        try:
+            with open(os.path.join(METRICS_DIR, nome_arquivo)) as arquivo:
+                snapshots.append((_processo_vivo(pid), json.load(arquivo)))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def coletar():
+    """Soma as métricas de todos os processos: {nome: {tipo, ajuda, labels, buckets, valores: {chave: valor}}}"""
+    agregado = {}
+    for vivo, snapshot in _snapshots():
+        for nome, metrica in snapshot.items():
+            if metrica['tipo'] == 'gauge' and not vivo:
+                continue
+            destino = agregado.setdefault(nome, {**metrica, 'valores': {}})
+            for chave, valor in metrica['valores']:
+                chave = tuple(chave)
+                atual = destino['valores'].get(chave)
+                if atual is None:
+                    destino['valores'][chave] = valor
+                elif isinstance(valor, list):
+                    destino['valores'][chave] = [a + b for a, b in zip(atual, valor)]
+                else:
+                    destino['valores'][chave] = atual + valor
+    return agregado
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _formatar_labels(nomes, valores, extra=None):
+    pares = list(zip(nomes, valores))
+    if extra:
+        pares.append(extra)
+    if not pares:
+        return ''
+    return '{' + ','.join(f'{nome}="{_escapar(valor)}"' for nome, valor in pares) + '}'
+
+
+def _formatar_numero(valor):
+    if valor == float('inf'):
+        return '+Inf'
+    return repr(float(valor)) if not float(valor).is_integer() else str(int(valor))
+
+
+def exportar_texto():
+    """Métricas agregadas no formato de exposição de texto do Prometheus (version=0.0.4)"""
+    linhas = []
+    for nome, metrica in sorted(coletar().items()):
+        linhas.append(f"# HELP {nome} {metrica['ajuda']}")
+        linhas.append(f"# TYPE {nome} {metrica['tipo']}")
+        labels = metrica['labels']
+        for chave, valor in sorted(metrica['valores'].items()):
+            if metrica['tipo'] != 'histogram':
+                linhas.append(f"{nome}{_formatar_labels(labels, chave)} {_formatar_numero(valor)}")
+                continue
+            acumulado = 0
+            for limite, contagem in zip(list(metrica['buckets']) + [float('inf')], valor[:-1]):
+                acumulado += contagem
+                le = ('le', _formatar_numero(limite))
+                linhas.append(f"{nome}_bucket{_formatar_labels(labels, chave, le)} {acumulado}")
+            linhas.append(f"{nome}_sum{_formatar_labels(labels, chave)} {_formatar_numero(valor[-1])}")
+            linhas.append(f"{nome}_count{_formatar_labels(labels, chave)} {acumulado}")
+    return '\n'.join(linhas) + '\n'
+
+
+# ---- métricas compartilhadas pelos DAOs ----
+
+DAO_QUERY_SECONDS = Histogram(
+    'dao_query_seconds', 'Tempo com o cursor aberto por método de DAO', labels=('backend', 'operacao')
+)
+DB_POOL_WAIT_SECONDS = Histogram(
+    'db_pool_wait_seconds', 'Tempo para obter uma conexão do pool', labels=('backend',)
+)
+DB_POOL_EM_USO = Gauge(
+    'db_pool_conexoes_em_uso', 'Conexões do pool em uso', labels=('backend',)
+)
@@ -0,0 +1,41 @@
+class Modelo:
+    """
+    Base dos modelos de linha: atributos em __slots__ (sem __dict__ por instância), na ordem das
+    colunas do SELECT, para que os DAOs criem o modelo direto da tupla do cursor (from_row).
+
+    Também aceitam leitura como mapping (modelo['nome'], modelo.get('nome'), 'nome' in modelo,
+    dict(modelo)), compatível com o código que recebia os dicts do driver.
+    """
+    __slots__ = ()
+    CAMPOS = ()
+
+    @classmethod
+    def from_row(cls, row):
+        """Cria o modelo a partir de uma linha do cursor (sequência na ordem de CAMPOS)"""
+        return cls(*row)
+
+    def keys(self):
+        return self.CAMPOS
+
+    def __getitem__(self, campo):
+        if campo not in self.CAMPOS:
+            raise KeyError(campo)
+        return getattr(self, campo)
+
+    def get(self, campo, padrao=None):
+        if campo not in self.CAMPOS:
+            return padrao
+        return getattr(self, campo, padrao)
+
+    def __contains__(self, campo):
+        return campo in self.CAMPOS
+
+    def __eq__(self, outro):
+        if type(outro) is not type(self):
+            return NotImplemented
+        return all(getattr(self, campo) == getattr(outro, campo) for campo in self.CAMPOS)
+
+    __hash__ = None
+
+    def to_dict(self):
+        return {campo: getattr(self, campo) for campo in self.CAMPOS}
@@ -1,4 +1,9 @@
-class Cliente:
+from .base import Modelo
+
+
+class Cliente(Modelo):
+    __slots__ = CAMPOS = ('id_cliente', 'nome', 'email', 'telefone', 'endereco')
+
     def __init__(self, id_cliente, nome, email=None, telefone=None, endereco=None):
         self.id_cliente = id_cliente
         self.nome = nome
@@ -11,12 +16,3 @@ class Cliente:
             f"<Cliente id={self.id_cliente} nome='{self.nome}' email='{self.email}' "
             f"telefone='{self.telefone}' endereco='{self.endereco}'>"
         )
-
-    def to_dict(self):
-        return {
-            'id_cliente': self.id_cliente,
-            'nome': self.nome,
-            'email': self.email,
-            'telefone': self.telefone,
-            'endereco': self.endereco,
-        }
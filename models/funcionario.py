@@ -1,36 +1,48 @@
 from datetime import date
-from dataclasses import dataclass
 from decimal import Decimal
 from typing import Optional
 
-@dataclass
-class Funcionario:
-    id_funcionario: int
-    nome: str
-    cargo: Optional[str] = None
-    salario: Optional[Decimal] = None
-    data_contratacao: Optional[date] = None
+from .base import Modelo
+
+
+class Funcionario(Modelo):
+    __slots__ = CAMPOS = ('id_funcionario', 'nome', 'cargo', 'salario', 'data_contratacao')
+
+    def __init__(self, id_funcionario: int, nome: str, cargo: Optional[str] = None,
+                 salario: Optional[Decimal] = None, data_contratacao: Optional[date] = None):
+        self.id_funcionario = id_funcionario
+        self.nome = nome
+        self.cargo = cargo
+        self.salario = salario
+        self.data_contratacao = data_contratacao
+
+    def __repr__(self):
+        return (
+            f"Funcionario(id_funcionario={self.id_funcionario!r}, nome={self.nome!r}, cargo={self.cargo!r}, "
+            f"salario={self.salario!r}, data_contratacao={self.data_contratacao!r})"
+        )
 
     @staticmethod
     def from_dict(data: dict) -> 'Funcionario':
         """
-        Cria uma instância de Funcionário a partir de um dicionário
+        Cria uma instância de Funcionário a partir de um dicionário (sem alterar o dicionário)
         """
         # Converte o salário para Decimal se existir
-        if 'salario' in data and data['salario'] is not None:
-            data['salario'] = Decimal(str(data['salario']))
-        
+        salario = data.get('salario')
+        if salario is not None and not isinstance(salario, Decimal):
+            salario = Decimal(str(salario))
+
         # Converte a data de contratação para date se existir
-        if 'data_contratacao' in data and data['data_contratacao'] is not None:
-            if isinstance(data['data_contratacao'], str):
-                data['data_contratacao'] = date.fromisoformat(data['data_contratacao'])
+        data_contratacao = data.get('data_contratacao')
+        if isinstance(data_contratacao, str):
+            data_contratacao = date.fromisoformat(data_contratacao)
 
         return Funcionario(
             id_funcionario=data['id_funcionario'],
             nome=data['nome'],
             cargo=data.get('cargo'),
-            salario=data.get('salario'),
-            data_contratacao=data.get('data_contratacao')
+            salario=salario,
+            data_contratacao=data_contratacao
         )
 
     def to_dict(self) -> dict:
@@ -43,4 +55,4 @@ class Funcionario:
             'cargo': self.cargo,
             'salario': float(self.salario) if self.salario is not None else None,
             'data_contratacao': self.data_contratacao.isoformat() if self.data_contratacao is not None else None
-        }
\ No newline at end of file
+        }
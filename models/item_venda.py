@@ -1,4 +1,9 @@
-class ItemVenda:
+from .base import Modelo
+
+
+class ItemVenda(Modelo):
+    __slots__ = CAMPOS = ('id_item', 'id_venda', 'id_produto', 'quantidade', 'preco_unitario')
+
     def __init__(self, id_item, id_venda, id_produto, quantidade, preco_unitario):
         self.id_item = id_item
         self.id_venda = id_venda
@@ -11,12 +16,3 @@ class ItemVenda:
             f"<ItemVenda id_item={self.id_item} id_venda={self.id_venda} "
             f"id_produto={self.id_produto} quantidade={self.quantidade} preco_unitario={self.preco_unitario}>"
         )
-
-    def to_dict(self):
-        return {
-            'id_item': self.id_item,
-            'id_venda': self.id_venda,
-            'id_produto': self.id_produto,
-            'quantidade': self.quantidade,
-            'preco_unitario': self.preco_unitario,
-        }
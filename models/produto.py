@@ -1,22 +1,19 @@
-class Produto:
-    def __init__(self, id_produto, nome, descricao=None, preco=0.0, estoque=0):
+from .base import Modelo
+
+
+class Produto(Modelo):
+    __slots__ = CAMPOS = ('id_produto', 'nome', 'descricao', 'preco', 'estoque', 'nome_imagem')
+
+    def __init__(self, id_produto, nome, descricao=None, preco=0.0, estoque=0, nome_imagem=None):
         self.id_produto = id_produto
         self.nome = nome
         self.descricao = descricao
         self.preco = preco
         self.estoque = estoque
+        self.nome_imagem = nome_imagem
 
     def __repr__(self):
         return (
             f"<Produto id={self.id_produto} nome='{self.nome}' descricao='{self.descricao}' "
             f"preco={self.preco} estoque={self.estoque}>"
         )
-
-    def to_dict(self):
-        return {
-            'id_produto': self.id_produto,
-            'nome': self.nome,
-            'descricao': self.descricao,
-            'preco': self.preco,
-            'estoque': self.estoque,
-        }
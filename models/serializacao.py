@@ -0,0 +1,91 @@
+"""
+Serialização JSON direta dos modelos de linha (models.base.Modelo), sem montar um dict por linha
+
+Usado só nas respostas em streaming, uma linha por vez (ver json_provider.dumps_modelo). Para
+documentos inteiros o encoder C da stdlib/orjson é mais rápido que este código em Python puro.
+
+O texto gerado é o mesmo de json.dumps(obj, default=default, sort_keys=..., ensure_ascii=...,
+separators=...): os modelos são escritos como objetos com as chaves de CAMPOS; os valores que
+o JSON não conhece (Decimal, date...) passam por default, como no json.dumps.
+"""
+
+from json.encoder import encode_basestring, encode_basestring_ascii
+
+from .base import Modelo
+
+_INFINITO = float('inf')
+
+
+class SerializadorJSON:
+    def __init__(self, default, separadores=(', ', ': '), ensure_ascii=True, sort_keys=True):
+        self.default = default
+        self.separador_item, self.separador_chave = separadores
+        self.sort_keys = sort_keys
+        self._texto = encode_basestring_ascii if ensure_ascii else encode_basestring
+        # {(classe, campos, chaves extras): [(campo, '"campo": '), ...]} na ordem de saída
+        self._chaves = {}
+
+    def dumps_modelo(self, modelo, campos=None, extras=None):
+        """
+        JSON de um modelo escrito direto dos atributos
+        campos: subconjunto/ordem de CAMPOS a incluir (padrão: todos)
+        extras: {chave: valor} adicionados ao objeto (ex.: urls_imagem calculadas na hora)
+        """
+        chave_cache = (type(modelo), campos, tuple(extras) if extras else ())
+        chaves = self._chaves.get(chave_cache)
+        if chaves is None:
+            nomes = list(campos or modelo.CAMPOS) + list(chave_cache[2])
+            if self.sort_keys:
+                nomes.sort()
+            chaves = self._chaves[chave_cache] = [
+                (nome, self._texto(nome) + self.separador_chave) for nome in nomes
+            ]
+
+        partes = []
+        for nome, prefixo in chaves:
+            valor = extras[nome] if extras and nome in extras else getattr(modelo, nome)
+            partes.append(prefixo + self._codificar(valor))
+        return '{' + self.separador_item.join(partes) + '}'
+
+    def _codificar(self, obj):
+        if isinstance(obj, str):
+            return self._texto(obj)
+        if obj is None:
+            return 'null'
+        if obj is True:
+            return 'true'
+        if obj is False:
+            return 'false'
+        if isinstance(obj, int):
+            return int.__repr__(obj)
+        if isinstance(obj, float):
+            if obj != obj:
+                return 'NaN'
+            if obj == _INFINITO:
+                return 'Infinity'
+            if obj == -_INFINITO:
+                return '-Infinity'
+            return float.__repr__(obj)
+        if isinstance(obj, Modelo):
+            return self.dumps_modelo(obj)
+        if isinstance(obj, (list, tuple)):
+            return '[' + self.separador_item.join(self._codificar(valor) for valor in obj) + ']'
+        if isinstance(obj, dict):
+            itens = sorted(obj.items()) if self.sort_keys else obj.items()
+            return '{' + self.separador_item.join(
+                self._chave(chave) + self.separador_chave + self._codificar(valor) for chave, valor in itens
+            ) + '}'
+        return self._codificar(self.default(obj))
+
+    def _chave(self, chave):
+        if isinstance(chave, str):
+            return self._texto(chave)
+        if chave is True:
+            return '"true"'
+        if chave is False:
+            return '"false"'
+        if chave is None:
+            return '"null"'
+        if isinstance(chave, (int, float)):
+            return '"' + self._codificar(chave) + '"'
+        raise TypeError(f"keys must be str, int, float, bool or None, not {type(chave).__name__}")
@@ -1,4 +1,9 @@
-class Venda:
+from .base import Modelo
+
+
+class Venda(Modelo):
+    __slots__ = CAMPOS = ('id_venda', 'id_cliente', 'id_funcionario', 'data_venda', 'total')
+
     def __init__(self, id_venda, id_cliente, id_funcionario, data_venda, total):
         self.id_venda = id_venda
         self.id_cliente = id_cliente
@@ -11,12 +16,3 @@ class Venda:
             f"<Venda id={self.id_venda} id_cliente={self.id_cliente} "
             f"id_funcionario={self.id_funcionario} data_venda={self.data_venda} total={self.total}>"
         )
-
-    def to_dict(self):
-        return {
-            'id_venda': self.id_venda,
-            'id_cliente': self.id_cliente,
-            'id_funcionario': self.id_funcionario,
-            'data_venda': self.data_venda,
-            'total': self.total,
-        }
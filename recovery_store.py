@@ -0,0 +1,221 @@
+"""
+Armazenamento dos tokens de recuperação de senha (RecoveryTokenStore)
+
+- RecoveryTokenStoreMemoria: dict do processo + heap por expiração (desenvolvimento/testes;
+  não é compartilhado entre workers e se perde ao reiniciar)
+- RecoveryTokenStoreBanco: tabela token_recuperacao (TokenRecuperacaoDAO do backend em uso),
+  compartilhada entre os workers do gunicorn/uWSGI e persistente
+
+Os tokens são guardados pelo SHA256 (hash_token): quem lê o banco não consegue montar o link.
+Tokens expirados são removidos periodicamente (a cada intervalo_limpeza segundos, na primeira
+operação depois do intervalo) em lotes de lote_limpeza, sempre pela ordem de expiração.
+"""
+
+import hashlib
+import heapq
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+
+def hash_token(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class RecoveryTokenStore(ABC):
+    """Interface comum. buscar() retorna {"email", "expiry", "used"} (como o antigo dict
+    recovery_tokens) também para tokens expirados ainda não removidos, para que as rotas
+    diferenciem "expirado" de "inválido"."""
+
+    nome = None
+
+    def __init__(self, intervalo_limpeza: float = 60.0, lote_limpeza: int = 500):
+        self.intervalo_limpeza = intervalo_limpeza
+        self.lote_limpeza = lote_limpeza
+        self._proxima_limpeza = 0.0
+        self._lock_limpeza = threading.Lock()
+
+    # ---- operações usadas pelas rotas ----
+
+    def salvar(self, token, email, expira_em):
+        self.limpar_se_necessario()
+        self._salvar(hash_token(token), email, expira_em)
+
+    def buscar(self, token):
+        self.limpar_se_necessario()
+        return self._buscar(hash_token(token))
+
+    def marcar_usado(self, token):
+        """Marca o token como usado; False se já foi usado, expirou ou não existe"""
+        return self._marcar_usado(hash_token(token), datetime.now())
+
+    def remover(self, token):
+        self._remover(hash_token(token))
+
+    def listar_ativos(self, limite=100):
+        """[{"token_hash", "email", "expiry", "used"}] dos tokens não expirados (debug)"""
+        return self._listar_ativos(datetime.now(), limite)
+
+    # ---- limpeza ----
+
+    def limpar_expirados(self):
+        """Remove todos os tokens expirados, em lotes. Retorna a quantidade removida"""
+        agora = datetime.now()
+        total = 0
+        while True:
+            removidos = self._remover_expirados(agora, self.lote_limpeza)
+            total += removidos
+            if removidos < self.lote_limpeza:
+                return total
+
+    def limpar_se_necessario(self):
+        """Executa limpar_expirados() se o intervalo passou (uma thread por vez; as demais seguem)"""
+        if time.monotonic() < self._proxima_limpeza or not self._lock_limpeza.acquire(blocking=False):
+            return
+        try:
+            self._proxima_limpeza = time.monotonic() + self.intervalo_limpeza
+            self.limpar_expirados()
+        finally:
+            self._lock_limpeza.release()
+
+    # ---- implementação ----
+
+    @abstractmethod
+    def _salvar(self, token_hash, email, expira_em):
+        """Grava o token (pelo hash) para o email, válido até expira_em e ainda não usado"""
+
+    @abstractmethod
+    def _buscar(self, token_hash):
+        """{"email", "expiry", "used"} do token, mesmo expirado se ainda não removido; None se não existe"""
+
+    @abstractmethod
+    def _marcar_usado(self, token_hash, agora):
+        """Marca como usado se existe, não foi usado e não expirou em agora; True só para quem marcou (atômico)"""
+
+    @abstractmethod
+    def _remover(self, token_hash):
+        """Remove o token (sem erro se não existe)"""
+
+    @abstractmethod
+    def _remover_expirados(self, agora, lote):
+        """Remove até lote tokens expirados em agora; retorna a quantidade (menor que lote: acabaram)"""
+
+    @abstractmethod
+    def _listar_ativos(self, agora, limite):
+        """[{"token_hash", "email", "expiry", "used"}] de até limite tokens não expirados em agora"""
+
+
+class RecoveryTokenStoreMemoria(RecoveryTokenStore):
+    nome = 'memoria'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._tokens = {}  # {token_hash: {"email", "expiry", "used"}}
+        self._expiracoes = []  # heap [(expiry, token_hash)]: a limpeza só olha os que venceram
+        self._lock = threading.Lock()
+
+    def _salvar(self, token_hash, email, expira_em):
+        with self._lock:
+            self._tokens[token_hash] = {"email": email, "expiry": expira_em, "used": False}
+            heapq.heappush(self._expiracoes, (expira_em, token_hash))
+
+    def _buscar(self, token_hash):
+        with self._lock:
+            dados = self._tokens.get(token_hash)
+            return dict(dados) if dados else None
+
+    def _marcar_usado(self, token_hash, agora):
+        with self._lock:
+            dados = self._tokens.get(token_hash)
+            if dados is None or dados['used'] or dados['expiry'] <= agora:
+                return False
+            dados['used'] = True
+            return True
+
+    def _remover(self, token_hash):
+        with self._lock:
+            self._tokens.pop(token_hash, None)
+
+    def _remover_expirados(self, agora, lote):
+        removidos = 0
+        with self._lock:
+            while self._expiracoes and self._expiracoes[0][0] <= agora and removidos < lote:
+                expira_em, token_hash = heapq.heappop(self._expiracoes)
+                dados = self._tokens.get(token_hash)
+                # entrada do heap de um token já removido: só descarta
+                if dados is not None and dados['expiry'] == expira_em:
+                    del self._tokens[token_hash]
+                    removidos += 1
+        return removidos
+
+    def _listar_ativos(self, agora, limite):
+        with self._lock:
+            ativos = [
+                {"token_hash": token_hash, **dados}
+                for token_hash, dados in self._tokens.items() if dados['expiry'] > agora
+            ]
+        return heapq.nsmallest(limite, ativos, key=lambda token: token['expiry'])
+
+    def __len__(self):
+        return len(self._tokens)
+
+
+class RecoveryTokenStoreBanco(RecoveryTokenStore):
+    nome = 'banco'
+
+    def __init__(self, dao, **kwargs):
+        super().__init__(**kwargs)
+        self._dao = dao
+
+    @staticmethod
+    def _token(row):
+        return {"email": row['email'], "expiry": row['expira_em'], "used": bool(row['usado'])}
+
+    def _salvar(self, token_hash, email, expira_em):
+        self._dao.inserir_token(token_hash, email, expira_em)
+
+    def _buscar(self, token_hash):
+        row = self._dao.buscar_token(token_hash)
+        return self._token(row) if row else None
+
+    def _marcar_usado(self, token_hash, agora):
+        return self._dao.marcar_usado(token_hash, agora)
+
+    def _remover(self, token_hash):
+        self._dao.remover_token(token_hash)
+
+    def _remover_expirados(self, agora, lote):
+        return self._dao.remover_expirados(agora, lote)
+
+    def _listar_ativos(self, agora, limite):
+        return [
+            {"token_hash": row['token_hash'], **self._token(row)}
+            for row in self._dao.listar_ativos(agora, limite)
+        ]
+
+
+def criar_recovery_store(dao=None, config: dict = None):
+    """Cria o store de tokens de recuperação. Se config não for fornecido, lê das variáveis de
+    ambiente: RECOVERY_TOKEN_STORE ('banco' ou 'memoria'), RECOVERY_TOKEN_SWEEP_SECONDS
+    (intervalo da limpeza) e RECOVERY_TOKEN_SWEEP_BATCH (tokens removidos por lote)
+
+    dao: TokenRecuperacaoDAO do backend em uso (obrigatório para 'banco')
+    """
+    if config is None:
+        config = {
+            'backend': os.getenv('RECOVERY_TOKEN_STORE', 'banco'),
+            'intervalo_limpeza': float(os.getenv('RECOVERY_TOKEN_SWEEP_SECONDS', 60)),
+            'lote_limpeza': int(os.getenv('RECOVERY_TOKEN_SWEEP_BATCH', 500)),
+        }
+
+    opcoes = {
+        'intervalo_limpeza': config.get('intervalo_limpeza', 60.0),
+        'lote_limpeza': config.get('lote_limpeza', 500),
+    }
+    if config.get('backend') == 'memoria':
+        return RecoveryTokenStoreMemoria(**opcoes)
+    if dao is None:
+        raise ValueError("RecoveryTokenStoreBanco requer o TokenRecuperacaoDAO do backend")
+    return RecoveryTokenStoreBanco(dao, **opcoes)
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark dos DAOs: compara dao_sqlite, dao_mysql e dao_postgres na mesma mistura de operações
+
+Para cada backend disponível:
+  1. recria o schema (docs/banco_*.sql) e popula produtos, clientes, funcionários e vendas
+  2. roda cada operação --iteracoes vezes (após aquecimento) e mede ops/s
+  3. mede o custo de obter conexão (db_pool_wait_seconds) por operação
+  4. roda --amostras-alocacao operações com tracemalloc: pico de memória alocada por operação
+
+Backends:
+  sqlite   - sempre (arquivo temporário)
+  mysql    - se BENCH_MYSQL_DATABASE estiver definido (MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD)
+  postgres - se BENCH_PG_DATABASE estiver definido (PGHOST, PGPORT, PGUSER, PGPASSWORD)
+
+ATENÇÃO: as tabelas do banco de benchmark são apagadas e recriadas. Use um banco descartável.
+
+Uso:
+  python scripts/benchmark_dao.py
+  python scripts/benchmark_dao.py --produtos 50000 --iteracoes 2000 --saida dao.json
+  BENCH_MYSQL_DATABASE=bench_api python scripts/benchmark_dao.py --backends sqlite,mysql
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+from datetime import date
+
+# Adicionar o diretório pai ao path para importar os módulos
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from metrics import DB_POOL_WAIT_SECONDS
+
+OPERACOES = ('buscar_produto', 'listar_produtos', 'inserir_venda', 'inserir_item', 'finalizar_venda', 'buscar_venda')
+
+
+def ler_schema(nome_arquivo):
+    """Comandos SQL de um arquivo docs/banco_*.sql (sem comentários e sem os SELECT/DROP finais do SQLite)"""
+    with open(os.path.join(BASE_DIR, 'docs', nome_arquivo), encoding='utf-8') as arquivo:
+        texto = arquivo.read().split('-- Seleciona')[0]
+    linhas = [linha for linha in texto.splitlines() if not linha.strip().startswith('--')]
+    comandos, atual = [], ''
+    for trecho in '\n'.join(linhas).split(';'):
+        atual += trecho + ';'
+        # ';' dentro de um CREATE TRIGGER ... BEGIN ... END não encerra o comando
+        if sqlite3.complete_statement(atual):
+            if atual.strip(' \n;'):
+                comandos.append(atual.strip().rstrip(';'))
+            atual = ''
+    return comandos
+
+
+def estado_pool(backend):
+    """(soma em segundos, quantidade) de db_pool_wait_seconds para o backend"""
+    for labels, valor in DB_POOL_WAIT_SECONDS.snapshot():
+        if labels == [backend]:
+            return valor[-1], sum(valor[:-1])
+    return 0.0, 0
+
+
+class Backend(ABC):
+    """Adapta um pacote de DAOs à mistura de operações do benchmark"""
+
+    nome = None
+    schema = None
+    placeholder = '%s'
+
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.proximo_id_venda = itertools.count(args.vendas + 1)
+        self.proximo_id_item = itertools.count(args.vendas * 2 + 1)
+        self.vendas_criadas = []
+
+    # ---- preparação ----
+
+    @abstractmethod
+    def conectar(self):
+        """Inicializa o pool do backend e define self.db, self.produtos, self.vendas e self.itens"""
+
+    def fechar(self):
+        self.db.close_pool()
+
+    def popular(self):
+        ph = self.placeholder
+        with self.db.get_cursor() as cur:
+            for comando in ler_schema(self.schema):
+                cur.execute(comando)
+        with self.db.get_cursor() as cur:
+            cur.executemany(
+                f"INSERT INTO Cliente (id_cliente, nome, email) VALUES ({ph}, {ph}, {ph})",
+                [(i, f"Cliente {i}", f"cliente{i}@bench.com") for i in range(1, self.args.clientes + 1)],
+            )
+            cur.executemany(
+                f"INSERT INTO Funcionario (id_funcionario, nome, cargo) VALUES ({ph}, {ph}, 'Vendedor')",
+                [(i, f"Funcionario {i}") for i in range(1, self.args.funcionarios + 1)],
+            )
+            cur.executemany(
+                f"INSERT INTO Produto (id_produto, nome, descricao, preco, estoque) VALUES ({ph}, {ph}, {ph}, {ph}, {ph})",
+                [(i, f"Produto {i}", f"Descrição do produto {i}", round(10 + i * 0.37, 2), 10**9)
+                 for i in range(1, self.args.produtos + 1)],
+            )
+            cur.executemany(
+                f"INSERT INTO Venda (id_venda, id_cliente, id_funcionario, data_venda, total) VALUES ({ph}, {ph}, {ph}, {ph}, {ph})",
+                [(i, self.id_cliente(), self.id_funcionario(), str(date.today()), 100)
+                 for i in range(1, self.args.vendas + 1)],
+            )
+            cur.executemany(
+                f"INSERT INTO Item_Venda (id_item, id_venda, id_produto, quantidade, preco_unitario) VALUES ({ph}, {ph}, {ph}, {ph}, {ph})",
+                [(i, (i - 1) // 2 + 1, self.id_produto(), 1, 50) for i in range(1, self.args.vendas * 2 + 1)],
+            )
+
+    def id_produto(self):
+        return self.rng.randint(1, self.args.produtos)
+
+    def id_cliente(self):
+        return self.rng.randint(1, self.args.clientes)
+
+    def id_funcionario(self):
+        return self.rng.randint(1, self.args.funcionarios)
+
+    # ---- operações ----
+
+    def buscar_produto(self):
+        self.produtos.buscar_produto(self.id_produto())
+
+    def listar_produtos(self):
+        self.produtos.listar_produtos(after=self.rng.randint(0, max(self.args.produtos - 50, 0)), limit=50)
+
+    def inserir_venda(self):
+        id_venda = next(self.proximo_id_venda)
+        self.vendas.inserir_venda(id_venda, self.id_cliente(), self.id_funcionario(), str(date.today()), 100)
+        self.vendas_criadas.append(id_venda)
+
+    def inserir_item(self):
+        id_venda = self.rng.choice(self.vendas_criadas) if self.vendas_criadas else 1
+        self.itens.inserir_item(next(self.proximo_id_item), id_venda, self.id_produto(), 1, 50)
+
+    def finalizar_venda(self):
+        itens = [{'id_produto': self.id_produto(), 'quantidade': 1} for _ in range(3)]
+        self.vendas.finalizar_venda(
+            next(self.proximo_id_venda), self.id_cliente(), self.id_funcionario(), str(date.today()), itens
+        )
+
+    def buscar_venda(self):
+        self.vendas.buscar_venda(self.rng.randint(1, self.args.vendas))
+
+
+class SQLiteBackend(Backend):
+    nome = 'sqlite'
+    schema = 'banco_sqlite.sql'
+    placeholder = '?'
+
+    def conectar(self):
+        from dao_sqlite import db
+        from dao_sqlite.produto_dao import ProdutoDAO
+        from dao_sqlite.venda_dao import VendaDAO
+        from dao_sqlite.item_venda_dao import ItemVendaDAO
+
+        self.pasta = tempfile.mkdtemp(prefix='bench_dao_')
+        db.init_db({'database': os.path.join(self.pasta, 'bench.sqlite')})
+        self.db, self.produtos, self.vendas, self.itens = db, ProdutoDAO(), VendaDAO(), ItemVendaDAO()
+
+    def fechar(self):
+        super().fechar()
+        shutil.rmtree(self.pasta, ignore_errors=True)
+
+
+class MySQLBackend(Backend):
+    nome = 'mysql'
+    schema = 'banco_mysql.sql'
+
+    def conectar(self):
+        from dao_mysql import db
+        from dao_mysql.produto_dao import ProdutoDAO
+        from dao_mysql.venda_dao import VendaDAO
+        from dao_mysql.item_venda_dao import ItemVendaDAO
+
+        db.init_db({
+            'host': os.getenv('MYSQL_HOST', 'localhost'),
+            'port': int(os.getenv('MYSQL_PORT', 3306)),
+            'user': os.getenv('MYSQL_USER', 'root'),
+            'password': os.getenv('MYSQL_PASSWORD', '123456'),
+            'database': os.environ['BENCH_MYSQL_DATABASE'],
+            'autocommit': False,
+        })
+        self.db, self.produtos, self.vendas, self.itens = db, ProdutoDAO(), VendaDAO(), ItemVendaDAO()
+
+
+class PostgresBackend(Backend):
+    nome = 'postgres'
+    schema = 'banco_postgres.sql'
+
+    def conectar(self):
+        from dao_postgres import db
+        from dao_postgres.produto_dao import ProdutoDAO
+        from dao_postgres.venda_dao import VendaDAO
+        from dao_postgres.item_venda_dao import ItemVendaDAO
+
+        db.init_db({
+            'host': os.getenv('PGHOST', 'localhost'),
+            'port': int(os.getenv('PGPORT', 5432)),
+            'user': os.getenv('PGUSER', 'postgres'),
+            'password': os.getenv('PGPASSWORD', '123456'),
+            'database': os.environ['BENCH_PG_DATABASE'],
+        })
+        self.db, self.produtos, self.vendas, self.itens = db, ProdutoDAO(), VendaDAO(), ItemVendaDAO()
+
+    def inserir_item(self):
+        # dao_postgres só expõe a inserção transacional (bloqueia o produto, baixa estoque e atualiza o total)
+        id_venda = self.rng.choice(self.vendas_criadas) if self.vendas_criadas else 1
+        self.itens.add_item_to_venda(id_venda, self.id_produto(), 1, 50, id_item=next(self.proximo_id_item))
+
+
+BACKENDS = {
+    'sqlite': (SQLiteBackend, lambda: True),
+    'mysql': (MySQLBackend, lambda: bool(os.getenv('BENCH_MYSQL_DATABASE'))),
+    'postgres': (PostgresBackend, lambda: bool(os.getenv('BENCH_PG_DATABASE'))),
+}
+
+
+def medir_operacao(backend, operacao, args):
+    """ops/s, custo de obter conexão e alocações de uma operação"""
+    executar = getattr(backend, operacao)
+    for _ in range(args.aquecimento):
+        executar()
+
+    espera_antes, aquisicoes_antes = estado_pool(backend.nome)
+    inicio = time.perf_counter()
+    for _ in range(args.iteracoes):
+        executar()
+    duracao = time.perf_counter() - inicio
+    espera_depois, aquisicoes_depois = estado_pool(backend.nome)
+    espera = espera_depois - espera_antes
+
+    picos = []
+    tracemalloc.start()
+    try:
+        for _ in range(args.amostras_alocacao):
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            executar()
+            picos.append(tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'ops_s': round(args.iteracoes / duracao, 1),
+        'us_por_op': round(duracao / args.iteracoes * 1e6, 1),
+        'aquisicoes_por_op': round((aquisicoes_depois - aquisicoes_antes) / args.iteracoes, 2),
+        'aquisicao_us_por_op': round(espera / args.iteracoes * 1e6, 1),
+        'aquisicao_pct': round(espera / duracao * 100, 1),
+        'alocacao_pico_kb_por_op': round(sum(picos) / len(picos) / 1024, 1) if picos else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark dos DAOs (sqlite, mysql, postgres)")
+    parser.add_argument('--backends', help="Lista separada por vírgula (padrão: todos os disponíveis)")
+    parser.add_argument('--produtos', type=int, default=10000)
+    parser.add_argument('--clientes', type=int, default=100)
+    parser.add_argument('--funcionarios', type=int, default=10)
+    parser.add_argument('--vendas', type=int, default=1000, help="Vendas pré-existentes (2 itens cada)")
+    parser.add_argument('--iteracoes', type=int, default=1000, help="Operações medidas por método")
+    parser.add_argument('--aquecimento', type=int, default=50)
+    parser.add_argument('--amostras-alocacao', type=int, default=100)
+    parser.add_argument('--operacoes', default=','.join(OPERACOES))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--saida', help="Arquivo JSON com os resultados")
+    args = parser.parse_args()
+
+    nomes = args.backends.split(',') if args.backends else [nome for nome, (_, ativo) in BACKENDS.items() if ativo()]
+    operacoes = [operacao for operacao in args.operacoes.split(',') if operacao]
+    invalidas = [operacao for operacao in operacoes if operacao not in OPERACOES]
+    if invalidas:
+        raise SystemExit(f"❌ Operações desconhecidas: {', '.join(invalidas)}")
+
+    resultados = {}
+    for nome in nomes:
+        classe, ativo = BACKENDS[nome]
+        if not ativo():
+            print(f"⚠️ {nome}: não configurado, ignorando")
+            continue
+
+        backend = classe(args)
+        print(f"🗄️ {nome}: populando {args.produtos} produtos, {args.vendas} vendas...")
+        backend.conectar()
+        try:
+            backend.popular()
+            resultados[nome] = {}
+            for operacao in operacoes:
+                resultado = medir_operacao(backend, operacao, args)
+                resultados[nome][operacao] = resultado
+                print(f"   {operacao:<16} {resultado['ops_s']:>9.1f} ops/s | {resultado['us_por_op']:>8.1f} µs/op | "
+                      f"conexão {resultado['aquisicao_us_por_op']:>6.1f} µs/op ({resultado['aquisicao_pct']:.1f}%) | "
+                      f"pico {resultado['alocacao_pico_kb_por_op']} KB/op")
+        finally:
+            backend.fechar()
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump({'config': vars(args), 'resultados': resultados}, arquivo, indent=2, ensure_ascii=False)
+        print(f"✅ Resultados salvos em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark da geração de resoluções de imagem (create_image_resolutions)
+
+Compara a implementação antiga (uma cópia da imagem original por resolução, cada uma
+redimensionada a partir do tamanho original) com a atual (decodificação reduzida via
+draft() + cascata large -> medium -> thumbnail) sobre um corpus fixo de imagens.
+
+Uso:
+  python scripts/benchmark_image_resolutions.py
+  python scripts/benchmark_image_resolutions.py --corpus /caminho/fotos --repeticoes 5
+
+Sem --corpus, gera um corpus sintético determinístico (JPEG 24 MP, JPEG 12 MP, PNG com alfa).
+Cada implementação roda em um processo separado para medir o pico de memória (ru_maxrss).
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+# Adicionar o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+EXTENSOES = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+
+def gerar_corpus(destino):
+    """Gera imagens sintéticas determinísticas (gradiente + ruído) para o benchmark"""
+    rng = random.Random(42)
+    especificacoes = [
+        ('foto_24mp.jpg', (6000, 4000), 'RGB', 'JPEG'),
+        ('foto_12mp.jpg', (4000, 3000), 'RGB', 'JPEG'),
+        ('produto_alfa.png', (2000, 2000), 'RGBA', 'PNG'),
+    ]
+    arquivos = []
+    for nome, (largura, altura), modo, formato in especificacoes:
+        # Gradiente pequeno ampliado + ruído para não comprimir de forma trivial
+        base = Image.linear_gradient('L').resize((largura, altura))
+        ruido = Image.effect_noise((largura, altura), 40)
+        canais = [base, ruido, Image.linear_gradient('L').rotate(rng.randint(0, 359)).resize((largura, altura))]
+        if modo == 'RGBA':
+            canais.append(Image.new('L', (largura, altura), 200))
+        imagem = Image.merge(modo, canais)
+        caminho = os.path.join(destino, nome)
+        imagem.save(caminho, formato, quality=92)
+        arquivos.append(caminho)
+    return arquivos
+
+
+def create_image_resolutions_antigo(image_path, base_filename, upload_folder):
+    """Implementação anterior: copia a imagem original para cada resolução"""
+    from app import IMAGE_RESOLUTIONS, RESAMPLE_FILTER
+
+    created_files = {}
+    with Image.open(image_path) as img:
+        if img.mode in ('RGBA', 'LA', 'P'):
+            img = img.convert('RGB')
+
+        for resolution_name, (width, height) in IMAGE_RESOLUTIONS.items():
+            img_copy = img.copy()
+            img_copy.thumbnail((width, height), RESAMPLE_FILTER)
+
+            name, ext = base_filename.rsplit('.', 1)
+            resolution_filename = f"{name}_{resolution_name}.{ext}"
+            img_copy.save(os.path.join(upload_folder, resolution_filename), quality=85, optimize=True)
+            created_files[resolution_name] = resolution_filename
+    return created_files
+
+
+def executar_variante(variante, arquivos, repeticoes, fila):
+    """Roda uma variante em processo próprio e devolve (tempo total, imagens, pico de memória em KB)"""
+    from app import create_image_resolutions
+
+    funcao = create_image_resolutions_antigo if variante == 'antigo' else create_image_resolutions
+    saida = tempfile.mkdtemp(prefix=f"bench_{variante}_")
+    try:
+        inicio = time.perf_counter()
+        for rodada in range(repeticoes):
+            for indice, caminho in enumerate(arquivos):
+                ext = caminho.rsplit('.', 1)[1].lower()
+                funcao(caminho, f"produto_{indice}_{rodada}.{ext}", saida)
+        duracao = time.perf_counter() - inicio
+    finally:
+        shutil.rmtree(saida, ignore_errors=True)
+
+    pico_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    fila.put((duracao, repeticoes * len(arquivos), pico_kb))
+
+
+def medir(variante, arquivos, repeticoes):
+    contexto = multiprocessing.get_context('spawn')
+    fila = contexto.Queue()
+    processo = contexto.Process(target=executar_variante, args=(variante, arquivos, repeticoes, fila))
+    processo.start()
+    resultado = fila.get()
+    processo.join()
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de create_image_resolutions")
+    parser.add_argument('--corpus', help="Pasta com imagens (padrão: corpus sintético)")
+    parser.add_argument('--repeticoes', type=int, default=3, help="Repetições do corpus por variante")
+    args = parser.parse_args()
+
+    pasta_temporaria = None
+    if args.corpus:
+        arquivos = sorted(
+            os.path.join(args.corpus, nome) for nome in os.listdir(args.corpus)
+            if nome.lower().endswith(EXTENSOES)
+        )
+    else:
+        pasta_temporaria = tempfile.mkdtemp(prefix="bench_corpus_")
+        print("🖼️ Gerando corpus sintético...")
+        arquivos = gerar_corpus(pasta_temporaria)
+
+    if not arquivos:
+        print("❌ Nenhuma imagem encontrada no corpus")
+        return
+
+    print(f"📂 Corpus: {len(arquivos)} imagens x {args.repeticoes} repetições")
+    print("=" * 60)
+
+    resultados = {}
+    try:
+        for variante in ('antigo', 'atual'):
+            duracao, total, pico_kb = medir(variante, arquivos, args.repeticoes)
+            resultados[variante] = duracao
+            print(f"⏱️ {variante:>6}: {duracao:.2f}s | {total / duracao:.2f} imagens/s | "
+                  f"{duracao / total * 1000:.0f} ms/imagem | pico de memória {pico_kb / 1024:.0f} MB")
+    finally:
+        if pasta_temporaria:
+            shutil.rmtree(pasta_temporaria, ignore_errors=True)
+
+    print("=" * 60)
+    print(f"🚀 Speedup: {resultados['antigo'] / resultados['atual']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark da serialização JSON das respostas: listagem de produtos e de vendas com cada provider
+
+Cenários (mesmos dados para todos os providers):
+  produtos_dict   - N produtos como dicts do driver (Decimal em preco), como em jsonify(lista)
+  produtos_modelo - N modelos Produto (models.produto), como retornados pelos DAOs
+  vendas          - N/10 vendas com Decimal (total) e date/datetime (data_venda)
+
+Providers:
+  stdlib  - flask.json.provider.DefaultJSONProvider (json da stdlib + default do Flask)
+  modelos - json_provider.ModelosJSONProvider (stdlib, aceita os modelos de linha)
+  orjson  - json_provider.OrjsonJSONProvider (se o pacote orjson estiver instalado)
+
+Cada resultado também é comparado com o da stdlib (json.loads dos dois deve ser igual).
+
+Uso:
+  python scripts/benchmark_json.py
+  python scripts/benchmark_json.py --produtos 50000 --iteracoes 20 --saida json.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+# Adicionar o diretório pai ao path para importar os módulos
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from json_provider import ModelosJSONProvider, OrjsonJSONProvider, orjson
+from models.produto import Produto
+
+CAMPOS_PRODUTO = Produto.CAMPOS
+
+
+def gerar_dados(args):
+    """Dados de cada cenário (listas prontas antes da medição)"""
+    linhas = [
+        (i, f"Produto {i} – peça", f"Descrição do produto {i}" if i % 3 else None,
+         Decimal(f"{i % 1000}.{i % 100:02d}"), i % 50, 'has_images' if i % 2 else None)
+        for i in range(1, args.produtos + 1)
+    ]
+    inicio = datetime(2024, 1, 1, 8, 0, 0)
+    vendas = [
+        {'id_venda': i, 'id_cliente': i % 100 + 1, 'id_funcionario': i % 10 + 1,
+         'data_venda': (inicio + timedelta(minutes=i)).date(), 'data_criacao': inicio + timedelta(minutes=i),
+         'total': Decimal(f"{i * 3 % 10000}.{i % 100:02d}")}
+        for i in range(1, args.produtos // 10 + 1)
+    ]
+    return {
+        'produtos_dict': [dict(zip(CAMPOS_PRODUTO, linha)) for linha in linhas],
+        'produtos_modelo': [Produto(*linha) for linha in linhas],
+        'vendas': vendas,
+    }
+
+
+def medir(provider, dados, args):
+    """Melhor tempo por serialização completa (resposta compacta, como jsonify) e pico de memória"""
+    for _ in range(args.aquecimento):
+        provider.dumps(dados, separators=(',', ':'))
+
+    # melhor tempo entre as iterações (menos sensível a ruído do GC/SO do que a média)
+    segundos = float('inf')
+    for _ in range(args.iteracoes):
+        inicio = time.perf_counter()
+        texto = provider.dumps(dados, separators=(',', ':'))
+        segundos = min(segundos, time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    provider.dumps(dados, separators=(',', ':'))
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'ms': round(segundos * 1000, 2),
+        'linhas_s': round(len(dados) / segundos),
+        'bytes': len(texto.encode('utf-8')),
+        'pico_kb': round(pico / 1024),
+    }, texto
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos providers JSON (stdlib, modelos, orjson)")
+    parser.add_argument('--produtos', type=int, default=10000)
+    parser.add_argument('--iteracoes', type=int, default=10, help="Serializações medidas por cenário")
+    parser.add_argument('--aquecimento', type=int, default=2)
+    parser.add_argument('--saida', help="Arquivo JSON com os resultados")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    providers = {'stdlib': DefaultJSONProvider(app), 'modelos': ModelosJSONProvider(app)}
+    if orjson is not None:
+        providers['orjson'] = OrjsonJSONProvider(app)
+    else:
+        print("⚠️ orjson não instalado, ignorando (pip install orjson)")
+
+    print(f"📦 Gerando {args.produtos} produtos e {args.produtos // 10} vendas...")
+    cenarios = gerar_dados(args)
+
+    resultados = {}
+    for cenario, dados in cenarios.items():
+        print(f"🧪 {cenario}")
+        resultados[cenario] = {}
+        referencia = None
+        for nome, provider in providers.items():
+            # o DefaultJSONProvider puro não conhece os modelos: referência sobre os dicts do driver
+            if nome == 'stdlib' and cenario == 'produtos_modelo':
+                medir_dados = [dict(produto) for produto in dados]
+            else:
+                medir_dados = dados
+            resultado, texto = medir(provider, medir_dados, args)
+            if referencia is None:
+                referencia = json.loads(texto)
+            resultado['igual_stdlib'] = json.loads(texto) == referencia
+            resultados[cenario][nome] = resultado
+            base = resultados[cenario]['stdlib']['ms']
+            print(f"   {nome:<8} {resultado['ms']:>8.2f} ms | {resultado['linhas_s']:>9} linhas/s | "
+                  f"{base / resultado['ms']:>5.1f}x | {resultado['bytes']:>9} bytes | pico {resultado['pico_kb']} KB | "
+                  f"{'✅' if resultado['igual_stdlib'] else '❌ difere da stdlib'}")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump({'config': vars(args), 'resultados': resultados}, arquivo, indent=2, ensure_ascii=False)
+        print(f"✅ Resultados salvos em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -164,7 +164,8 @@ def resetar_banco_mysql():
                     estoque INT DEFAULT 0,
                     nome_imagem VARCHAR(255),
                     url VARCHAR(255),
-                    PRIMARY KEY (id_produto)
+                    PRIMARY KEY (id_produto),
+                    FULLTEXT KEY ft_produto_busca (nome, descricao)
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
             """)
             
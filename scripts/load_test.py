@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Teste de carga HTTP com relatório de latência (p50/p95/p99) por rota em JSON
+
+Perfis de carga (misturados por peso):
+  browse   - GET /produtos?limit=50 e GET /produtos/{id}
+  checkout - POST /vendas (1 a 3 itens)
+  upload   - POST /produtos/{id}/upload-image (JPEG pequeno, processamento assíncrono)
+  login    - POST /login
+
+Sem --url, sobe o app em um subprocesso com um banco SQLite temporário (DB_TYPE=sqlite),
+populado com usuários, clientes, funcionários e produtos. Com --url, usa um servidor já
+em execução (que precisa ter os dados de --email/--senha e produtos com estoque).
+
+Uso:
+  python scripts/load_test.py --concorrencia 16 --duracao 30
+  python scripts/load_test.py --perfis browse=70,checkout=20,login=10 --saida resultado.json
+  python scripts/load_test.py --url http://localhost:5001 --duracao 60
+
+Para comparar versões, rode com os mesmos parâmetros (e --seed) e compare os JSONs.
+"""
+
+import argparse
+import hashlib
+import io
+import itertools
+import json
+import math
+import os
+import random
+import shutil
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+PERFIS_PADRAO = 'browse=60,checkout=20,upload=5,login=15'
+EMAIL_PADRAO = 'carga@teste.com'
+SENHA_PADRAO = 'carga123'
+
+
+# ---------------------------
+# Servidor local (SQLite)
+# ---------------------------
+
+def criar_banco(caminho, produtos, clientes, funcionarios, email, senha):
+    """Cria o banco SQLite a partir de docs/banco_sqlite.sql e popula os dados do teste"""
+    with open(os.path.join(BASE_DIR, 'docs', 'banco_sqlite.sql'), encoding='utf-8') as arquivo:
+        schema = arquivo.read().split('-- Seleciona')[0]
+
+    conn = sqlite3.connect(caminho)
+    try:
+        conn.executescript(schema)
+        conn.execute("INSERT INTO nivel_acesso (id_nivel_acesso, nome) VALUES (1, 'admin')")
+        conn.execute(
+            "INSERT INTO usuario (nome, email, senha_hash, id_nivel_acesso) VALUES (?, ?, ?, 1)",
+            ('Teste de Carga', email, hashlib.sha256(senha.encode()).hexdigest()),
+        )
+        conn.executemany(
+            "INSERT INTO Cliente (id_cliente, nome, email) VALUES (?, ?, ?)",
+            [(i, f"Cliente {i}", f"cliente{i}@teste.com") for i in range(1, clientes + 1)],
+        )
+        conn.executemany(
+            "INSERT INTO Funcionario (id_funcionario, nome, cargo) VALUES (?, ?, 'Vendedor')",
+            [(i, f"Funcionario {i}") for i in range(1, funcionarios + 1)],
+        )
+        conn.executemany(
+            "INSERT INTO Produto (id_produto, nome, descricao, preco, estoque) VALUES (?, ?, ?, ?, ?)",
+            [(i, f"Produto {i}", f"Descrição do produto {i}", round(10 + i * 0.37, 2), 10**9)
+             for i in range(1, produtos + 1)],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def porta_livre():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def servir(porta):
+    """Modo --servidor: roda o app (já configurado pelas variáveis de ambiente) sem debug/reloader"""
+    from app import app
+    app.run(host='127.0.0.1', port=porta, threaded=True, debug=False, use_reloader=False)
+
+
+def iniciar_servidor(args, pasta):
+    """Sobe o app em um subprocesso com banco SQLite temporário e espera responder em /test"""
+    banco = os.path.join(pasta, 'carga.sqlite')
+    criar_banco(banco, args.produtos, args.clientes, args.funcionarios, args.email, args.senha)
+    uploads = os.path.join(pasta, 'uploads')
+    os.makedirs(uploads)
+
+    porta = porta_livre()
+    ambiente = {
+        **os.environ,
+        'DB_TYPE': 'sqlite',
+        'SQLITE_DB': banco,
+        'UPLOAD_FOLDER': uploads,
+        'LOG_LEVEL': os.getenv('LOG_LEVEL', 'WARNING'),
+    }
+    processo = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--servidor', str(porta)],
+        env=ambiente, cwd=BASE_DIR, start_new_session=True,
+        stdout=subprocess.DEVNULL, stderr=None if args.verbose else subprocess.DEVNULL,
+    )
+
+    url = f"http://127.0.0.1:{porta}"
+    limite = time.time() + 30
+    while time.time() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError("Servidor encerrou durante a inicialização (use --verbose)")
+        try:
+            if requests.get(f"{url}/test", timeout=1).status_code == 200:
+                return processo, url
+        except requests.RequestException:
+            time.sleep(0.2)
+    os.killpg(processo.pid, signal.SIGTERM)
+    raise RuntimeError("Servidor não respondeu em 30s")
+
+
+# ---------------------------
+# Gerador de carga
+# ---------------------------
+
+class Coletor:
+    """Guarda (rota, status, latência) de cada requisição medida"""
+
+    def __init__(self):
+        self.amostras = []
+        self._lock = threading.Lock()
+        self.medindo = False
+
+    def registrar(self, rota, status, segundos):
+        if self.medindo:
+            with self._lock:
+                self.amostras.append((rota, status, segundos))
+
+
+class Usuario(threading.Thread):
+    """Cliente virtual: executa perfis sorteados por peso até o fim do teste"""
+
+    def __init__(self, indice, args, url, perfis, coletor, ids_venda, imagem, fim):
+        super().__init__(daemon=True)
+        self.args = args
+        self.url = url
+        self.perfis, self.pesos = zip(*perfis.items())
+        self.coletor = coletor
+        self.ids_venda = ids_venda
+        self.imagem = imagem
+        self.fim = fim
+        self.rng = random.Random(args.seed + indice)
+        self.sessao = requests.Session()
+        self.token = None
+
+    def requisitar(self, rota, metodo, caminho, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            resposta = self.sessao.request(metodo, self.url + caminho, timeout=self.args.timeout, **kwargs)
+            status = resposta.status_code
+        except requests.RequestException:
+            resposta, status = None, 0
+        self.coletor.registrar(rota, status, time.perf_counter() - inicio)
+        return resposta
+
+    def login(self):
+        resposta = self.requisitar(
+            'POST /login', 'POST', '/login', json={'email': self.args.email, 'senha': self.args.senha}
+        )
+        if resposta is not None and resposta.status_code == 200:
+            self.token = resposta.json()['token']
+
+    def browse(self):
+        headers = {'Authorization': f'Bearer {self.token}'} if self.token else {}
+        after = self.rng.randrange(0, max(self.args.produtos - 50, 1))
+        self.requisitar('GET /produtos', 'GET', f'/produtos?after={after}&limit=50', headers=headers)
+        for _ in range(self.rng.randint(1, 3)):
+            id_produto = self.rng.randint(1, self.args.produtos)
+            self.requisitar('GET /produtos/{id}', 'GET', f'/produtos/{id_produto}')
+
+    def checkout(self):
+        itens = [
+            {'id_produto': self.rng.randint(1, self.args.produtos), 'quantidade': self.rng.randint(1, 3)}
+            for _ in range(self.rng.randint(1, 3))
+        ]
+        self.requisitar('POST /vendas', 'POST', '/vendas', json={
+            'id_venda': next(self.ids_venda),
+            'id_cliente': self.rng.randint(1, self.args.clientes),
+            'id_funcionario': self.rng.randint(1, self.args.funcionarios),
+            'itens': itens,
+        })
+
+    def upload(self):
+        id_produto = self.rng.randint(1, self.args.produtos)
+        self.requisitar(
+            'POST /produtos/{id}/upload-image', 'POST', f'/produtos/{id_produto}/upload-image',
+            files={'image': ('carga.jpg', self.imagem, 'image/jpeg')},
+        )
+
+    def run(self):
+        self.login()
+        while time.monotonic() < self.fim:
+            perfil = self.rng.choices(self.perfis, self.pesos)[0]
+            getattr(self, perfil)()
+
+
+def gerar_imagem():
+    from PIL import Image
+    buffer = io.BytesIO()
+    Image.linear_gradient('L').resize((800, 600)).convert('RGB').save(buffer, 'JPEG', quality=85)
+    return buffer.getvalue()
+
+
+def parse_perfis(texto):
+    perfis = {}
+    for parte in texto.split(','):
+        nome, peso = parte.split('=')
+        if nome not in ('browse', 'checkout', 'upload', 'login'):
+            raise SystemExit(f"❌ Perfil desconhecido: {nome}")
+        if float(peso) > 0:
+            perfis[nome] = float(peso)
+    return perfis
+
+
+def percentil(valores_ordenados, p):
+    """Percentil pelo método nearest-rank"""
+    if not valores_ordenados:
+        return None
+    posicao = math.ceil(p / 100 * len(valores_ordenados))
+    return valores_ordenados[max(posicao, 1) - 1]
+
+
+def relatorio(amostras, duracao):
+    """Agrupa as amostras por rota: requisições, erros, throughput e percentis (ms)"""
+    por_rota = {}
+    for rota, status, segundos in amostras:
+        por_rota.setdefault(rota, []).append((status, segundos))
+
+    rotas = {}
+    for rota, dados in sorted(por_rota.items()):
+        latencias = sorted(segundos * 1000 for _, segundos in dados)
+        status = {}
+        for codigo, _ in dados:
+            status[str(codigo)] = status.get(str(codigo), 0) + 1
+        rotas[rota] = {
+            'requisicoes': len(dados),
+            'erros': sum(1 for codigo, _ in dados if codigo == 0 or codigo >= 500),
+            'throughput_rps': round(len(dados) / duracao, 2),
+            'p50_ms': round(percentil(latencias, 50), 2),
+            'p95_ms': round(percentil(latencias, 95), 2),
+            'p99_ms': round(percentil(latencias, 99), 2),
+            'media_ms': round(sum(latencias) / len(latencias), 2),
+            'max_ms': round(latencias[-1], 2),
+            'status': status,
+        }
+    return {
+        'total_requisicoes': len(amostras),
+        'throughput_rps': round(len(amostras) / duracao, 2),
+        'rotas': rotas,
+    }
+
+
+def executar(args, url):
+    perfis = parse_perfis(args.perfis)
+    coletor = Coletor()
+    ids_venda = itertools.count(args.id_venda_inicial)
+    imagem = gerar_imagem() if 'upload' in perfis else None
+
+    inicio = time.monotonic()
+    fim = inicio + args.aquecimento + args.duracao
+    usuarios = [
+        Usuario(indice, args, url, perfis, coletor, ids_venda, imagem, fim)
+        for indice in range(args.concorrencia)
+    ]
+    for usuario in usuarios:
+        usuario.start()
+
+    time.sleep(args.aquecimento)
+    coletor.medindo = True
+    inicio_medicao = time.monotonic()
+    for usuario in usuarios:
+        usuario.join()
+    coletor.medindo = False
+    duracao = time.monotonic() - inicio_medicao
+
+    return {
+        'config': {
+            'url': url if args.url else 'local (sqlite)',
+            'concorrencia': args.concorrencia,
+            'duracao_s': args.duracao,
+            'aquecimento_s': args.aquecimento,
+            'perfis': perfis,
+            'produtos': args.produtos,
+            'seed': args.seed,
+        },
+        'duracao_medida_s': round(duracao, 3),
+        **relatorio(coletor.amostras, duracao),
+    }
+
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == '--servidor':
+        servir(int(sys.argv[2]))
+        return
+
+    parser = argparse.ArgumentParser(description="Teste de carga HTTP da API")
+    parser.add_argument('--url', help="Servidor já em execução (padrão: sobe o app com SQLite temporário)")
+    parser.add_argument('--concorrencia', type=int, default=8, help="Clientes simultâneos")
+    parser.add_argument('--duracao', type=float, default=20, help="Duração medida em segundos")
+    parser.add_argument('--aquecimento', type=float, default=2, help="Segundos iniciais descartados")
+    parser.add_argument('--perfis', default=PERFIS_PADRAO, help=f"Pesos dos perfis (padrão: {PERFIS_PADRAO})")
+    parser.add_argument('--produtos', type=int, default=1000, help="Produtos no banco (e faixa de ids usada)")
+    parser.add_argument('--clientes', type=int, default=50)
+    parser.add_argument('--funcionarios', type=int, default=5)
+    parser.add_argument('--email', default=EMAIL_PADRAO)
+    parser.add_argument('--senha', default=SENHA_PADRAO)
+    parser.add_argument('--id-venda-inicial', type=int, default=None,
+                        help="Primeiro id_venda do checkout (padrão: 1 no banco local, derivado do horário com --url)")
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--saida', help="Arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument('--verbose', action='store_true', help="Mostra o stderr do servidor local")
+    args = parser.parse_args()
+
+    if args.id_venda_inicial is None:
+        args.id_venda_inicial = int(time.time() * 1000) % 10**9 if args.url else 1
+
+    pasta = None
+    processo = None
+    try:
+        if args.url:
+            url = args.url.rstrip('/')
+        else:
+            pasta = tempfile.mkdtemp(prefix='carga_')
+            print("🚀 Subindo o app com banco SQLite temporário...", file=sys.stderr)
+            processo, url = iniciar_servidor(args, pasta)
+
+        print(f"⏱️ {args.concorrencia} clientes por {args.duracao:.0f}s em {url}", file=sys.stderr)
+        resultado = executar(args, url)
+    finally:
+        if processo is not None:
+            # Grupo de processos inteiro: inclui os workers do pool de imagens do app
+            os.killpg(processo.pid, signal.SIGTERM)
+            processo.wait(timeout=10)
+        if pasta:
+            shutil.rmtree(pasta, ignore_errors=True)
+
+    saida = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(saida + '\n')
+        print(f"✅ Resultado salvo em {args.saida}", file=sys.stderr)
+    else:
+        print(saida)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Recalcula o agregado VendaResumoDiario a partir de Venda/Item_Venda
+
+Uso:
+  python scripts/reconstruir_resumo_vendas.py                    # MySQL (variáveis MYSQL_*)
+  DB_TYPE=sqlite SQLITE_DB=banco_api.sqlite python scripts/reconstruir_resumo_vendas.py
+
+Necessário uma vez em bancos que já tinham vendas antes da tabela existir; depois disso
+o agregado é mantido por finalizar_venda/excluir_venda na mesma transação da venda.
+"""
+
+import os
+import sys
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+
+def main():
+    if os.getenv('DB_TYPE', 'mysql') == 'sqlite':
+        from dao_sqlite.db import init_db
+        from dao_sqlite.venda_dao import VendaDAO
+    else:
+        from dao_mysql.db import init_db
+        from dao_mysql.venda_dao import VendaDAO
+
+    init_db()
+    print("🔄 Recalculando VendaResumoDiario...")
+    inicio = time.perf_counter()
+    VendaDAO().reconstruir_resumo_diario()
+    print(f"✅ Resumo diário recalculado em {time.perf_counter() - inicio:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
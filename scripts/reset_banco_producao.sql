@@ -22,6 +22,9 @@ SET FOREIGN_KEY_CHECKS = 0;
 -- ================================================================
 
 -- 1. Limpar todas as tabelas (ordem importante por causa das FKs)
+TRUNCATE TABLE token_recuperacao;
+TRUNCATE TABLE email_outbox;
+TRUNCATE TABLE VendaResumoDiario;
 TRUNCATE TABLE Item_Venda;
 TRUNCATE TABLE Venda;
 TRUNCATE TABLE Produto;
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Servidor SMTP local para desenvolvimento: aceita qualquer login e só imprime as mensagens
+recebidas (nada é entregue)
+
+Uso:
+  python scripts/smtp_debug.py                 # 127.0.0.1:1025
+  python scripts/smtp_debug.py --port 2525 --falhar 3
+
+Rode a API apontando para ele:
+  EMAIL_SMTP_HOST=127.0.0.1 EMAIL_SMTP_PORT=1025 EMAIL_SMTP_TLS=0 python app.py
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from email_outbox import ServidorSMTPDebug
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor SMTP de depuração")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=1025)
+    parser.add_argument('--falhar', type=int, default=0,
+                        help="responde 451 às próximas N mensagens (testar o reenvio da fila)")
+    args = parser.parse_args()
+    # cada mensagem recebida é registrada pelo logger do email_outbox
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    servidor = ServidorSMTPDebug(args.host, args.port)
+    servidor.falhar_proximos = args.falhar
+    print(f"📧 Servidor SMTP de depuração em {servidor.host}:{servidor.port} (Ctrl+C para sair)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        print(f"\n✅ {len(servidor.mensagens)} mensagens recebidas em {servidor.conexoes} conexões")
+
+
+if __name__ == '__main__':
+    main()